@@ -1,14 +1,16 @@
 from valid8.utils.typing_tools import Boolean, is_pep484_nonable
 
-from valid8.base import ValidationFailure, failure_raiser, as_failure_raiser, Invalid
+from valid8.base import ValidationFailure, failure_raiser, as_failure_raiser, Invalid, RetentionPolicy
 from valid8.composition import CompositionFailure, AtLeastOneFailed, and_, DidNotFail, not_, AllValidatorsFailed, or_, \
     XorTooManySuccess, xor_, not_all, fail_on_none, skip_on_none
 
 from valid8.entry_points import NonePolicy, NoneArgPolicy, ValidationError, Validator, assert_valid, is_valid
+from valid8.compiler import compile_validator
 from valid8.entry_points_annotations import InvalidNameError, InputValidationError, InputValidator, \
     OutputValidationError, ClassFieldValidationError, validate_arg, validate_field, validate_io, validate_out, \
-    decorate_with_validation, decorate_with_validators
+    decorate_with_validation, decorate_with_validators, ValidationSampler, get_validation_sampler, enable_validation
 from valid8.entry_points_inline import validate, validation, validator, assert_instance_of, assert_subclass_of
+from valid8.spec import InvalidSpecError, from_spec
 
 # import all symbols explicitly declared in the validation lib `__all__` list
 # from valid8.validation_lib import *
@@ -27,24 +29,28 @@ __all__ = [
 
     # submodules
     'base', 'common_syntax', 'composition', 'entry_points', 'entry_points_annotations', 'entry_points_inline',
-    'validation_lib', 'utils',
+    'compiler', 'spec', 'validation_lib', 'utils',
 
     # symbols
     # -- utils_typing
     'Boolean', 'is_pep484_nonable',
     # -- base
-    'ValidationFailure', 'Invalid', 'failure_raiser', 'as_failure_raiser',
+    'ValidationFailure', 'Invalid', 'failure_raiser', 'as_failure_raiser', 'RetentionPolicy',
     # -- composition
     'CompositionFailure', 'AtLeastOneFailed', 'and_', 'DidNotFail', 'not_', 'AllValidatorsFailed', 'or_',
     'XorTooManySuccess', 'xor_', 'not_all', 'fail_on_none', 'skip_on_none',
     # -- entry_points
     'NonePolicy', 'NoneArgPolicy', 'ValidationError', 'Validator', 'assert_valid', 'is_valid',
+    # -- compiler
+    'compile_validator',
     # -- entry_points_annotations
     'InvalidNameError', 'InputValidationError', 'InputValidator', 'OutputValidationError', 'ClassFieldValidationError',
     'validate_arg', 'validate_field', 'validate_io', 'validate_out', 'decorate_with_validation',
-    'decorate_with_validators',
+    'decorate_with_validators', 'ValidationSampler', 'get_validation_sampler', 'enable_validation',
     # -- entry_points_inline
-    'validate', 'validation', 'validator', 'assert_instance_of', 'assert_subclass_of'
+    'validate', 'validation', 'validator', 'assert_instance_of', 'assert_subclass_of',
+    # -- spec
+    'InvalidSpecError', 'from_spec'
 ]
 
 # from valid8.validation_lib import __all__ as __vlib_all__
@@ -1,11 +1,16 @@
 import sys
 
 import re
+from abc import abstractmethod
 from copy import copy
+from string import Formatter
+from weakref import ref
+
+from six.moves import copyreg
 
 try:
     # noinspection PyUnresolvedReferences
-    from typing import Callable, Iterable, Any, Dict, Union
+    from typing import Callable, Iterable, Any, Dict, Union, Optional, Tuple, FrozenSet
     try:  # python 3.5.3-
         # noinspection PyUnresolvedReferences
         from typing import Type
@@ -45,13 +50,47 @@ except ImportError:
         def is_mini_lambda(f):
             return False
 
-from valid8.utils.string_tools import end_with_dot
+from valid8.utils.string_tools import end_with_dot, bounded_str, bounded_repr
 from valid8.utils.signature_tools import getfullargspec, IsBuiltInError
+from valid8.utils.cache_tools import CallableInfoCache, make_definition_key, UnhashableDefinition, LRUCache, \
+    get_identity_objects, _MUTABLE_CONTAINERS
 
 
 class RootException(Exception):
     """ All exceptions defined within valid8 inherit from this class """
 
+    def __reduce__(self):
+        """
+        Exceptions are pickled by default by calling their constructor with `self.args`, which does not work for most
+        valid8 exceptions since their constructors receive keyword arguments. Instead, they are recreated without
+        calling the constructor, and their attributes (including the `__cause__`) are restored.
+        """
+        state = self.__dict__
+        cause = getattr(self, '__cause__', None)
+        if cause is not None and state.get('__cause__', None) is not cause:
+            state = copy(state)
+            state['__cause__'] = cause
+        return copyreg.__newobj__, (type(self),) + tuple(self.args), state
+
+
+class ExecutorError(RootException):
+    """
+    Raised when an executor failed to run a validation task, for example by `par_on_all_` validators when the
+    validation function could not be pickled to be sent to a `ProcessPoolExecutor`, or when the pool is broken or shut
+    down. The original error is available as `__cause__`.
+
+    This is a programming or environment error, not a validation failure: the failure raisers, composition operators
+    and validators, that catch the exceptions raised by validation functions, explicitly re-raise it instead of
+    converting it into a failure (or into `False` in `is_valid`).
+    """
+    def __init__(self, executor, cause):
+        msg = "The executor %r failed to run a par_on_all_ validation task. Caught %s: %s" \
+              % (executor, type(cause).__name__, cause)
+        if type(executor).__name__ == 'ProcessPoolExecutor':
+            msg += ". Note that the validation functions are sent to the worker processes, so they should be picklable"
+        super(ExecutorError, self).__init__(msg)
+        self.__cause__ = cause
+
 
 if sys.version_info < (3, 0):
     from future.utils import raise_with_traceback
@@ -96,6 +135,171 @@ def get_callable_names(validation_callables  # type: Iterable[ValidationCallable
     return ', '.join([get_callable_name(val) for val in validation_callables])
 
 
+def set_definition(validation_callable,  # type: ValidationCallable
+                   op,                   # type: str
+                   *args):
+    # type: (...) -> ValidationCallable
+    """
+    Attaches a machine-readable definition to a validation callable created by valid8: the name `op` of the operation
+    and the arguments `args` used to create it, for example `('gt', (0, True))` for `gt(0, strict=True)`. This
+    definition is used by `valid8.compiler` to fuse several such validation callables into a single inline check.
+
+    :param validation_callable: the validation callable to annotate. It is modified in place
+    :param op: the name of the operation
+    :param args: the arguments that were used to create the validation callable
+    :return: the validation callable, for convenience
+    """
+    validation_callable.__valid8_def__ = (op, args)
+    return validation_callable
+
+
+def get_definition(validation_callable  # type: ValidationCallable
+                   ):
+    # type: (...) -> Optional[Tuple[str, Tuple]]
+    """
+    Returns the `(op, args)` definition attached to `validation_callable` by `set_definition` or `DefinedCallable`, or
+    None.
+
+    :param validation_callable:
+    :return:
+    """
+    return getattr(validation_callable, '__valid8_def__', None)
+
+
+def check_validation_callable(validation_callable  # type: ValidationCallableOrLambda
+                              ):
+    """
+    Raises a `TypeError` if `validation_callable` is a function created by valid8 that is not a validation callable,
+    such as the functions created by `stream_all_`: those return a transformed value (for example an iterator) instead
+    of a validation result, so they would always fail (or never fail) if they were used as validation callables.
+    Such functions have a `__not_a_validation_callable__` attribute explaining how they should be used.
+
+    :param validation_callable:
+    :return:
+    """
+    if is_mini_lambda(validation_callable):
+        return
+    usage = getattr(validation_callable, '__not_a_validation_callable__', None)
+    if usage is not None:
+        raise TypeError("%s can not be used as a validation function: %s"
+                        % (get_callable_name(validation_callable), usage))
+
+
+class StructuralEqualityMixIn(object):
+    """
+    A mix-in providing `__eq__` and `__hash__` based on the structure of the definition of a validation callable, as
+    computed by `valid8.utils.cache_tools.make_definition_key`: two objects created with the same definition are equal,
+    even if they are different objects.
+
+    If the definition contains mutable containers (for example a list of allowed values), equality compares their
+    current content but the hash only depends on the type of object, so that it does not change when they are
+    modified. The same goes for other unhashable elements, for which equality falls back to comparing the definition
+    elements with `==`.
+    """
+    __slots__ = ()
+
+    @abstractmethod
+    def get_definition_fields(self):
+        # type: (...) -> Tuple
+        """ Subclasses should return here the elements of their definition """
+        pass
+
+    def __eq__(self, other):
+        if self is other:
+            return True
+        elif type(self) is not type(other):
+            return False
+        try:
+            return make_definition_key(self) == make_definition_key(other)
+        except UnhashableDefinition:
+            # noinspection PyBroadException
+            try:
+                return bool(self.get_definition_fields() == other.get_definition_fields())
+            except Exception:
+                return False
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        try:
+            key = make_definition_key(self, mutables_by_identity=True)
+        except UnhashableDefinition:
+            return hash(type(self))
+        if any(isinstance(o, _MUTABLE_CONTAINERS) for o in get_identity_objects(key)):
+            # the content of mutable containers may change, the hash can not depend on it
+            return hash(type(self))
+        return hash(key)
+
+
+class DefinedCallable(StructuralEqualityMixIn):
+    """
+    A validation callable created by valid8 (`gt(0)`, `and_(...)`, `on_all_(...)`...), carrying the machine-readable
+    definition it was created from (see `set_definition`). It calls the wrapped function and compares by definition:
+    `gt(0) == gt(0)`.
+
+    The wrapped function is available as `__wrapped__`, so that `inspect.signature` reports its signature.
+    """
+    __slots__ = ('__wrapped__', '__valid8_def__', '__name__', '__weakref__')
+
+    def __init__(self,
+                 function,  # type: ValidationCallable
+                 op,        # type: str
+                 *args):
+        """
+        Constructor
+
+        :param function: the function implementing the validation callable
+        :param op: the name of the operation
+        :param args: the arguments that were used to create the validation callable
+        """
+        self.__wrapped__ = function
+        self.__valid8_def__ = (op, args)
+        self.__name__ = get_callable_name(function)
+
+    def __repr__(self):
+        return "<valid8 %s %s>" % (self.__valid8_def__[0], self.__name__)
+
+    def __call__(self, x, **ctx):
+        return self.__wrapped__(x, **ctx)
+
+    def get_definition_fields(self):
+        return self.__valid8_def__
+
+    def __reduce__(self):
+        """
+        Validation callables are pickled as a call to the factory registered for their operation with
+        `register_definition_factory`, so that the (non-picklable) function they wrap is recreated when unpickled.
+        """
+        op, args = self.__valid8_def__
+        try:
+            factory = definition_factories[op]
+        except KeyError:
+            raise TypeError("%r can not be pickled: no factory is registered for operation '%s'. See "
+                            "`register_definition_factory`." % (self, op))
+        return factory, args
+
+
+definition_factories = dict()
+""" The functions able to recreate a `DefinedCallable` from the arguments of its definition, by operation name. They
+are used to pickle `DefinedCallable`s, see `register_definition_factory`. """
+
+
+def register_definition_factory(op,      # type: str
+                                factory  # type: Callable[..., ValidationCallable]
+                                ):
+    """
+    Registers the function to use to recreate a `DefinedCallable` with operation `op` from the arguments of its
+    definition, for example `gt` for `'gt'` since `gt(0, True)` creates `DefinedCallable(gt_, 'gt', 0, True)`. This
+    function should be picklable, that is, defined at module level.
+
+    :param op: the name of the operation
+    :param factory: a function receiving the definition arguments and returning an equivalent `DefinedCallable`
+    :return:
+    """
+    definition_factories[op] = factory
+
+
 SUCCESS_CONDITIONS = 'in {None, True}'  # was used in some error messages
 
 
@@ -189,19 +393,103 @@ class HelpMsgFormattingException(Exception):
         super(HelpMsgFormattingException, self).__init__(msg)
 
 
+help_msg_templates = LRUCache(maxsize=1024)
+""" The cache of parsed help message templates used by `get_help_msg_placeholders`. Use
+`help_msg_templates.cache_info()` to get statistics and `help_msg_templates.clear()` to empty it. """
+
+_formatter = Formatter()
+
+
+def get_help_msg_placeholders(help_msg  # type: str
+                              ):
+    # type: (...) -> FrozenSet[str]
+    """
+    Returns the names of the context variables used by the placeholders of the `help_msg` template, for example
+    `{'wrong_value', 'ref'}` for `'{wrong_value} should be a multiple of {ref:.2f}'`. For placeholders accessing an
+    attribute or an item (`{value.shape}`, `{value[0]}`) the name of the variable itself is returned. Templates are
+    parsed once and cached in `help_msg_templates`.
+
+    :param help_msg: the help message template
+    :return: a frozenset containing the names of the variables used in the template. A ValueError is raised if the
+        template is not a valid format string.
+    """
+    placeholders = help_msg_templates.get(help_msg)
+    if placeholders is None:
+        placeholders = frozenset(_parse_placeholders(help_msg))
+        help_msg_templates.put(help_msg, placeholders)
+    return placeholders
+
+
+def _parse_placeholders(template):
+    """ Yields the variable names used in template, including in nested format specs such as `{x:{width}}` """
+    for _, field_name, format_spec, _ in _formatter.parse(template):
+        if field_name is not None:
+            yield _FIELD_ROOT.match(field_name).group(0)
+            if format_spec:
+                for name in _parse_placeholders(format_spec):
+                    yield name
+
+
+_FIELD_ROOT = re.compile("[^.[]*")
+
+
+def _replace_placeholders(template, var_names):
+    """ Returns template where the placeholders using the variables in var_names (for example `{x.shape:>10}`) are
+    replaced with the plain `{x}` """
+    parts = []
+    for literal, field_name, format_spec, conversion in _formatter.parse(template):
+        parts.append(literal.replace('{', '{{').replace('}', '}}'))
+        if field_name is not None:
+            root = _FIELD_ROOT.match(field_name).group(0)
+            if root in var_names:
+                parts.append('{%s}' % root)
+            else:
+                parts.append('{%s%s%s}' % (field_name, ('!' + conversion) if conversion else '',
+                                           (':' + format_spec) if format_spec else ''))
+    return ''.join(parts)
+
+
+class _TooBigForDisplay(object):
+    """ The replacement of variables with a string representation too long for display in help messages """
+    __slots__ = ()
+
+    def __str__(self):
+        return "(too big for display)"
+
+    __repr__ = __str__
+
+    def __format__(self, format_spec):
+        return str(self)
+
+
+_TOO_BIG_FOR_DISPLAY = _TooBigForDisplay()
+
+
 class HelpMsgMixIn(object):
     """ A helper class providing the ability to store a help message in the class or in the instance, and to get a
     formatted help message """
 
     __max_str_length_displayed__ = 100
     """ objects with a string representation larger than this constant will not be printed in the error messages. 
-    Note that you can override this either on the class or on a particular instance. See `get_variable_str()` """
+    Note that you can override this either on the class or on a particular instance. See `get_variable_str()`. Large
+    builtin objects are never fully rendered, see `valid8.utils.string_tools.bounded_str` """
 
     help_msg = ''
     """ This class attribute holds the default help message used when no `help_msg` attribute is set at instance level 
     (for example through the constructor). Subclasses may wish to override this class attribute, or to define a 
     different behaviour by overriding `get_help_msg` """
 
+    def __init_subclass__(cls, **kwargs):
+        """ Parses the `help_msg` template of subclasses at class definition time (python 3.6+), so that errors in the
+        template are detected early. The parsed template is cached for later formatting """
+        super(HelpMsgMixIn, cls).__init_subclass__(**kwargs)
+        help_msg = cls.__dict__.get('help_msg', None)
+        if isinstance(help_msg, str) and len(help_msg) > 0:
+            try:
+                get_help_msg_placeholders(help_msg)
+            except ValueError as e:
+                raise ValueError("Invalid `help_msg` template in class %s: %s" % (cls.__name__, e))
+
     def get_help_msg(self):
         # type: (...) -> str
         """
@@ -220,39 +508,38 @@ class HelpMsgMixIn(object):
             help_msg = self.help_msg
             context = self.get_context_for_help_msgs()
 
-            # first format if needed
+            # check that all variables are available and not too big for display. The template is parsed only once
+            too_big = None
+            for var_name_ in get_help_msg_placeholders(help_msg):
+                try:
+                    var_value = context[var_name_]
+                except KeyError:
+                    # anticipate the formatting issue
+                    raise HelpMsgFormattingException(self.help_msg, context=context, varname=var_name_)
+                else:
+                    if bounded_str(var_value, self.__max_str_length_displayed__) is None:
+                        if too_big is None:
+                            too_big = []
+                        too_big.append(var_name_)
+
+            if too_big is not None:
+                # replace the variables in a copy (so as to keep the original objects available for debug)
+                context = copy(context)
+                for var_name_ in too_big:
+                    context[var_name_] = _TOO_BIG_FOR_DISPLAY
+
+            # finally format the help message
             try:
-                is_context_a_copy = False
-                # note: use question mark so as to be non-greedy
-                variables = re.findall("{\\S+?}", help_msg)
-                for var_name_ in set(variables):
-                    # extract the variable name
-                    var_name_ = var_name_[1:-1]
-
-                    # if variable is used in the context
-                    if var_name_ in context:
-                        # if the variable string representation is too big, replace its use in the help message
-                        # (so as to keep the original object available for debug)
-                        var_to_str = str(context[var_name_])
-                        if len(var_to_str) > self.__max_str_length_displayed__:
-                            if not is_context_a_copy:
-                                # create a copy because we will modify it
-                                context = copy(context)
-                                is_context_a_copy = True
-
-                            new_name = '@@@@' + var_name_ + '@@@@'
-                            help_msg = help_msg.replace('{' + var_name_ + '}', '{' + new_name + '}')
-                            context[new_name] = "(too big for display)"
-                    else:
-                        # anticipate the formatting issue
-                        raise HelpMsgFormattingException(self.help_msg, context=context, varname=var_name_)
-
-                # finally format the help message
                 help_msg = help_msg.format(**context)
-
-            except KeyError as e:
-                # no need to raise from e, __cause__ is set in the constructor
-                raise HelpMsgFormattingException(self.help_msg, context=context, caught=e)
+            except (AttributeError, IndexError, KeyError, TypeError) as e:
+                if too_big is not None:
+                    # an attribute or item of a variable too big for display: display the replacement text instead
+                    help_msg = _replace_placeholders(help_msg, too_big).format(**context)
+                elif isinstance(e, KeyError):
+                    # no need to raise from e, __cause__ is set in the constructor
+                    raise HelpMsgFormattingException(self.help_msg, context=context, caught=e)
+                else:
+                    raise
 
             return help_msg
 
@@ -262,6 +549,182 @@ class HelpMsgMixIn(object):
         return self.__dict__
 
 
+class RetentionPolicy(object):
+    """ This enumeration describes how validation failures and errors retain the value that failed validation, so that
+    they can be kept in memory (for example in batch reports or retry queues) without retaining large values. See
+    `ValidationFailure.__retention_policy__` and `ValidationError.__retention_policy__`. """
+
+    __slots__ = []
+
+    KEEP = 1
+    """ If this policy is selected, the value is kept as is. This is the default. """
+    SUMMARY = 2
+    """ If this policy is selected, the value is replaced with a `ValueSummary` holding its type and its string
+    representations, as long as they are not too big for display """
+    WEAKREF = 3
+    """ If this policy is selected, the value is replaced with a `WeakValue` if it supports weak references, and with a
+    `ValueSummary` otherwise """
+    DROP = 4
+    """ If this policy is selected, the value is replaced with `NOT_RETAINED` """
+
+
+def _format_str(s,           # type: str
+                format_spec  # type: str
+                ):
+    # type: (...) -> str
+    """ Formats string s with format_spec, or returns it as is if format_spec is not valid for strings (for example
+    '.2f' in a help message written for the original value) """
+    try:
+        return format(s, format_spec)
+    except (ValueError, TypeError):
+        return s
+
+
+class ValueSummary(object):
+    """
+    Replacement of a value that was not retained by a failure or error (see `RetentionPolicy.SUMMARY`). Its string
+    representations are the ones of the original value if they are not too big for display, so that error messages are
+    unchanged. Otherwise they show the type (and length if available) of the original value.
+    """
+    __slots__ = ('value_type', 'value_len', 'value_str', 'value_repr')
+
+    def __init__(self,
+                 value,      # type: Any
+                 max_length  # type: int
+                 ):
+        self.value_type = type(value)
+        try:
+            self.value_len = len(value)
+        except Exception:
+            self.value_len = None
+        self.value_str = bounded_str(value, max_length)
+        self.value_repr = bounded_repr(value, max_length)
+
+    def _get_description(self):
+        if self.value_len is None:
+            return '<%s object>' % self.value_type.__name__
+        else:
+            return '<%s object of length %s>' % (self.value_type.__name__, self.value_len)
+
+    def __str__(self):
+        return self.value_str if self.value_str is not None else self._get_description()
+
+    def __repr__(self):
+        return self.value_repr if self.value_repr is not None else self._get_description()
+
+    def __format__(self, format_spec):
+        return _format_str(str(self), format_spec)
+
+
+class WeakValue(object):
+    """
+    Replacement of a value that is only weakly referenced by a failure or error (see `RetentionPolicy.WEAKREF`). The
+    value can be obtained with `get()` as long as it is alive. Its string representations are the ones of the value.
+    """
+    __slots__ = ('ref', )
+
+    def __init__(self,
+                 value  # type: Any
+                 ):
+        self.ref = ref(value)
+
+    def get(self):
+        """ Returns the value, or None if it does not exist anymore """
+        return self.ref()
+
+    def __str__(self):
+        value = self.ref()
+        return str(value) if value is not None else '(value not available anymore)'
+
+    def __repr__(self):
+        value = self.ref()
+        return repr(value) if value is not None else '(value not available anymore)'
+
+    def __format__(self, format_spec):
+        value = self.ref()
+        if value is not None:
+            try:
+                return format(value, format_spec)
+            except (ValueError, TypeError):
+                pass
+        return _format_str(str(self), format_spec)
+
+
+class _NotRetained(object):
+    """ Type of `NOT_RETAINED` """
+    __slots__ = ()
+
+    def __str__(self):
+        return '(value not retained)'
+
+    __repr__ = __str__
+
+    def __format__(self, format_spec):
+        return _format_str(str(self), format_spec)
+
+
+NOT_RETAINED = _NotRetained()
+""" The replacement of values that were not retained by a failure or error (see `RetentionPolicy.DROP`) """
+
+
+def retain_value(value,      # type: Any
+                 policy,     # type: int
+                 max_length  # type: int
+                 ):
+    # type: (...) -> Any
+    """
+    Returns the object to store in place of `value` according to the `RetentionPolicy` `policy`.
+
+    :param value: the value to retain
+    :param policy: a `RetentionPolicy`
+    :param max_length: the maximum length of the string representations kept in a `ValueSummary`
+    :return:
+    """
+    if policy == RetentionPolicy.KEEP:
+        return value
+    elif policy == RetentionPolicy.DROP:
+        return NOT_RETAINED
+    elif policy == RetentionPolicy.WEAKREF:
+        try:
+            return WeakValue(value)
+        except TypeError:
+            # this type does not support weak references
+            return ValueSummary(value, max_length)
+    elif policy == RetentionPolicy.SUMMARY:
+        return ValueSummary(value, max_length)
+    else:
+        raise ValueError("Invalid retention policy: %r" % policy)
+
+
+def clear_tracebacks(exc  # type: BaseException
+                     ):
+    """
+    Removes the traceback of `exc` and of all exceptions it refers to: its causes (`__cause__` and `__context__`) and
+    for validation errors and failures their `failure`, `validation_outcome` and composition `failures`. This way the
+    frames and their local variables are not retained anymore.
+
+    :param exc:
+    :return:
+    """
+    seen = set()
+    to_visit = [exc]
+    while len(to_visit) > 0:
+        exc = to_visit.pop()
+        if not isinstance(exc, BaseException) or id(exc) in seen:
+            continue
+        seen.add(id(exc))
+        exc.__traceback__ = None
+
+        to_visit.append(getattr(exc, '__cause__', None))
+        to_visit.append(getattr(exc, '__context__', None))
+        exc_dict = getattr(exc, '__dict__', {})
+        to_visit.append(exc_dict.get('failure', None))
+        to_visit.append(exc_dict.get('validation_outcome', None))
+        results = exc_dict.get('_results', None)
+        if results is not None and results[1] is not None:
+            to_visit.extend(results[1].values())
+
+
 MISSING = object()
 
 
@@ -320,6 +783,15 @@ class ValidationFailure(HelpMsgMixIn, RootException):
     # We do not use slots otherwise `help_msg` cannot easily be overridden by a class attribute
     # __slots__ = 'wrong_value', validation_func', 'validation_outcome', 'append_details', 'context'
 
+    __retention_policy__ = RetentionPolicy.KEEP
+    """ The `RetentionPolicy` applied to `wrong_value` when failures are created. It can be changed on this class
+    or on a subclass, for example `ValidationFailure.__retention_policy__ = RetentionPolicy.SUMMARY` so that failures
+    do not retain the values that failed validation. """
+
+    __clear_tracebacks__ = False
+    """ If True, the tracebacks of failures and of their causes are cleared after their string representation is
+    rendered, see `clear_tracebacks`. """
+
     def __init__(self,
                  wrong_value,                 # type: Any
                  help_msg=None,               # type: str
@@ -373,6 +845,16 @@ class ValidationFailure(HelpMsgMixIn, RootException):
         # __str__ anyway
         super(ValidationFailure, self).__init__()
 
+        # finally possibly release the value
+        if self.__retention_policy__ != RetentionPolicy.KEEP:
+            self._apply_retention_policy()
+
+    def _apply_retention_policy(self):
+        """ Replaces the values retained by this failure according to `__retention_policy__`. Subclasses holding other
+        references to the value should extend this method """
+        self.wrong_value = retain_value(self.wrong_value, self.__retention_policy__,
+                                        self.__max_str_length_displayed__)
+
     def is_wrapped_failure(self):
         """If True this failure was caused by catching a non-True non-None result from a validation function.
         If False this was explicitly raised BY a validation function"""
@@ -393,7 +875,10 @@ class ValidationFailure(HelpMsgMixIn, RootException):
 
     def __str__(self):
         """ Overrides the default exception message by relying on `HelpMsgMixIn` """
-        return self.to_str(with_type=False, compact_mode=False)
+        msg = self.to_str(with_type=False, compact_mode=False)
+        if self.__clear_tracebacks__:
+            clear_tracebacks(self)
+        return msg
 
     def to_str(self, with_type=False, compact_mode=False):
         if with_type:
@@ -432,8 +917,8 @@ class ValidationFailure(HelpMsgMixIn, RootException):
 
     def get_wrong_value_str(self):
         """Utility to get the wrong value string or a replacement text if its repr is too long"""
-        wrong_val_str = repr(self.wrong_value)
-        if len(wrong_val_str) > self.__max_str_length_displayed__:
+        wrong_val_str = bounded_repr(self.wrong_value, self.__max_str_length_displayed__)
+        if wrong_val_str is None:
             return '(Actual value is too big to be printed in this message)'
         else:
             return wrong_val_str
@@ -553,70 +1038,160 @@ def failure_raiser(validation_callable,   # type: ValidationCallableOrLambda
     # --option (a) use `makefun or functool @wraps()` helper method to preserve name and signature of the inner object
     # ==> NO, we want to support also non-function callable objects
 
-    # --option (b) simply create a wrapper manually
-    should_wrap_failures = (failure_type is not None) or (help_msg is not None) or (len(kw_context_args) > 0)
-    typ = failure_type if failure_type is not None else InvalidValue
+    # --option (b) create a callable object holding the definition
+    return FailureRaiser(validation_callable, help_msg=help_msg, failure_type=failure_type, **kw_context_args)
 
-    is_mini = False
-    if is_mini_lambda(validation_callable):
-        is_mini = True
-        validation_callable = validation_callable.as_function()
 
-    # general case - adapt to the signature required (val, ctx), (*args) or (val, **ctx)
-    call_it = make_callable(validation_callable, is_mini_lambda=is_mini)
+class FailureRaiser(StructuralEqualityMixIn):
+    """
+    The callable object created by `failure_raiser`. It wraps a validation callable so that in case of failure it raises
+    the given `failure_type` or a `ValidationFailure` with the given help message.
+
+    Its `__name__` is the name of the inner validation callable so that error messages are user-friendly. All elements
+    of the definition are available as attributes, so that tools such as `valid8.compiler` can inspect it. Two failure
+    raisers with the same definition are equal, see `StructuralEqualityMixIn`.
+    """
+    __slots__ = ('validation_callable', 'help_msg', 'failure_type', 'kw_context_args', 'should_wrap_failures',
+                 'receives_ctx', '_target', '__name__', '__weakref__')
+
+    def __init__(self,
+                 validation_callable,   # type: ValidationCallableOrLambda
+                 help_msg=None,         # type: str
+                 failure_type=None,     # type: Type[ValidationFailure]
+                 **kw_context_args):
+        self.should_wrap_failures = (failure_type is not None) or (help_msg is not None) or (len(kw_context_args) > 0)
+
+        check_validation_callable(validation_callable)
+        is_mini = False
+        if is_mini_lambda(validation_callable):
+            is_mini = True
+            validation_callable = validation_callable.as_function()
+
+        self.validation_callable = validation_callable
+        # the function actually called: a `DefinedCallable` is skipped to save one call
+        self._target = validation_callable.__wrapped__ if isinstance(validation_callable, DefinedCallable) \
+            else validation_callable
+        self.help_msg = help_msg
+        self.failure_type = failure_type
+        self.kw_context_args = kw_context_args
+        if self.should_wrap_failures:
+            _check_help_msg_context(help_msg, failure_type, kw_context_args)
+
+        # general case - adapt to the signature required (val, ctx), (*args) or (val, **ctx)
+        self.receives_ctx = receives_ctx(validation_callable, is_mini_lambda=is_mini)
+
+        # set a name so that the error messages are more user-friendly
 
-    def raiser(x, **ctx):
-        """ Wraps validation_callable to raise a failure_type_or_help_msg in case of failure """
+        # NO, Do not include the callable type or error message in the name since it is only used in error messages
+        # where they will appear anyway ! repr() says that this is a failure raiser.
+        self.__name__ = get_callable_name(validation_callable)
 
+    def __repr__(self):
+        return "failure_raiser(%s)" % self.__name__
+
+    def get_definition_fields(self):
+        return self.validation_callable, self.help_msg, self.failure_type, self.kw_context_args
+
+    def __reduce__(self):
+        """ Failure raisers are pickled as a call to the constructor, with the inner validation callable pickled as
+        usual (by reference for user-defined functions) """
+        return _new_failure_raiser, (type(self), self.validation_callable, self.help_msg, self.failure_type,
+                                     self.kw_context_args)
+
+    def __call__(self, x, **ctx):
+        """ Calls validation_callable and raises a failure_type_or_help_msg in case of failure """
         try:
             # perform validation
-            res = call_it(x, **ctx)
-            # if not result_is_success(res): <= DO NOT REMOVE THIS COMMENT
-            success = (res is None) or (res is True) or (res is NP_TRUE)
-
-        except ValidationFailure as f:
-            # failures should be raised "as is"
-            if not should_wrap_failures:
-                raise
+            if self.receives_ctx:
+                res = self._target(x, **ctx)
             else:
-                res = f
-                success = False
-
+                res = self._target(x)
+        except ExecutorError:
+            # not a validation failure: the executor running the validation is broken
+            raise
         except Exception as e:
-            # no need to raise from e since the __cause__ is already set in the constructor: we can safely commonalize
-            res = e
-            if typ is InvalidValue and isinstance(e, TypeError) and not isinstance(e, ValueError):
-                # special case: we want to raise a Failure that inherits from TypeError
-                exc = InvalidType(wrong_value=x, validation_func=validation_callable, validation_outcome=res,
-                                  help_msg=help_msg, **kw_context_args)
-                raise exc
-            success = False
+            # failures are raised "as is" if there is nothing to wrap. Note: no need to raise from e since the
+            # __cause__ is already set in the constructor: we can safely commonalize
+            raise self.create_failure(x, e)
 
-        if not success:
+        # if not result_is_success(res): <= DO NOT REMOVE THIS COMMENT
+        if (res is not None) and (res is not True) and (res is not NP_TRUE):
             # nominal failure: raise the proper exception
-            exc = typ(wrong_value=x, validation_func=validation_callable, validation_outcome=res,
-                      help_msg=help_msg, **kw_context_args)
-            raise exc
+            raise self.create_failure(x, res, raised=False)
 
-    # set a name so that the error messages are more user-friendly
+    def create_failure(self,
+                       x,           # type: Any
+                       outcome,     # type: Any
+                       raised=True  # type: bool
+                       ):
+        # type: (...) -> ValidationFailure
+        """
+        Creates the failure to raise when the inner validation callable returned the non-success `outcome` or raised
+        it, for value `x`. It is used by `__call__` and by compiled validators so that both raise the same failures.
+
+        :param x: the value that was validated
+        :param outcome: the non-True non-None result of the validation callable, or the exception it raised
+        :param raised: True if `outcome` was raised by the validation callable, False if it was returned. Only raised
+            failures may be raised "as is", returned ones are always wrapped.
+        :return: the failure to raise
+        """
+        if raised and isinstance(outcome, ValidationFailure) and not self.should_wrap_failures:
+            # failures should be raised "as is"
+            return outcome
+
+        elif self.failure_type is not None:
+            typ = self.failure_type
+
+        elif raised and isinstance(outcome, TypeError) and not isinstance(outcome, (ValueError, ValidationFailure)):
+            # special case: we want to raise a Failure that inherits from TypeError. Wrapped failures are not concerned
+            typ = InvalidType
+
+        else:
+            typ = InvalidValue
+
+        return typ(wrong_value=x, validation_func=self.validation_callable, validation_outcome=outcome,
+                   help_msg=self.help_msg, **self.kw_context_args)
+
+
+_FAILURE_CONTEXT_FIELDS = frozenset(('wrong_value', 'append_details', 'has_context_data', 'validation_func',
+                                     'validation_outcome'))
+""" The fields set by the `ValidationFailure` constructor in the failures created by failure raisers """
+
+
+def _check_help_msg_context(help_msg,         # type: Optional[str]
+                            failure_type,     # type: Optional[Type[ValidationFailure]]
+                            kw_context_args   # type: Dict[str, Any]
+                            ):
+    """
+    Checks, when a failure raiser is created, that all variables used in the help message of the failures it will
+    create are available. This is only possible when the failure type uses the default `ValidationFailure`
+    constructor and context, since otherwise the context of the failures can not be known in advance.
+
+    A `HelpMsgFormattingException` is raised if a variable is missing, and a `ValueError` if the help message is not a
+    valid template.
+    """
+    typ = failure_type if failure_type is not None else InvalidValue
+    template = help_msg if help_msg is not None else typ.help_msg
+    if template is None or len(template) == 0 or typ.__init__ is not ValidationFailure.__init__ \
+            or typ.get_context_for_help_msgs is not ValidationFailure.get_context_for_help_msgs:
+        return
+
+    placeholders = get_help_msg_placeholders(template)
+    if len(placeholders) == 0:
+        return
 
-    # NO, Do not include the callable type or error message in the name since it is only used in error messages where
-    # they will appear anyway !
-    # ---
-    # if help_msg or failure_type:
-    #     raiser.__name__ = 'failure_raiser(%s, %s)' % (get_callable_name(validation_callable),
-    #                                                   help_msg or failure_type.__name__)
-    # else:
-    # ---
-    # raiser.__name__ = 'failure_raiser(%s)' % get_callable_name(validation_callable)
-    raiser.__name__ = get_callable_name(validation_callable)
-    # Note: obviously this can hold as long as we do not check the name of this object in any other context than
-    # raising errors. If we want to support this, then creating a callable object with everything in the fields will be
-    # probably more appropriate so that error messages will be able to display the inner name, while repr() will still
-    # say that this is a failure raiser.
-    # TODO consider transforming failure_raiser into a class (see comment above)
-
-    return raiser
+    # the names that the context of the failures would contain
+    available = _FAILURE_CONTEXT_FIELDS.union(kw_context_args)
+    if help_msg is not None:
+        available = available.union(('help_msg', ))
+    for var_name_ in sorted(placeholders):
+        if var_name_ not in available:
+            raise HelpMsgFormattingException(template, context=sorted(available), varname=var_name_)
+
+
+def _new_failure_raiser(cls, validation_callable, help_msg, failure_type, kw_context_args):
+    """ Used to unpickle `FailureRaiser`s """
+    return cls(validation_callable, help_msg=help_msg, failure_type=failure_type, **kw_context_args)
 
 
 def as_failure_raiser(failure_type=None,     # type: Type[ValidationFailure]
@@ -687,7 +1262,7 @@ def _none_accepter(validation_callable  # type: ValidationCallable
     # set a name so that the error messages are more user-friendly
     accept_none.__name__ = 'skip_on_none(%s)' % get_callable_name(validation_callable)
 
-    return accept_none
+    return DefinedCallable(accept_none, 'skip_on_none', validation_callable)
 
 
 def _none_rejecter(validation_callable  # type: ValidationCallable
@@ -719,7 +1294,11 @@ def _none_rejecter(validation_callable  # type: ValidationCallable
     # set a name so that the error messages are more user-friendly ==> NO ! here we want to see the checker
     reject_none.__name__ = 'reject_none(%s)' % get_callable_name(validation_callable)
 
-    return reject_none
+    return DefinedCallable(reject_none, 'fail_on_none', validation_callable)
+
+
+register_definition_factory('skip_on_none', _none_accepter)
+register_definition_factory('fail_on_none', _none_rejecter)
 
 
 def pop_kwargs(kwargs,
@@ -751,44 +1330,71 @@ def pop_kwargs(kwargs,
         return all_arguments
 
 
-def make_callable(f, is_mini_lambda=False):
-    # inspect the signature to determine if the **kw_context_args should be passed along
-    # Here we do not want to use inspect.signature but getfullargspec to be faster, but the counterpart is that we have
-    # a lot of portability-related code to handle.... :(
+signature_cache = CallableInfoCache()
+""" The cache used by `receives_ctx` to store the result of the signature inspection of each validation callable. Use
+`signature_cache.cache_info()` to get statistics and `signature_cache.clear()` to empty it. """
 
+
+def receives_ctx(f, is_mini_lambda=False):
+    # type: (...) -> bool
+    """
+    Inspects the signature of validation callable `f` to determine if the **kw_context_args should be passed along.
+    The result is cached in `signature_cache`, since the same functions are typically reused in many validators.
+
+    :param f: a validation callable
+    :param is_mini_lambda: True if `f` was created from a mini-lambda expression
+    :return: False if `f` should be called as `f(x)`, True if it should be called as `f(x, **ctx)`. A `ValueError` is
+        raised if the signature of `f` is not compliant with any of the two.
+    """
     if is_mini_lambda:
+        # functions created from mini-lambda expressions have a single positional argument
+        return False
+    else:
+        return signature_cache.get_or_compute(f, _inspect_receives_ctx)
+
+
+def _inspect_receives_ctx(f):
+    # type: (...) -> bool
+    """ The non-cached implementation of `receives_ctx` for callables that are not mini-lambda functions """
+
+    # Here we do not want to use inspect.signature but getfullargspec to be faster, but the counterpart is that we have
+    # a lot of portability-related code to handle.... :(
+    try:
+        args, varargs, varkwargs, defaults = getfullargspec(f, skip_bound_arg=True)[0:4]
+
+        nbargs = len(args) if args is not None else 0
+        nbvarargs = 1 if varargs is not None else 0
+        nbkwargs = 1 if varkwargs is not None else 0
+        nbdefaults = len(defaults) if defaults is not None else 0
+    except IsBuiltInError:
+        # built-ins: TypeError: <built-in function isinstance> is not a Python function
+        # assume signature with a single positional argument
         nbargs = 1
         nbvarargs = 0
         nbkwargs = 0
         nbdefaults = 0
-    else:
-        try:
-            args, varargs, varkwargs, defaults = getfullargspec(f, skip_bound_arg=True)[0:4]
-
-            nbargs = len(args) if args is not None else 0
-            nbvarargs = 1 if varargs is not None else 0
-            nbkwargs = 1 if varkwargs is not None else 0
-            nbdefaults = len(defaults) if defaults is not None else 0
-        except IsBuiltInError:
-            # built-ins: TypeError: <built-in function isinstance> is not a Python function
-            # assume signature with a single positional argument
-            nbargs = 1
-            nbvarargs = 0
-            nbkwargs = 0
-            nbdefaults = 0
 
     if (nbargs == 1) or (nbvarargs >= 1) or (nbargs >= 2 and nbdefaults >= (nbargs - 1)):  # can it receive 1 positional argument ?
-        if nbkwargs == 0:  # can it also receive var-keyword arguments ?
-            # no: `f(x)`
-            def call_it(x, **ctx):
-                return f(x)
-        else:
-            # yes: `f(x, **kwctx)`
-            def call_it(x, **ctx):
-                return f(x, **ctx)
+        # can it also receive var-keyword arguments ? no: `f(x)`, yes: `f(x, **kwctx)`
+        return nbkwargs != 0
     else:
         raise ValueError("Validation callable '%s' has an invalid signature: it should be callable able to receive "
                          "either a single positional argument f(x) or two f(x, ctx), or a single positional and a "
                          "var-keyword f(x, **ctx). Callable: %s" % (get_callable_name(f), f))
 
+
+def make_callable(f, is_mini_lambda=False):
+    """
+    Returns a callable with signature `(x, **ctx)` calling `f`, passing the context only if `f` supports it.
+    See `receives_ctx`.
+    """
+    if not receives_ctx(f, is_mini_lambda=is_mini_lambda):
+        # `f(x)`
+        def call_it(x, **ctx):
+            return f(x)
+    else:
+        # `f(x, **kwctx)`
+        def call_it(x, **ctx):
+            return f(x, **ctx)
+
     return call_it
@@ -3,7 +3,7 @@ from sys import version_info
 
 from makefun import with_signature
 
-from valid8.base import failure_raiser, ValidationFailure, is_mini_lambda, pop_kwargs
+from valid8.base import failure_raiser, ValidationFailure, is_mini_lambda, pop_kwargs, check_validation_callable
 
 try:  # python 3.5+
     # noinspection PyUnresolvedReferences
@@ -121,6 +121,7 @@ def make_validation_func_callable(vf_definition,                   # type: Valid
                              ' function(s) can be %s Found %s.' % (supported_syntax, vf_definition))
         else:
             # single element.
+            check_validation_callable(vf_definition)
             return callable_creator(vf_definition)
     else:
         # -- a tuple
@@ -166,6 +167,7 @@ def make_validation_func_callable(vf_definition,                   # type: Valid
                              ' function(s) can be %s Found %s.' % (supported_syntax, vf_definition))
 
         # finally create the failure raising callable
+        check_validation_callable(validation_func)
         return callable_creator(validation_func, help_msg=help_msg, failure_type=failure_type)
 
 
@@ -216,7 +218,7 @@ def make_validation_func_callables(*vf_definition,                  # type: OneO
     If a single `vf_definition` is provided AND it is a non-tuple iterable (typically a list),
     `make_validation_func_callables(vf_definition)` is equivalent to `make_validation_func_callables(*vf_definition)`
 
-    # >>> assert make_validation_func_callables([is_big]) == make_validation_func_callables(is_big) TODO re-enable when equality operator works
+    >>> assert make_validation_func_callables([is_big]) == make_validation_func_callables(is_big)
 
     Finally, if a single `vf_definition` is provided AND it is a dict-like mapping, a special syntax is enabled where
     you can put *any* part of the definition in the key and in the value. `make_validation_func_callable` will still
@@ -0,0 +1,543 @@
+import linecache
+from itertools import count
+
+try:  # python 3.5+
+    # noinspection PyUnresolvedReferences
+    from typing import Callable, Any, Tuple, Iterable, List, Dict, Optional
+    try:  # python 3.5.3-
+        # noinspection PyUnresolvedReferences
+        from typing import Type
+    except ImportError:
+        pass
+    else:
+        # noinspection PyUnresolvedReferences
+        from valid8.base import ValidationCallable
+except ImportError:
+    pass
+
+from valid8.base import FailureRaiser, ValueIsNone, ValidationFailure, NP_TRUE, get_definition, ExecutorError
+from valid8.composition import AtLeastOneFailed
+
+
+_compiled_counter = count()
+""" Used to give a unique pseudo-file name to each generated function, so that tracebacks can display the source """
+
+
+def is_inlinable(validation_callable  # type: ValidationCallable
+                 ):
+    # type: (...) -> bool
+    """
+    Returns True if the provided validation callable can be inlined by the compiler: this is the case of all
+    `FailureRaiser` created by `failure_raiser`, as long as their `__call__` was not overridden.
+
+    :param validation_callable:
+    :return:
+    """
+    return isinstance(validation_callable, FailureRaiser) \
+        and type(validation_callable).__call__ is FailureRaiser.__call__
+
+
+def _type_check(template):
+    # `instance_of`/`subclass_of` also accept a (mutable) set of types, that may be modified after the validator is
+    # created: it is not fused, so that the validation function sees its current content
+    def make_check(ref_type):
+        return None if isinstance(ref_type, set) else (template, (ref_type,))
+    return make_check
+
+
+_FUSED_CHECKS = {
+    # op: function receiving the definition args and returning (expression template, reference values), or None if
+    # this definition can not be fused.
+    # Each expression is *exactly* the test performed by the corresponding function in `valid8.validation_lib`.
+    'instance_of': _type_check("isinstance(x, {0})"),
+    'subclass_of': _type_check("issubclass(x, {0})"),
+    'gt': lambda min_value, strict: ("x > {0}" if strict else "x >= {0}", (min_value,)),
+    'lt': lambda max_value, strict: ("x < {0}" if strict else "x <= {0}", (max_value,)),
+    'between': lambda min_val, max_val, open_left, open_right: ("({0} %s x) and (x %s {1})"
+                                                                % ('<' if open_left else '<=',
+                                                                   '<' if open_right else '<='),
+                                                                (min_val, max_val)),
+    'non_empty': lambda: ("len(x) > 0", ()),
+    'empty': lambda: ("len(x) == 0", ()),
+    'minlen': lambda min_length: ("len(x) >= {0}", (min_length,)),
+    'maxlen': lambda max_length: ("len(x) <= {0}", (max_length,)),
+    'has_length': lambda ref_length: ("len(x) == {0}", (ref_length,)),
+    'length_between': lambda min_len, max_len: ("({0} <= len(x)) and (len(x) <= {1})", (min_len, max_len)),
+    'is_in': lambda allowed_values: ("x in {0}", (allowed_values,)),
+    'contains': lambda ref_value: ("{0} in x", (ref_value,)),
+    'is_subset': lambda reference_set: ("len(x - {0}) == 0", (reference_set,)),
+    'is_superset': lambda reference_set: ("len({0} - x) == 0", (reference_set,)),
+    'is_even': lambda: ("x % 2 == 0", ()),
+    'is_odd': lambda: ("x % 2 != 0", ()),
+    'is_multiple_of': lambda ref: ("x % {0} == 0", (ref,)),
+}
+""" The validation_lib operations that can be fused into a single inline check """
+
+
+def get_fused_check(validation_callable  # type: ValidationCallable
+                    ):
+    # type: (...) -> Optional[Tuple[str, Tuple]]
+    """
+    Returns the inline check equivalent to the provided validation callable if it is a failure raiser around a
+    `valid8.validation_lib` function, or None. The check is a tuple (expression template, reference values), where
+    the template uses `x` for the value and `{0}`, `{1}`... for the reference values.
+
+    :param validation_callable:
+    :return:
+    """
+    if not is_inlinable(validation_callable):
+        return None
+    definition = get_definition(validation_callable.validation_callable)
+    if definition is None:
+        return None
+    op, args = definition
+    try:
+        check_maker = _FUSED_CHECKS[op]
+    except KeyError:
+        return None
+    else:
+        return check_maker(*args)
+
+
+def _indent(lines,     # type: Iterable[str]
+            level=1    # type: int
+            ):
+    # type: (...) -> List[str]
+    return [('    ' * level) + line for line in lines]
+
+
+def _gen_call_block(i,                    # type: int
+                    validation_callable,  # type: ValidationCallable
+                    glob,                 # type: Dict[str, Any]
+                    in_and=False          # type: bool
+                    ):
+    # type: (...) -> List[str]
+    """
+    Generates the source lines validating `x` with the `i`-th validation callable. The generated code raises the exact
+    same failures than the validation callable itself, or than the `and_` around it if `in_and` is True.
+
+    :param i: the index of the validation callable, used to create unique names in `glob`
+    :param validation_callable: the validation callable
+    :param glob: the globals dictionary of the generated code, to fill with the objects used
+    :param in_and: a boolean indicating if the validation callable is one of the members of an `and_`
+    :return:
+    """
+    if is_inlinable(validation_callable):
+        # inline the failure raiser: call the inner user function directly
+        glob['_r%s' % i] = validation_callable
+        glob['_u%s' % i] = validation_callable._target
+        call = ('_u%s(x, **ctx)' if validation_callable.receives_ctx else '_u%s(x)') % i
+        lines = ["try:",
+                 "    res = %s" % call,
+                 "except _ExecutorError:",
+                 "    raise",
+                 "except Exception as e:",
+                 "    raise _r%s.create_failure(x, e)" % i,
+                 "if (res is not None) and (res is not True) and (res is not _NP_TRUE):",
+                 "    raise _r%s.create_failure(x, res, raised=False)" % i]
+        if in_and:
+            lines = ["try:"] + _indent(lines) + ["except _ExecutorError:",
+                                                 "    raise",
+                                                 "except Exception as e:",
+                                                 "    # one validator was unhappy > raise",
+                                                 "    raise _AtLeastOneFailed(_funcs, x, ctx, cause=e)"]
+        return lines
+    else:
+        # opaque validation callable (for example created by a custom `callable_creator`): call it as is
+        glob['_f%s' % i] = validation_callable
+        if in_and:
+            return ["try:",
+                    "    res = _f%s(x, **ctx)" % i,
+                    "except _ExecutorError:",
+                    "    raise",
+                    "except Exception as e:",
+                    "    raise _AtLeastOneFailed(_funcs, x, ctx, cause=e)",
+                    "if (res is not None) and (res is not True) and (res is not _NP_TRUE):",
+                    "    raise _AtLeastOneFailed(_funcs, x, ctx)"]
+        else:
+            return ["res = _f%s(x, **ctx)" % i]
+
+
+def _gen_fused_block(fused_run,    # type: List[Tuple[int, ValidationCallable, Tuple[str, Tuple]]]
+                     glob,         # type: Dict[str, Any]
+                     in_and=False  # type: bool
+                     ):
+    # type: (...) -> List[str]
+    """
+    Generates the source lines validating `x` with a run of consecutive validation callables that can be fused (see
+    `get_fused_check`). A single inline boolean expression is evaluated, and only if it is falsy or raises an exception,
+    the validation callables are executed one by one (see `_gen_call_block`) in order to raise the exact same failure.
+
+    :param fused_run: a list of tuples (index, validation callable, check)
+    :param glob: the globals dictionary of the generated code, to fill with the objects used
+    :param in_and: a boolean indicating if the validation callables are members of an `and_`
+    :return:
+    """
+    if len(fused_run) == 0:
+        return []
+
+    exprs = []
+    fallback = []
+    for i, validation_callable, (template, refs) in fused_run:
+        ref_names = []
+        for k, ref in enumerate(refs):
+            ref_name = '_d%s_%s' % (i, k)
+            glob[ref_name] = ref
+            ref_names.append(ref_name)
+        exprs.append("(%s)" % template.format(*ref_names))
+        fallback += _gen_call_block(i, validation_callable, glob, in_and=in_and)
+
+    # note: bool() is called inside the try, so that values with an ambiguous truth value (such as numpy arrays) go
+    # through the slow path too
+    return ["try:",
+            "    ok = bool(%s)" % " and ".join(exprs),
+            "except Exception:",
+            "    ok = False",
+            "if not ok:",
+            "    # slow path: execute the validation functions to raise the appropriate failure"] + _indent(fallback)
+
+
+def compile_validation_funcs(validation_funcs,  # type: Tuple[ValidationCallable, ...]
+                             none_policy,       # type: int
+                             name=None          # type: str
+                             ):
+    # type: (...) -> ValidationCallable
+    """
+    Generates and compiles a single function equivalent to `_add_none_handler(_and_(validation_funcs), none_policy)`.
+
+    The None policy, the 'and' loop, the success test and the calls to the user-provided functions wrapped by failure
+    raisers are all inlined, so that a single python frame is used. The exceptions raised in case of failure are
+    exactly the same.
+
+    :param validation_funcs: the validation callables, typically created by `make_validation_func_callables`
+    :param none_policy: an int representing the None policy, see `NonePolicy`
+    :param name: an optional `__name__` for the generated function.
+    :return:
+    """
+    # avoid circular import
+    from valid8.entry_points import NonePolicy
+
+    if len(validation_funcs) == 0:
+        raise ValueError("No validation function provided")
+
+    glob = dict(_NP_TRUE=NP_TRUE, _ValueIsNone=ValueIsNone, _AtLeastOneFailed=AtLeastOneFailed,
+                _ExecutorError=ExecutorError, _funcs=validation_funcs)
+
+    # -- the None policy
+    if none_policy is NonePolicy.SKIP:
+        # accept all None values: same as `accept_none`
+        body = ["if x is None:",
+                "    return"]
+    elif none_policy is NonePolicy.FAIL:
+        # reject all None values: same as `reject_none`
+        body = ["if x is None:",
+                "    raise _ValueIsNone(wrong_value=x)"]
+    elif none_policy is NonePolicy.VALIDATE:
+        body = []
+    else:
+        raise ValueError('Invalid none_policy : ' + str(none_policy))
+
+    # the value returned in case of success is the same than the non-compiled version, for consistency: the None
+    # handlers return nothing while `and_` returns True
+    returns_true = none_policy is NonePolicy.VALIDATE
+
+    # -- the 'and' between all validation functions
+    in_and = len(validation_funcs) > 1  # simplification for single validator case: no 'and'
+    fused_run = []  # the current run of consecutive validation functions that can be fused in a single check
+    for i, validation_callable in enumerate(validation_funcs):
+        check = get_fused_check(validation_callable)
+        if check is not None:
+            fused_run.append((i, validation_callable, check))
+        else:
+            body += _gen_fused_block(fused_run, glob, in_and=in_and)
+            fused_run = []
+            body += _gen_call_block(i, validation_callable, glob, in_and=in_and)
+    body += _gen_fused_block(fused_run, glob, in_and=in_and)
+
+    if not in_and and returns_true and not is_inlinable(validation_funcs[0]):
+        # `_and_` returns the single opaque function as is
+        body.append("return res")
+    elif in_and and returns_true:
+        body.append("return True")
+
+    filename = '<valid8-compiled-%s>' % next(_compiled_counter)
+    src = "\n".join(["def compiled_validator(x, **ctx):"] + _indent(body)) + "\n"
+
+    # register the source so that tracebacks and `inspect.getsource` work
+    linecache.cache[filename] = (len(src), None, src.splitlines(True), filename)
+
+    exec(compile(src, filename, 'exec'), glob)
+    f = glob['compiled_validator']
+    if name is not None:
+        f.__name__ = name
+    return f
+
+
+_EMPTY_CTX = dict()
+
+
+def _make_check_predicate(template,  # type: str
+                          refs       # type: Tuple
+                          ):
+    """ Creates a predicate `p(x, ctx)` from a check returned by `get_fused_check`, using the same code generation """
+    glob = dict()
+    ref_names = []
+    for k, ref in enumerate(refs):
+        glob['_d%s' % k] = ref
+        ref_names.append('_d%s' % k)
+    # note: bool() is called on the expression, exactly as the `if` statement in the validation_lib function does
+    return eval("lambda x, ctx: bool(%s)" % template.format(*ref_names), glob)
+
+
+def make_predicate(validation_callable  # type: ValidationCallable
+                   ):
+    # type: (...) -> Callable[[Any, Dict[str, Any]], bool]
+    """
+    Creates a boolean predicate `p(x, ctx)` equivalent to the provided validation callable: it returns True when the
+    validation callable succeeds, and False when it returns a non-success result or raises a `ValidationFailure`. Other
+    exceptions are propagated, exactly as the validation callable would do. No failure object is ever created.
+
+    Failure raisers, composition operators (`and_`, `or_`, `xor_`, `not_`, `skip_on_none`, `fail_on_none`),
+    `on_all_`, `on_each_` and the `validation_lib` functions are evaluated recursively as booleans. Any other callable
+    is called as is.
+
+    :param validation_callable:
+    :return:
+    """
+    if is_inlinable(validation_callable):
+        # -- failure raiser: all exceptions are turned into failures
+        inner = validation_callable.validation_callable
+        if get_definition(inner) is not None:
+            inner_predicate = make_predicate(inner)
+            if validation_callable.receives_ctx:
+                def raiser_p(x, ctx):
+                    try:
+                        return inner_predicate(x, ctx)
+                    except ExecutorError:
+                        raise
+                    except Exception:
+                        return False
+            else:
+                def raiser_p(x, ctx):
+                    try:
+                        return inner_predicate(x, _EMPTY_CTX)
+                    except ExecutorError:
+                        raise
+                    except Exception:
+                        return False
+
+        elif validation_callable.receives_ctx:
+            def raiser_p(x, ctx):
+                try:
+                    res = inner(x, **ctx)
+                except ExecutorError:
+                    raise
+                except Exception:
+                    return False
+                # return result_is_success(res): <= DO NOT REMOVE THIS COMMENT
+                return (res is None) or (res is True) or (res is NP_TRUE)
+        else:
+            def raiser_p(x, ctx):
+                try:
+                    res = inner(x)
+                except ExecutorError:
+                    raise
+                except Exception:
+                    return False
+                # return result_is_success(res): <= DO NOT REMOVE THIS COMMENT
+                return (res is None) or (res is True) or (res is NP_TRUE)
+
+        return raiser_p
+
+    definition = get_definition(validation_callable)
+    op, args = definition if definition is not None else (None, None)
+
+    check = _FUSED_CHECKS[op](*args) if op in _FUSED_CHECKS else None
+    if check is not None:
+        # -- validation_lib function
+        return _make_check_predicate(*check)
+
+    elif op in ('and', 'or', 'xor'):
+        # -- these operators raise a composition failure whatever the exception caught
+        predicates = tuple(make_predicate(f) for f in args[0])
+        if op == 'and':
+            def composition_p(x, ctx):
+                for p in predicates:
+                    try:
+                        if not p(x, ctx):
+                            return False
+                    except ExecutorError:
+                        raise
+                    except Exception:
+                        return False
+                return True
+        elif op == 'or':
+            def composition_p(x, ctx):
+                for p in predicates:
+                    try:
+                        if p(x, ctx):
+                            return True
+                    except ExecutorError:
+                        raise
+                    except Exception:
+                        pass
+                return False
+        else:
+            def composition_p(x, ctx):
+                nb_ok = 0
+                for p in predicates:
+                    try:
+                        if p(x, ctx):
+                            nb_ok += 1
+                            if nb_ok > 1:
+                                return False
+                    except ExecutorError:
+                        raise
+                    except Exception:
+                        pass
+                return nb_ok == 1
+        return composition_p
+
+    elif op == 'not':
+        predicate = make_predicate(args[0])
+        catch_all = args[1]
+
+        def not_p(x, ctx):
+            try:
+                return not predicate(x, ctx)
+            except ExecutorError:
+                raise
+            except Exception:
+                if not catch_all:
+                    raise
+                return True
+        return not_p
+
+    elif op == 'skip_on_none':
+        predicate = make_predicate(args[0])
+
+        def skip_on_none_p(x, ctx):
+            return True if x is None else predicate(x, ctx)
+        return skip_on_none_p
+
+    elif op == 'fail_on_none':
+        predicate = make_predicate(args[0])
+
+        def fail_on_none_p(x, ctx):
+            return False if x is None else predicate(x, ctx)
+        return fail_on_none_p
+
+    elif op == 'on_all':
+        # note: the elements are validated without context
+        from valid8.validation_lib.collections import get_vectorized_check, _apply_vectorized_check, np
+        predicate = make_predicate(args[0])
+        vectorized_check = []  # created on the first numpy array received, as in `on_all_`
+
+        def on_all_p(x, ctx):
+            if np is not None and isinstance(x, np.ndarray) and x.ndim == 1:
+                if len(vectorized_check) == 0:
+                    vectorized_check.append(get_vectorized_check(args[0]))
+                mask = None if vectorized_check[0] is None else _apply_vectorized_check(vectorized_check[0], x)
+                if mask is not None:
+                    return bool(mask.all())
+            for x_elt in x:
+                try:
+                    if not predicate(x_elt, _EMPTY_CTX):
+                        return False
+                except ExecutorError:
+                    raise
+                except Exception:
+                    return False
+            return True
+        return on_all_p
+
+    elif op == 'on_each':
+        predicates = tuple(make_predicate(f) for f in args[0])
+
+        def on_each_p(x, ctx):
+            if len(predicates) != len(x):
+                return False
+            for elt, predicate in zip(x, predicates):
+                try:
+                    if not predicate(elt, _EMPTY_CTX):
+                        return False
+                except ExecutorError:
+                    raise
+                except Exception:
+                    return False
+            return True
+        return on_each_p
+
+    else:
+        # -- any other callable: call it as the composition operators do. Only failures are caught
+        def callable_p(x, ctx):
+            try:
+                res = validation_callable(x, **ctx)
+            except ValidationFailure:
+                return False
+            # return result_is_success(res): <= DO NOT REMOVE THIS COMMENT
+            return (res is None) or (res is True) or (res is NP_TRUE)
+        return callable_p
+
+
+def compile_predicate(validation_funcs,  # type: Tuple[ValidationCallable, ...]
+                      none_policy,       # type: int
+                      ):
+    # type: (...) -> Callable[[Any], bool]
+    """
+    Creates a boolean predicate equivalent to `Validator.is_valid` for a validator created with the provided validation
+    callables and none policy. It returns True in case of success and False otherwise, without ever creating any
+    failure object for the validation callables that are understood by `make_predicate`.
+
+    :param validation_funcs: the validation callables, typically created by `make_validation_func_callables`
+    :param none_policy: an int representing the None policy, see `NonePolicy`
+    :return:
+    """
+    # avoid circular import
+    from valid8.entry_points import NonePolicy
+
+    predicates = tuple(make_predicate(f) for f in validation_funcs)
+    if none_policy is NonePolicy.VALIDATE:
+        none_result = None
+    elif none_policy is NonePolicy.SKIP:
+        none_result = True
+    elif none_policy is NonePolicy.FAIL:
+        none_result = False
+    else:
+        raise ValueError('Invalid none_policy : ' + str(none_policy))
+
+    def main_predicate(x):
+        if x is None and none_result is not None:
+            return none_result
+        # note: `Validator.is_valid` does not pass any context to the main function
+        try:
+            for p in predicates:
+                if not p(x, _EMPTY_CTX):
+                    return False
+        except ExecutorError:
+            raise
+        except Exception:
+            # caught exception means failure > return False
+            return False
+        return True
+
+    return main_predicate
+
+
+def compile_validator(validator  # type: Validator
+                      ):
+    # type: (...) -> Validator
+    """
+    Compiles the provided `Validator` in place: its `main_function` is replaced with a single generated function
+    equivalent to the original chain of wrappers (see `compile_validation_funcs`), and a boolean `main_predicate` is
+    created for `is_valid` (see `compile_predicate`).
+
+    Note that you can also use `Validator(..., compile=True)`.
+
+    :param validator: the `Validator` to compile
+    :return: the same validator, for convenience
+    """
+    validator.main_function = compile_validation_funcs(validator.validation_funcs, validator.none_policy,
+                                                       name=validator.get_main_function_name())
+    validator.main_predicate = compile_predicate(validator.validation_funcs, validator.none_policy)
+    return validator
@@ -1,17 +1,19 @@
 from abc import abstractmethod
 from collections import OrderedDict
+from copy import copy
 from sys import version_info
 
 from makefun import with_signature
 
 from valid8.base import ValidationFailure, get_callable_names, get_callable_name, _none_accepter, _none_rejecter, \
-    pop_kwargs, NP_TRUE
+    pop_kwargs, NP_TRUE, DefinedCallable, register_definition_factory, ExecutorError
+from valid8.utils.cache_tools import IdentityDict
 from valid8.common_syntax import make_validation_func_callables
 
 
 try:  # python 3.5+
     # noinspection PyUnresolvedReferences
-    from typing import Callable, Union, List, Tuple, Iterable, Mapping, Any
+    from typing import Callable, Union, List, Tuple, Iterable, Mapping, Any, Dict
     try:  # python 3.5.3-
         from typing import Type
     except ImportError:
@@ -34,28 +36,37 @@ except ImportError:
 class CompositionFailure(ValidationFailure):
     """ Root failure of all composition operators """
 
+    __replay_validators__ = True
+    """ If True (default), all validators are replayed on the value the first time that the successes and failures are
+    needed (string representation, details, `successes`, `failures`). Set this to False on the class or on a subclass
+    to disable the replay, for example in production: the details will then not be available. """
+
     def __init__(self,
                  validators,
                  value,
                  ctx,
-                 cause=None  # type: Exception
+                 cause=None,   # type: Exception
+                 results=None  # type: Tuple[List[str], Mapping[Callable, Any]]
                  ):
         """
         Constructor from a list of validators and a value.
-        The constructor will replay the validation process in order to get all the results and attach them in
-        the message
+        The validation process is not replayed in the constructor: it is replayed lazily the first time that the
+        results are needed, in order to get all the results and attach them in the message. Note that if `value` is
+        modified in the meantime, the results will reflect the modified value. If the value is not retained (see
+        `__retention_policy__`), the validation process is replayed in the constructor.
 
         :param validators:
         :param value:
-        :param cause
+        :param ctx:
+        :param cause:
+        :param results: an optional tuple (successes, failures) if the results are already known. In that case the
+            validation process is not replayed.
         """
-        successes, failures = self.play_all_validators(validators, value, **ctx)
-
         # store information
         self.validators = validators
         self.value = value
-        self.successes = successes
-        self.failures = failures
+        self._ctx = ctx
+        self._results = results
 
         super(CompositionFailure, self).__init__(wrong_value=value)
 
@@ -63,6 +74,50 @@ class CompositionFailure(ValidationFailure):
         if cause is not None:
             self.__cause__ = cause
 
+    def _apply_retention_policy(self):
+        """ Extended so that the validators are replayed before the value is released """
+        if self.__replay_validators__:
+            self._get_results()
+        super(CompositionFailure, self)._apply_retention_policy()
+        self.value = self.wrong_value
+        self._ctx = None
+
+    def _get_results(self):
+        """
+        Returns the tuple (successes, failures) obtained by replaying all validators. It is computed on first call only.
+        If `__replay_validators__` is False, (None, None) is returned.
+        """
+        if self._results is None:
+            if not self.__replay_validators__:
+                return None, None
+            self._results = self.play_all_validators(self.validators, self.value, **self._ctx)
+        return self._results
+
+    @property
+    def successes(self):
+        """ The list of names of the validators that succeeded, or None if `__replay_validators__` is False """
+        return self._get_results()[0]
+
+    @property
+    def failures(self):
+        """
+        The dictionary of the results of the validators that failed, keyed by validator, or None if
+        `__replay_validators__` is False. Validators are compared by identity in this dictionary, so that structurally
+        equal validators (for example two `gt(5)`) are distinct entries.
+        """
+        return self._get_results()[1]
+
+    def get_context_for_help_msgs(self):
+        """ Overridden so that the lazily computed `successes` and `failures` are available for formatting """
+        context_dict = super(CompositionFailure, self).get_context_for_help_msgs()
+        if self.help_msg is None or len(self.help_msg) == 0:
+            return context_dict
+
+        if context_dict is self.__dict__:
+            context_dict = copy(context_dict)
+        context_dict['successes'], context_dict['failures'] = self._get_results()
+        return context_dict
+
     def get_str_for_errors(self):
         """The method called by `ValidationError` and self.get_details() in case of wrapped failure"""
         # overridden so that the type is not displayed
@@ -71,9 +126,16 @@ class CompositionFailure(ValidationFailure):
     def get_details(self, compact_mode=False):
         """ Overrides the base method in order to give details on the various successes and failures """
 
+        what = self.get_what()
+        possibly_value = "" if compact_mode else (" for value %r" % self.wrong_value)
+        successes, failures = self._get_results()
+        if failures is None:
+            # replay is disabled
+            return '%s%s. Successes / Failures details are not available.' % (what, possibly_value)
+
         # transform the dictionary of failures into a printable form
         failures_for_print = OrderedDict()
-        for validator, failure in self.failures.items():
+        for validator, failure in failures.items():
             name = get_callable_name(validator)
             while name in failures_for_print:
                 name += '_'
@@ -91,9 +153,7 @@ class CompositionFailure(ValidationFailure):
         failures_str = '{' + ', '.join(key_values_str) + '}'
 
         # Note: we do note cite the value in the message since it is most probably available in inner messages [{val}]
-        what = self.get_what()
-        possibly_value = "" if compact_mode else (" for value %r" % self.wrong_value)
-        return '%s%s. Successes: %s / Failures: %s.' % (what, possibly_value, self.successes, failures_str)
+        return '%s%s. Successes: %s / Failures: %s.' % (what, possibly_value, successes, failures_str)
 
     def play_all_validators(self, validators, value, **ctx):
         """
@@ -104,7 +164,7 @@ class CompositionFailure(ValidationFailure):
         :return:
         """
         successes = list()
-        failures = OrderedDict()
+        failures = IdentityDict()
         for validator in validators:
             name = get_callable_name(validator)
             try:
@@ -166,6 +226,8 @@ def _and_(validation_funcs  # type: ValidationFuncs
             for validator in validation_funcs:
                 try:
                     res = validator(x, **ctx)
+                except ExecutorError:
+                    raise
                 except Exception as e:
                     # one validator was unhappy > raise
                     raise AtLeastOneFailed(validation_funcs, x, ctx, cause=e)
@@ -177,7 +239,10 @@ def _and_(validation_funcs  # type: ValidationFuncs
             return True
 
         and_v_.__name__ = 'and(%s)' % get_callable_names(validation_funcs)
-        return and_v_
+        return DefinedCallable(and_v_, 'and', validation_funcs)
+
+
+register_definition_factory('and', _and_)
 
 
 class DidNotFail(ValidationFailure):
@@ -217,6 +282,8 @@ def not_(validation_func,  # type: ValidationCallable
         except ValidationFailure:
             return True  # caught failure: always return True
 
+        except ExecutorError:
+            raise
         except Exception as e:
             if not catch_all:
                 raise e
@@ -227,7 +294,10 @@ def not_(validation_func,  # type: ValidationCallable
         raise DidNotFail(validation_func=validation_func, wrong_value=x, validation_outcome=res)
 
     not_v_.__name__ = 'not(%s)' % get_callable_name(validation_func)
-    return not_v_
+    return DefinedCallable(not_v_, 'not', validation_func, catch_all)
+
+
+register_definition_factory('not', not_)
 
 
 class AllValidatorsFailed(CompositionFailure):
@@ -256,7 +326,11 @@ def or_(*validation_func  # type: ValidationFuncs
     """
 
     validation_func = make_validation_func_callables(*validation_func)
+    return _or_(validation_func)
+
 
+def _or_(validation_func  # type: ValidationFuncs
+         ):
     if len(validation_func) == 1:
         return validation_func[0]  # simplification for single validator case
     else:
@@ -269,6 +343,8 @@ def or_(*validation_func  # type: ValidationFuncs
                     if (res is None) or (res is True) or (res is NP_TRUE):
                         # we can return : one validator was happy
                         return True
+                except ExecutorError:
+                    raise
                 except Exception:
                     # catch all silently
                     pass
@@ -277,7 +353,10 @@ def or_(*validation_func  # type: ValidationFuncs
             raise AllValidatorsFailed(validation_func, x, ctx)
 
         or_v_.__name__ = 'or(%s)' % get_callable_names(validation_func)
-        return or_v_
+        return DefinedCallable(or_v_, 'or', validation_func)
+
+
+register_definition_factory('or', _or_)
 
 
 class XorTooManySuccess(CompositionFailure):
@@ -306,7 +385,11 @@ def xor_(*validation_func  # type: ValidationFuncs
     """
 
     validation_func = make_validation_func_callables(*validation_func)
+    return _xor_(validation_func)
+
 
+def _xor_(validation_func  # type: ValidationFuncs
+          ):
     if len(validation_func) == 1:
         return validation_func[0]  # simplification for single validation function case
     else:
@@ -319,6 +402,8 @@ def xor_(*validation_func  # type: ValidationFuncs
                     # if result_is_success(res): <= DO NOT REMOVE THIS COMMENT
                     if (res is None) or (res is True) or (res is NP_TRUE):
                         ok_validators.append(val_func)
+                except ExecutorError:
+                    raise
                 except Exception:
                     pass
 
@@ -336,7 +421,10 @@ def xor_(*validation_func  # type: ValidationFuncs
                 raise AllValidatorsFailed(validation_func, x, ctx)
 
         xor_v_.__name__ = 'xor(%s)' % get_callable_names(validation_func)
-        return xor_v_
+        return DefinedCallable(xor_v_, 'xor', validation_func)
+
+
+register_definition_factory('xor', _xor_)
 
 
 # Python 3+: load the 'more explicit api'
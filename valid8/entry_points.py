@@ -1,17 +1,17 @@
 import sys
+from collections import deque
 from copy import copy
 
-try:
-    from functools import lru_cache
-except ImportError:
-    from functools32 import lru_cache
+from threading import Lock
+from weakref import ref
 
 from makefun import with_signature
 from six import with_metaclass
+from six.moves import copyreg
 
 try:  # python 3.5+
     # noinspection PyUnresolvedReferences
-    from typing import Callable, Any, List, Union
+    from typing import Callable, Any, List, Union, Tuple, Iterable, Optional, Hashable
     try:  # python 3.5.3-
         # noinspection PyUnresolvedReferences
         from typing import Type
@@ -27,10 +27,12 @@ try:  # python 3.5+
 except ImportError:
     use_typing = False
 
-from valid8.utils.string_tools import end_with_dot
+from valid8.utils.string_tools import end_with_dot, bounded_str
+from valid8.utils.cache_tools import LRUCache, make_definition_key, UnhashableDefinition, InternTable, \
+    get_identity_objects
 from valid8.base import get_callable_name, _none_accepter, _none_rejecter, RootException, failure_raiser, \
     ValidationFailure, HelpMsgMixIn, is_error_of_type, HelpMsgFormattingException, should_be_hidden_as_cause, raise_, \
-    pop_kwargs, NP_TRUE
+    pop_kwargs, NP_TRUE, RetentionPolicy, retain_value, clear_tracebacks, ExecutorError
 from valid8.common_syntax import make_validation_func_callables
 from valid8.composition import _and_
 
@@ -115,13 +117,117 @@ def _add_none_handler(validation_callable,  # type: ValidationCallable
         raise ValueError('Invalid none_policy : ' + str(none_policy))  # invalid none_policy
 
 
+class _ValidatorChain(object):
+    """
+    The part of a `Validator` that only depends on its validation functions, callables creator, none policy and compile
+    option: the validation callables, the main validation function and the optional boolean predicate. It does not
+    contain any per-validator information such as names or help messages, so it can be shared by all validators with
+    the same definition. See `validator_chains`.
+    """
+    __slots__ = 'validation_funcs', 'main_function', 'main_predicate', '_definition', '__weakref__'
+
+    def __init__(self,
+                 validation_func,   # type: Tuple[ValidationFuncs, ...]
+                 callable_creator,  # type: Callable
+                 none_policy,       # type: int
+                 compile_           # type: bool
+                 ):
+        self._definition = (validation_func, callable_creator, none_policy, compile_)
+
+        # replace validation_func dicts / lists / tuples with explicit 'and' and failure raiser
+        self.validation_funcs = make_validation_func_callables(*validation_func, callable_creator=callable_creator)
+        main_val_func = _and_(self.validation_funcs)
+
+        # finally wrap in a none handler according to the policy
+        self.main_function = _add_none_handler(main_val_func, none_policy=none_policy)
+        self.main_predicate = None
+
+        if compile_:
+            # replace the chain of wrappers with a single generated function
+            from valid8.compiler import compile_validation_funcs, compile_predicate
+            self.main_function = compile_validation_funcs(self.validation_funcs, none_policy,
+                                                          name=get_callable_name(self.main_function))
+            self.main_predicate = compile_predicate(self.validation_funcs, none_policy)
+
+    def __reduce__(self):
+        """ Chains are pickled as their definition, and recreated (or reused, see `validator_chains`) when unpickled.
+        This way compiled functions do not need to be picklable. """
+        return _get_validator_chain, self._definition
+
+    def estimate_size(self):
+        # type: (...) -> int
+        """
+        Returns the approximate size in bytes of the objects created for this chain: the validation callables created
+        by the callables creator, and the wrapper functions. The user-provided functions are not included.
+        """
+        size = sys.getsizeof(self.validation_funcs)
+        funcs = list(self.validation_funcs)
+        for f in (self.main_function, self.main_predicate):
+            if f is not None and all(f is not v for v in self.validation_funcs):
+                funcs.append(f)
+
+        for f in funcs:
+            size += sys.getsizeof(f)
+            for cell in getattr(f, '__closure__', None) or ():
+                size += sys.getsizeof(cell)
+            f_dict = getattr(f, '__dict__', None)
+            if f_dict:
+                size += sys.getsizeof(f_dict)
+        return size
+
+
+validator_chains = InternTable()
+""" The table of validation chains shared by all `Validator`s (including the ones created by the decorators) with
+structurally identical definitions: same validation functions, help messages, failure types, none policy and compile
+option. Use `validator_chains.cache_info()` to get statistics, including the approximate memory saved. Set
+`validator_chains.enabled = False` to disable sharing. """
+
+
+def _get_validator_chain(validation_func,  # type: Tuple[ValidationFuncs, ...]
+                         callable_creator,  # type: Callable
+                         none_policy,       # type: int
+                         compile_           # type: bool
+                         ):
+    # type: (...) -> _ValidatorChain
+    """
+    Returns a `_ValidatorChain` for the provided definition, from `validator_chains` if possible. If the definition
+    contains elements that can not be used in a key, a new chain is created.
+
+    :param validation_func:
+    :param callable_creator:
+    :param none_policy:
+    :param compile_:
+    :return:
+    """
+    def create_chain():
+        return _ValidatorChain(validation_func, callable_creator, none_policy, compile_)
+
+    if not validator_chains.enabled:
+        return create_chain()
+
+    try:
+        # mutable arguments retained by the chain (e.g. `is_in(allowed)`) are keyed by identity, since they may change
+        key = make_definition_key((validation_func, callable_creator, none_policy, bool(compile_)),
+                                  mutables_by_identity=True)
+    except UnhashableDefinition:
+        return create_chain()
+
+    return validator_chains.get_or_create(key, create_chain, size_estimator=_ValidatorChain.estimate_size)
+
+
 class MetaReprForValidationError(type):
     """ Utility metaclass used in add_base_type_dynamically """
     def __repr__(cls):
         return repr(cls.__bases__[0])[:-2] + '[' + cls.__bases__[1].__name__ + ']' + repr(cls.__bases__[0])[-2:]
 
 
-@lru_cache(maxsize=32)
+dynamic_error_types = dict()
+""" The registry of the types created by `add_base_type_dynamically`, keyed by `(error_type, additional_type)`. Each
+type is created only once, so that all errors of the same kind have the same type. """
+
+_dynamic_error_types_lock = Lock()
+
+
 def add_base_type_dynamically(error_type, additional_type):
     """
     Utility method to create a new type dynamically, inheriting from both error_type (first) and additional_type
@@ -134,18 +240,46 @@ def add_base_type_dynamically(error_type, additional_type):
     > repr(new_type)
     "<class 'valid8.entry_points.ValidationError+ValueError'>"
     ```
+
+    The types are stored in the `dynamic_error_types` registry and created only once. They can be pickled: they are
+    unpickled by calling this function again with the same arguments.
+
     :return:
     """
-    # the new type created dynamically, with the same name
-    class NewErrorType(with_metaclass(MetaReprForValidationError, error_type, additional_type, object)):
+    key = (error_type, additional_type)
+    try:
+        return dynamic_error_types[key]
+    except KeyError:
         pass
 
-    NewErrorType.__name__ = error_type.__name__ + '[' + additional_type.__name__ + ']'
-    if sys.version_info >= (3, 0):
-        NewErrorType.__qualname__ = error_type.__qualname__ + '[' + additional_type.__qualname__ + ']'
-    NewErrorType.__module__ = error_type.__module__
+    with _dynamic_error_types_lock:
+        try:
+            return dynamic_error_types[key]
+        except KeyError:
+            # the new type created dynamically, with the same name
+            class NewErrorType(with_metaclass(MetaReprForValidationError, error_type, additional_type, object)):
+                pass
+
+            NewErrorType.__name__ = error_type.__name__ + '[' + additional_type.__name__ + ']'
+            if sys.version_info >= (3, 0):
+                NewErrorType.__qualname__ = error_type.__qualname__ + '[' + additional_type.__qualname__ + ']'
+            NewErrorType.__module__ = error_type.__module__
+
+            dynamic_error_types[key] = NewErrorType
+            return NewErrorType
+
+
+def _reduce_dynamic_error_type(cls):
+    """ Pickles the types created by `add_base_type_dynamically` as a call to this function. Other types with the same
+    metaclass (subclasses of these types) are pickled by reference as usual """
+    key = cls.__bases__[0:2]
+    if dynamic_error_types.get(key, None) is cls:
+        return add_base_type_dynamically, key
+    else:
+        return getattr(cls, '__qualname__', cls.__name__)
+
 
-    return NewErrorType
+copyreg.pickle(MetaReprForValidationError, _reduce_dynamic_error_type)
 
 
 class ValidationError(HelpMsgMixIn, RootException):
@@ -224,6 +358,15 @@ class ValidationError(HelpMsgMixIn, RootException):
     # We do not use slots otherwise `help_msg` cannot easily be overridden by a class attribute
     # __slots__ = 'validator', 'var_value', 'var_name', 'validation_outcome', 'append_details', 'context'
 
+    __retention_policy__ = RetentionPolicy.KEEP
+    """ The `RetentionPolicy` applied to `var_value` when errors are created. It can be changed on this class or on a
+    subclass. Note that the failure held by the error has its own policy, see `ValidationFailure.__retention_policy__`.
+    """
+
+    __clear_tracebacks__ = False
+    """ If True, the tracebacks of errors and of their chain of causes (including the failures) are cleared after their
+    string representation is rendered, see `valid8.base.clear_tracebacks`. """
+
     @classmethod
     def create_with_dynamic_type(cls, validator, name, value, validation_outcome, help_msg, **ctx):
         """
@@ -331,6 +474,8 @@ class ValidationError(HelpMsgMixIn, RootException):
         """
         # store everything in self
         self.validator = validator
+        if self.__retention_policy__ != RetentionPolicy.KEEP:
+            var_value = retain_value(var_value, self.__retention_policy__, self.__max_str_length_displayed__)
         self.var_value = var_value
         self.var_name = var_name
         if failure is not None and not isinstance(failure, ValidationFailure):
@@ -368,6 +513,12 @@ class ValidationError(HelpMsgMixIn, RootException):
 
     def __str__(self):
         """ Overrides the default exception message by relying on HelpMsgMixIn """
+        msg = self._to_str()
+        if self.__clear_tracebacks__:
+            clear_tracebacks(self)
+        return msg
+
+    def _to_str(self):
         try:
             help_msg = self.get_help_msg()
             if self.append_details:
@@ -421,11 +572,11 @@ class ValidationError(HelpMsgMixIn, RootException):
         else:
             prefix = self.var_name
 
-        suffix = str(self.var_value)
-        if len(suffix) == 0:
-            suffix = "''"
-        elif len(suffix) > self.__max_str_length_displayed__:
+        suffix = bounded_str(self.var_value, self.__max_str_length_displayed__)
+        if suffix is None:
             suffix = ''
+        elif len(suffix) == 0:
+            suffix = "''"
 
         if len(prefix) > 0 and len(suffix) > 0:
             return prefix + '=' + suffix
@@ -440,6 +591,7 @@ if use_typing:
                   error_type: 'Type[ValidationError]' = None,
                   help_msg: str = None,
                   none_policy: int = None,
+                  compile: bool = False,
                   **kw_context_args):"""
 else:
     new_sig = None
@@ -458,7 +610,8 @@ class Validator(object):
     to raise the top-level `ValidationError` or subclass if user-provided (recommended, use constructor argument
     `error_type`). See `ValidationError` for details.
     """
-    __slots__ = 'main_function', 'help_msg', 'error_type', 'none_policy', 'kw_context_args'
+    __slots__ = 'main_function', 'main_predicate', 'validation_funcs', 'help_msg', 'error_type', 'none_policy', \
+                'kw_context_args', '_chain'
 
     @with_signature(new_sig)
     def __init__(self,
@@ -526,13 +679,18 @@ class Validator(object):
         :param none_policy: describes how None values should be handled. See `NonePolicy` for the various possibilities.
             Default is `NonePolicy.VALIDATE`, meaning that None values will be treated exactly like other values and
             follow the same validation process.
+        :param compile: if True, the chain of wrappers around the base validation functions (None policy, `and_`,
+            failure raisers) is replaced with a single generated function, that is faster. The failures raised are the
+            same. A boolean-only predicate is also created for `is_valid`, so that no failure object is created when
+            the value is invalid. See `valid8.compiler`. Default is False.
         :param kw_context_args: optional contextual information to store in the exception, and that may be also used
             to format the help message
         """
         # pop without setting defaults since we want to check if values were actually provided
-        error_type, help_msg, none_policy = pop_kwargs(kwargs, [('error_type', None),
-                                                                ('help_msg', None),
-                                                                ('none_policy', None)], allow_others=True)
+        error_type, help_msg, none_policy, compile_ = pop_kwargs(kwargs, [('error_type', None),
+                                                                          ('help_msg', None),
+                                                                          ('none_policy', None),
+                                                                          ('compile', False)], allow_others=True)
         # the rest of keyword arguments is used as context.
         kw_context_args = kwargs
 
@@ -550,13 +708,34 @@ class Validator(object):
 
         self.kw_context_args = kw_context_args
 
-        # replace validation_func dicts / lists / tuples with explicit 'and' and failure raiser
-        validation_funcs = make_validation_func_callables(*validation_func,
-                                                          callable_creator=self.get_callables_creator())
-        main_val_func = _and_(validation_funcs)
+        # create the chain of validation callables, or reuse an identical one (see `validator_chains`)
+        chain = _get_validator_chain(validation_func, callable_creator=self.get_callables_creator(),
+                                     none_policy=self.none_policy, compile_=compile_)
+        self._chain = chain
+        self.validation_funcs = chain.validation_funcs
+        self.main_function = chain.main_function
 
-        # finally wrap in a none handler according to the policy
-        self.main_function = _add_none_handler(main_val_func, none_policy=self.none_policy)
+        # the boolean-only equivalent of main_function used in `is_valid`, if any
+        self.main_predicate = chain.main_predicate
+
+    def __getstate__(self):
+        """
+        Validators are pickled without their validation callables and main function: they are recreated from the
+        definition of the validation chain when unpickled. The user-provided validation functions should be picklable,
+        that is, defined at module level.
+        """
+        state = dict(getattr(self, '__dict__', ()))
+        for name in ('help_msg', 'error_type', 'none_policy', 'kw_context_args', '_chain'):
+            state[name] = getattr(self, name)
+        return state
+
+    def __setstate__(self, state):
+        for name, value in state.items():
+            setattr(self, name, value)
+        chain = self._chain
+        self.validation_funcs = chain.validation_funcs
+        self.main_function = chain.main_function
+        self.main_predicate = chain.main_predicate
 
     def get_callables_creator(self):
         """Subclasses may override this """
@@ -696,6 +875,10 @@ class Validator(object):
         :param value: the value to validate
         :return: a boolean flag indicating success or failure
         """
+        if self.main_predicate is not None:
+            # compiled boolean-only path: never creates failures
+            return self.main_predicate(value)
+
         # noinspection PyBroadException
         try:
             # perform validation
@@ -705,10 +888,248 @@ class Validator(object):
             # return result_is_success(res): <= DO NOT REMOVE THIS COMMENT
             return (res is None) or (res is True) or (res is NP_TRUE)
 
+        except ExecutorError:
+            raise
         except Exception:
             # caught exception means failure > return False
             return False
 
+    def validate_many(self,
+                      values,           # type: Iterable[Any]
+                      mode='mask',      # type: str
+                      name='values',    # type: str
+                      error_type=None,  # type: Type[ValidationError]
+                      help_msg=None,    # type: str
+                      **kw_context_args):
+        # type: (...) -> Union[List[bool], Optional[ValidationError], List[Tuple[int, ValidationFailure]]]
+        """
+        Validates all the provided values in a single call. This is faster than calling `is_valid` or `assert_valid`
+        on each value, since the contextual information is merged once for the whole batch and validation errors are
+        only created for invalid values, if needed. Depending on `mode`, this returns:
+
+         * 'mask' (default): a list of booleans indicating success or failure for each value, as `is_valid` would do.
+         The boolean `main_predicate` of compiled validators is used directly. If `values` is a one-dimensional numpy
+         array of numbers and all validation functions can be vectorized (see
+         `valid8.validation_lib.get_vectorized_check`), the mask is computed at once on the whole array.
+
+         * 'first_error': the `ValidationError` that `assert_valid` would raise for the first invalid value, or `None`
+         if all values are valid. The error is returned, not raised. Its variable name is `<name>[<index>]`.
+
+         * 'all_errors': a list of `(index, failure)` tuples, one for each invalid value, where `failure` is the
+         `ValidationFailure` raised by the main validation function. No `ValidationError` is created.
+
+        :param values: an iterable of values to validate
+        :param mode: 'mask', 'first_error' or 'all_errors'. See above.
+        :param name: the name of the collection of values, used as a prefix in the variable name of the error returned
+            in 'first_error' mode. Default is 'values'
+        :param error_type: a subclass of `ValidationError` to use in 'first_error' mode. By default a
+            `ValidationError` will be created with the provided `help_msg`
+        :param help_msg: an optional help message to be used in the error created in 'first_error' mode.
+        :param kw_context_args: optional contextual information to use during validation and to store in the error
+        :return:
+        """
+        if mode == 'mask':
+            mask = self._get_vectorized_mask(values)
+            if mask is not None:
+                return mask.tolist()
+
+            predicate = self.main_predicate
+            if predicate is not None:
+                # compiled boolean-only path: never creates failures
+                return [predicate(value) for value in values]
+
+            main_function = self.main_function
+            results = []
+            for value in values:
+                # noinspection PyBroadException
+                try:
+                    res = main_function(value)
+                except ExecutorError:
+                    raise
+                except Exception:
+                    results.append(False)
+                else:
+                    # result_is_success(res): <= DO NOT REMOVE THIS COMMENT
+                    results.append((res is None) or (res is True) or (res is NP_TRUE))
+            return results
+
+        elif mode not in ('first_error', 'all_errors'):
+            raise ValueError("Invalid mode %r: should be 'mask', 'first_error' or 'all_errors'" % mode)
+
+        if len(kw_context_args) > 0:
+            ctx = copy(self.kw_context_args)
+            ctx.update(kw_context_args)
+        else:
+            ctx = self.kw_context_args
+
+        main_function = self.main_function
+        if mode == 'first_error':
+            for idx, value in enumerate(values):
+                try:
+                    main_function(value, **ctx)
+                except ValidationFailure as f:
+                    return self._create_validation_error('%s[%s]' % (name, idx), value, validation_outcome=f,
+                                                         error_type=error_type, help_msg=help_msg, **ctx)
+            return None
+        else:
+            failures = []
+            for idx, value in enumerate(values):
+                try:
+                    main_function(value, **ctx)
+                except ValidationFailure as f:
+                    failures.append((idx, f))
+            return failures
+
+    def _get_vectorized_mask(self, values):
+        """
+        Returns the boolean validity mask of `values` computed at once on the whole array, if `values` is a
+        one-dimensional numpy array of numbers and all validation functions can be vectorized. Otherwise returns None.
+        """
+        from valid8.validation_lib.collections import get_vectorized_check, _apply_vectorized_check, np
+
+        if np is None or not isinstance(values, np.ndarray) or values.ndim != 1:
+            return None
+
+        mask = None
+        for validation_func in self.validation_funcs:
+            check = get_vectorized_check(validation_func)
+            if check is None:
+                return None
+            func_mask = _apply_vectorized_check(check, values)
+            if func_mask is None:
+                return None
+            mask = func_mask if mask is None else (mask & func_mask)
+        return mask
+
+    def aassert_valid(self,
+                      name,             # type: str
+                      value,            # type: Any
+                      error_type=None,  # type: Type[ValidationError]
+                      help_msg=None,    # type: str
+                      concurrency=None,  # type: Union[bool, int]
+                      **kw_context_args):
+        """
+        Asynchronous version of `assert_valid`, to use with validation functions returning awaitables (for example
+        `async def` functions): `await validator.aassert_valid(name, value)`. Validation functions are awaited in order,
+        or concurrently depending on `concurrency`. See `valid8.entry_points_async` for details. Requires python 3.5+.
+
+        :param name: the name of the variable to validate (for error messages)
+        :param value: the value to validate
+        :param error_type: a subclass of `ValidationError` to raise in case of validation failure. By default a
+            `ValidationError` will be raised with the provided `help_msg`
+        :param help_msg: an optional help message to be used in the raised error in case of validation failure.
+        :param concurrency: `False` to await the validation functions in order with short-circuit, `True` to await
+            them concurrently (at most `valid8.entry_points_async.default_max_concurrency` at a time), or a positive
+            integer to await them concurrently with this limit. Default is `None`, meaning
+            `valid8.entry_points_async.concurrent_validation` and `default_max_concurrency`.
+        :param kw_context_args: optional contextual information to store in the exception, and that may be also used
+            to format the help message
+        :return: an awaitable, returning nothing in case of success and raising a ValidationError otherwise.
+        """
+        from valid8.entry_points_async import aassert_valid_with
+        return aassert_valid_with(self, name, value, error_type=error_type, help_msg=help_msg,
+                                  concurrency=concurrency, **kw_context_args)
+
+    def ais_valid(self,
+                  value,            # type: Any
+                  concurrency=None  # type: Union[bool, int]
+                  ):
+        """
+        Asynchronous version of `is_valid`, to use with validation functions returning awaitables:
+        `await validator.ais_valid(value)`. See `valid8.entry_points_async` for details. Requires python 3.5+.
+
+        :param value: the value to validate
+        :param concurrency: the concurrency of the validation, see `aassert_valid`.
+        :return: an awaitable returning a boolean flag indicating success or failure
+        """
+        from valid8.entry_points_async import ais_valid_with
+        return ais_valid_with(self, value, concurrency=concurrency)
+
+
+validators_cache = LRUCache(maxsize=256)
+""" The cache of the `Validator`s used by the `assert_valid` and `is_valid` functions, keyed by the structure of
+the validation definition. Use `validators_cache.cache_info()` to get statistics and `clear_validators_cache()` to
+empty it. Set `validators_cache.maxsize = 0` to disable it. """
+
+_seen_definitions = LRUCache(maxsize=256)
+""" The keys of the definitions depending on object identities that were seen once, see `_get_cached_validator` """
+
+_dead_definitions = deque()
+""" The keys of `_seen_definitions` containing objects that were garbage-collected since, to be removed """
+
+
+def clear_validators_cache():
+    """
+    Empties `validators_cache` and resets its statistics. The definitions seen once are forgotten too, so that the
+    definitions depending on object identities are again only cached the second time they are seen.
+    """
+    validators_cache.clear()
+    _seen_definitions.clear()
+    _dead_definitions.clear()
+
+
+def _see_definition(key,         # type: Hashable
+                    identities   # type: List[Any]
+                    ):
+    """
+    Records in `_seen_definitions` that `key` was seen once. When one of the objects compared by identity in the key
+    is garbage-collected, the key is removed at the next call: otherwise keys of dead lambdas, that often get the same
+    id (hence the same hash) as the next ones, would pile up and slow down the lookups.
+    """
+    while _dead_definitions:
+        _seen_definitions.pop(_dead_definitions.popleft())
+
+    def forget(_, key=key):
+        # note: only append here, since this may be called by the garbage collector at any time
+        _dead_definitions.append(key)
+
+    refs = []
+    for obj in identities:
+        try:
+            refs.append(ref(obj, forget))
+        except TypeError:
+            # not weak-referenceable: the key holds a strong reference on it
+            pass
+    _seen_definitions.put(key, refs)
+
+
+def _get_cached_validator(validation_func,  # type: Tuple[ValidationFuncs, ...]
+                          error_type,       # type: Type[ValidationError]
+                          help_msg,         # type: str
+                          none_policy       # type: int
+                          ):
+    # type: (...) -> Validator
+    """
+    Returns a `Validator` for the provided definition, from `validators_cache` if possible. If the definition contains
+    elements that can not be used in a cache key, the cache is bypassed and a new `Validator` is returned. Validators
+    are not compiled, so that they raise exactly the same errors than `Validator(*validation_func)`.
+
+    Definitions that contain user functions or mutable containers are keyed by identity: they are only cached the
+    second time they are seen, so that inline lambdas (a new function at each call) are not kept alive by the cache.
+
+    :param validation_func:
+    :param error_type:
+    :param help_msg:
+    :param none_policy:
+    :return:
+    """
+    try:
+        key = make_definition_key((validation_func, error_type, help_msg, none_policy), mutables_by_identity=True)
+    except UnhashableDefinition:
+        return Validator(*validation_func, error_type=error_type, help_msg=help_msg, none_policy=none_policy)
+
+    validator = validators_cache.get(key)
+    if validator is None:
+        identities = get_identity_objects(key)
+        if identities and _seen_definitions.get(key) is None:
+            # first time: do not cache. Note: identity keys only hold weak references when possible
+            _see_definition(key, identities)
+            return Validator(*validation_func, error_type=error_type, help_msg=help_msg, none_policy=none_policy)
+
+        validator = Validator(*validation_func, error_type=error_type, help_msg=help_msg, none_policy=none_policy)
+        validators_cache.put(key, validator)
+    return validator
+
 
 # Python 3+: load the 'more explicit api'
 if use_typing:
@@ -740,7 +1161,8 @@ def assert_valid(name,              # type: str
     ...<your code>
     ```
 
-    Note: this is a friendly alias for `_validator(base_validator_s)(value)`
+    Note: this is a friendly alias for `Validator(*validation_func, ...).assert_valid(name, value)`. The
+    `Validator` is cached in `validators_cache`, so that it is not re-created when the same definition is used again.
 
     :param validation_func: the base validation function or list of base validation functions to use. A callable, a
         tuple(callable, help_msg_str), a tuple(callable, failure_type), tuple(callable, help_msg_str, failure_type)
@@ -766,8 +1188,8 @@ def assert_valid(name,              # type: str
     # the rest of keyword arguments is used as context.
     kw_context_args = kwargs
 
-    return Validator(*validation_func, error_type=error_type, help_msg=help_msg,
-                     none_policy=none_policy).assert_valid(name=name, value=value, **kw_context_args)
+    return _get_cached_validator(validation_func, error_type=error_type, help_msg=help_msg,
+                                 none_policy=none_policy).assert_valid(name=name, value=value, **kw_context_args)
 
 
 # Python 3+: load the 'more explicit api'
@@ -797,7 +1219,8 @@ def is_valid(value,
         ...<code>
     ```
 
-    Note: this is a friendly alias for `return _validator(validator_func, return_bool=True)(value)`
+    Note: this is a friendly alias for `Validator(*validation_func, ...).is_valid(value)`. The `Validator`
+    is cached in `validators_cache`, so that it is not re-created when the same definition is used again.
 
     :param validation_func: the base validation function or list of base validation functions to use. A callable, a
         tuple(callable, help_msg_str), a tuple(callable, failure_type), tuple(callable, help_msg_str, failure_type)
@@ -814,4 +1237,5 @@ def is_valid(value,
     """
     none_policy = pop_kwargs(kwargs, [('none_policy', None)])
 
-    return Validator(*validation_func, none_policy=none_policy).is_valid(value)
+    return _get_cached_validator(validation_func, error_type=None, help_msg=None,
+                                 none_policy=none_policy).is_valid(value)
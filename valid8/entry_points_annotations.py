@@ -1,11 +1,17 @@
+import os
 import sys
-from inspect import ismethod, isclass
+from collections import namedtuple
+from inspect import ismethod, isclass, isgeneratorfunction
+from numbers import Integral
+from random import random
+from threading import Lock
+from weakref import WeakKeyDictionary
 
 from decopatch import class_decorator, function_decorator, DECORATED
 
 try:  # python 3.5+
     # noinspection PyUnresolvedReferences
-    from typing import Callable, Any, List, Union, TypeVar
+    from typing import Callable, Any, List, Union, TypeVar, Dict, Tuple, Optional, Generator
     try:  # python 3.5.3-
         # noinspection PyUnresolvedReferences
         from typing import Type
@@ -27,11 +33,22 @@ try:
 except ImportError:
     from funcsigs import signature, Signature
 
-from makefun import wraps
+try:  # python 3.5+
+    from inspect import iscoroutinefunction
+except ImportError:
+    def iscoroutinefunction(f):
+        return False
 
-from valid8.utils.decoration_tools import apply_on_each_func_args_sig
+try:  # python 3.6+
+    from inspect import isasyncgenfunction
+except ImportError:
+    def isasyncgenfunction(f):
+        return False
+
+from valid8.utils.decoration_tools import create_signature_wrapper
 from valid8.utils.typing_tools import is_pep484_nonable
-from valid8.base import get_callable_name, pop_kwargs
+from valid8.base import get_callable_name, pop_kwargs, get_definition, ValidationFailure, raise_
+from valid8.utils.cache_tools import _PRIMITIVE_TYPES
 from valid8.entry_points import ValidationError, Validator, NonePolicy, NoneArgPolicy
 
 
@@ -64,13 +81,20 @@ class OutputValidationError(ValidationError):
     error codes for their applications.
 
     See `ValidationError` for details.
+
+    When the output of a generator function is validated, each yielded item is validated: `item_index` is then the
+    index of the invalid item.
     """
+    item_index = None
 
     def get_what_txt(self):
         """
         Overrides the base behaviour defined in ValidationError in order to add details about the function.
         :return:
         """
+        if self.item_index is not None:
+            return 'item #%s of the output of function [%s]' % (self.item_index,
+                                                                 self.validator.get_validated_func_display_name())
         return 'output of function [%s]' % self.validator.get_validated_func_display_name()
 
 
@@ -136,6 +160,16 @@ class FuncValidator(Validator):
         super(FuncValidator, self).__init__(*validation_func, none_policy=none_policy,
                                             error_type=error_type, help_msg=help_msg, **kw_context_args)
 
+    def __getstate__(self):
+        """
+        The validated function can not be pickled by reference when it is decorated, since the module attribute with
+        its name is the validating wrapper. It is replaced with this wrapper when it can be imported, and with its name
+        otherwise, see `_get_importable_func`.
+        """
+        state = super(FuncValidator, self).__getstate__()
+        state['validated_func'] = _get_importable_func(self.validated_func)
+        return state
+
     def get_additional_info_for_repr(self):
         return 'validated_function=%s' % get_callable_name(self.validated_func)
 
@@ -147,6 +181,39 @@ class FuncValidator(Validator):
         return self.validated_func.__name__ or str(self.validated_func)
 
 
+def _get_importable_func(func  # type: Callable
+                         ):
+    """
+    Returns the object importable from the module of `func` under its qualified name, if it is `func` or a wrapper of
+    `func` (following `__wrapped__`), so that it can be pickled by reference. Otherwise a `_ValidatedFuncName` is
+    returned.
+    """
+    try:
+        importable = sys.modules[func.__module__]
+        for name in getattr(func, '__qualname__', func.__name__).split('.'):
+            importable = getattr(importable, name)
+    except (KeyError, AttributeError, TypeError):
+        return _ValidatedFuncName(get_callable_name(func))
+
+    wrapped = importable
+    while wrapped is not None:
+        if wrapped is func:
+            return importable
+        wrapped = getattr(wrapped, '__wrapped__', None)
+    return _ValidatedFuncName(get_callable_name(func))
+
+
+class _ValidatedFuncName(object):
+    """ Replaces the validated function of pickled `FuncValidator`s, when it can not be imported """
+    __slots__ = ('__name__', )
+
+    def __init__(self, name):
+        self.__name__ = name
+
+    def __repr__(self):
+        return '<function %s>' % self.__name__
+
+
 class InputValidator(FuncValidator):
     """
     Represents a special kind of `Validator` responsible to validate a function input.
@@ -247,6 +314,14 @@ class OutputValidator(FuncValidator):
         super(OutputValidator, self).assert_valid('result', value, error_type=error_type, help_msg=help_msg,
                                                   **kw_context_args)
 
+    def aassert_valid(self,
+                      value,            # type: Any
+                      error_type=None,  # type: Type[ValidationError]
+                      help_msg=None,    # type: str
+                      **kw_context_args):
+        return super(OutputValidator, self).aassert_valid('result', value, error_type=error_type, help_msg=help_msg,
+                                                          **kw_context_args)
+
 
 class ClassFieldValidator(Validator):
     """
@@ -336,6 +411,17 @@ def validate_field(cls,               # type: DecoratedClass
     :param help_msg: an optional help message to be used in the raised error in case of validation failure.
     :param none_policy: describes how None values should be handled. See `NoneArgPolicy` for the various
         possibilities. Default is `NoneArgPolicy.ACCEPT_IF_OPTIONAl_ELSE_VALIDATE`.
+    :param compile: if True, the created validator is compiled into a single generated function, and the
+        `valid8.validation_lib` functions are fused into a single inline check. See `Validator`. Default is False.
+    :param sampling: an optional sampling configuration, to validate only some of the calls: an integer `n` to validate
+        one call out of `n`, or a float `p` in [0, 1] to validate each call with probability `p`. It applies to all the
+        validators of the decorated function. Default is `None`, meaning
+        `valid8.entry_points_annotations.default_sampling`. See `ValidationSampler`.
+    :param concurrency: for coroutine functions and asynchronous generator functions only, the concurrency of the
+        validation: `False` to validate in order with short-circuit, `True` to validate concurrently, or a positive
+        integer to validate concurrently with at most this number of awaitables at a time. It applies to all the
+        validators of the decorated function. Default is `None`, meaning
+        `valid8.entry_points_async.concurrent_validation`.
     :param kw_context_args: optional contextual information to store in the exception, and that may be also used
         to format the help message
     :return
@@ -347,6 +433,8 @@ def validate_field(cls,               # type: DecoratedClass
 def validate_io(f=DECORATED,           # type: DecoratedFunc
                 none_policy=None,      # type: int
                 _out_=None,            # type: ValidationFuncs
+                _sampling_=None,       # type: Union[int, float]
+                _concurrency_=None,    # type: Union[bool, int]
                 **kw_validation_funcs  # type: ValidationFuncs
                 ):
     # type: (...) -> DecoratedFunc
@@ -387,6 +475,16 @@ def validate_io(f=DECORATED,           # type: DecoratedFunc
         possibilities. Default is `NoneArgPolicy.ACCEPT_IF_OPTIONAl_ELSE_VALIDATE`.
     :param _out_: a validation function or list of validation functions to apply to the function output. See
         kw_validation_funcs for details about the syntax.
+    :param _sampling_: an optional sampling configuration, to validate only some of the calls: an integer `n` to
+        validate one call out of `n`, or a float `p` in [0, 1] to validate each call with probability `p`. Default is
+        `None`, meaning `valid8.entry_points_annotations.default_sampling`. See `ValidationSampler`. Like `_out_`, its
+        name can not clash with the name of an argument of the decorated function.
+    :param _concurrency_: for coroutine functions and asynchronous generator functions only, the concurrency of the
+        validation: `False` to validate in order with short-circuit, `True` to validate concurrently, or a positive
+        integer to validate concurrently with at most this number of awaitables at a time. It applies to all the
+        validators of the decorated function. Default is `None`, meaning
+        `valid8.entry_points_async.concurrent_validation`. Like `_out_`, its name can not clash with the name of an
+        argument of the decorated function.
     :param kw_validation_funcs: keyword arguments: for each of the function's input names, the validation function or
         list of validation functions to use. A validation function may be a callable, a tuple(callable, help_msg_str),
         a tuple(callable, failure_type), tuple(callable, help_msg_str, failure_type) or a list of several such
@@ -396,7 +494,8 @@ def validate_io(f=DECORATED,           # type: DecoratedFunc
     :return: the decorated function, that will perform input validation before executing the function's code everytime
         it is executed.
     """
-    return decorate_several_with_validation(f, none_policy=none_policy, _out_=_out_, **kw_validation_funcs)
+    return decorate_several_with_validation(f, none_policy=none_policy, _out_=_out_, _sampling_=_sampling_,
+                                            _concurrency_=_concurrency_, **kw_validation_funcs)
 
 
 @function_decorator(flat_mode_decorated_name='f')
@@ -423,6 +522,17 @@ def validate_arg(f,                 # type: DecoratedFunc
     :param help_msg: an optional help message to be used in the raised error in case of validation failure.
     :param none_policy: describes how None values should be handled. See `NoneArgPolicy` for the various
         possibilities. Default is `NoneArgPolicy.ACCEPT_IF_OPTIONAl_ELSE_VALIDATE`.
+    :param compile: if True, the created validator is compiled into a single generated function, and the
+        `valid8.validation_lib` functions are fused into a single inline check. See `Validator`. Default is False.
+    :param sampling: an optional sampling configuration, to validate only some of the calls: an integer `n` to validate
+        one call out of `n`, or a float `p` in [0, 1] to validate each call with probability `p`. It applies to all the
+        validators of the decorated function. Default is `None`, meaning
+        `valid8.entry_points_annotations.default_sampling`. See `ValidationSampler`.
+    :param concurrency: for coroutine functions and asynchronous generator functions only, the concurrency of the
+        validation: `False` to validate in order with short-circuit, `True` to validate concurrently, or a positive
+        integer to validate concurrently with at most this number of awaitables at a time. It applies to all the
+        validators of the decorated function. Default is `None`, meaning
+        `valid8.entry_points_async.concurrent_validation`.
     :param kw_context_args: optional contextual information to store in the exception, and that may be also used
         to format the help message
     :return: a function decorator, able to transform a function into a function that will perform input validation
@@ -450,6 +560,17 @@ def validate_out(*validation_func,  # type: ValidationFuncs
     :param help_msg: an optional help message to be used in the raised error in case of validation failure.
     :param none_policy: describes how None values should be handled. See `NoneArgPolicy` for the various
         possibilities. Default is `NoneArgPolicy.ACCEPT_IF_OPTIONAl_ELSE_VALIDATE`.
+    :param compile: if True, the created validator is compiled into a single generated function, and the
+        `valid8.validation_lib` functions are fused into a single inline check. See `Validator`. Default is False.
+    :param sampling: an optional sampling configuration, to validate only some of the calls: an integer `n` to validate
+        one call out of `n`, or a float `p` in [0, 1] to validate each call with probability `p`. It applies to all the
+        validators of the decorated function. Default is `None`, meaning
+        `valid8.entry_points_annotations.default_sampling`. See `ValidationSampler`.
+    :param concurrency: for coroutine functions and asynchronous generator functions only, the concurrency of the
+        validation: `False` to validate in order with short-circuit, `True` to validate concurrently, or a positive
+        integer to validate concurrently with at most this number of awaitables at a time. It applies to all the
+        validators of the decorated function. Default is `None`, meaning
+        `valid8.entry_points_async.concurrent_validation`.
     :param kw_context_args: optional contextual information to store in the exception, and that may be also used
         to format the help message
     :return: a function decorator, able to transform a function into a function that will perform input validation
@@ -464,6 +585,81 @@ _OUT_KEY = '_out_'
 """ The reserved key for output validation """
 
 
+def _read_env_flag(name  # type: str
+                   ):
+    # type: (...) -> bool
+    """ Returns True if environment variable `name` is set to '1', 'true', 'yes' or 'on' (case-insensitive) """
+    return os.environ.get(name, '').strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+validation_disabled = _read_env_flag('VALID8_DISABLE')
+""" If True, the decorators (`@validate_arg`, `@validate_out`, `@validate_io`, `@validate_field`, as well as
+`decorate_with_validation` and `decorate_cls_with_validation`) return the decorated function or class untouched, so
+that validation has no runtime cost at all. The validation definitions are recorded in `disabled_validations` instead.
+It is read at decoration time: its initial value comes from the `VALID8_DISABLE` environment variable, and it can be
+modified before the decorated modules are imported. """
+
+enabled_modules = tuple(m.strip() for m in os.environ.get('VALID8_ENABLE_MODULES', '').split(',') if m.strip())
+""" Names of the modules (and of their submodules) where validation remains enabled when `validation_disabled` is
+True. Its initial value comes from the `VALID8_ENABLE_MODULES` environment variable, a comma-separated list of module
+names. """
+
+DisabledValidation = namedtuple('DisabledValidation', ['name', 'validation_func', 'kwargs'])
+""" The definition of a validation that was not applied because validation is disabled, see `disabled_validations`.
+`name` is the argument name (or `_out_`) for functions, or the field name for classes. """
+
+disabled_validations = WeakKeyDictionary()
+""" The validations that were not applied because validation is disabled: a dictionary of decorated function or class
+=> list of `DisabledValidation`, in decoration order. See `enable_validation` to apply them. """
+
+
+def _is_validation_disabled_for(target  # type: Any
+                                ):
+    # type: (...) -> bool
+    """ Returns True if decorators should leave `target` (a function or class) untouched """
+    if not validation_disabled:
+        return False
+    module = getattr(target, '__module__', None) or ''
+    for enabled in enabled_modules:
+        if module == enabled or module.startswith(enabled + '.'):
+            return False
+    return True
+
+
+def _register_disabled_validation(target,           # type: Any
+                                  name,             # type: str
+                                  validation_func,  # type: Tuple
+                                  kwargs            # type: Dict[str, Any]
+                                  ):
+    """ Records a validation that was not applied on `target` in `disabled_validations` """
+    try:
+        validations = disabled_validations.setdefault(target, [])
+    except TypeError:
+        # target does not support weak references: nothing can be recorded
+        return
+    validations.append(DisabledValidation(name, validation_func, dict(kwargs)))
+
+
+def enable_validation(target  # type: Union[DecoratedFunc, DecoratedClass]
+                      ):
+    # type: (...) -> Union[DecoratedFunc, DecoratedClass]
+    """
+    Applies the validations that were recorded in `disabled_validations` for `target` because validation was disabled
+    at decoration time, regardless of the current value of `validation_disabled`.
+
+    :param target: a function or class that was decorated while validation was disabled
+    :return: for a function, a new function performing the validation: existing references to the original function
+        are not validated. For a class, the class itself, decorated in place.
+    """
+    validations = disabled_validations.pop(target, ())
+    for name, validation_func, kwargs in validations:
+        if isclass(target):
+            target = _decorate_cls_with_validation(target, name, *validation_func, **kwargs)
+        else:
+            target = _decorate_with_validation(target, name, *validation_func, **kwargs)
+    return target
+
+
 def decorate_cls_with_validation(cls,               # type: DecoratedClass
                                  field_name,        # type: str
                                  *validation_func,  # type: ValidationFuncs
@@ -485,14 +681,36 @@ def decorate_cls_with_validation(cls,               # type: DecoratedClass
     :param help_msg: an optional help message to be used in the raised error in case of validation failure.
     :param none_policy: describes how None values should be handled. See `NoneArgPolicy` for the various possibilities.
         Default is `NoneArgPolicy.ACCEPT_IF_OPTIONAl_ELSE_REJECT`.
+    :param sampling: an optional sampling configuration, see `ValidationSampler`. Default is `None`, meaning
+        `valid8.entry_points_annotations.default_sampling`.
+    :param concurrency: for coroutine functions only, an optional concurrency option, see
+        `valid8.entry_points_async.check_concurrency`. Default is `None`, meaning
+        `valid8.entry_points_async.concurrent_validation`.
     :param kw_context_args: optional contextual information to store in the exception, and that may be also used
         to format the help message
-    :return: the decorated function, that will perform input validation (using `_assert_input_is_valid`) before
-        executing the function's code everytime it is executed.
+    :return: the decorated function, that will perform input validation before executing the function's code everytime
+        it is executed.
     """
-    error_type, help_msg, none_policy = pop_kwargs(kwargs, [('error_type', None),
-                                                            ('help_msg', None),
-                                                            ('none_policy', None)], allow_others=True)
+    if _is_validation_disabled_for(cls):
+        # validation is disabled: the class is left untouched
+        _register_disabled_validation(cls, field_name, validation_func, kwargs)
+        return cls
+
+    return _decorate_cls_with_validation(cls, field_name, *validation_func, **kwargs)
+
+
+def _decorate_cls_with_validation(cls,               # type: DecoratedClass
+                                  field_name,        # type: str
+                                  *validation_func,  # type: ValidationFuncs
+                                  **kwargs):
+    # type: (...) -> DecoratedClass
+    """ The implementation of `decorate_cls_with_validation`, without the disable switch """
+    error_type, help_msg, none_policy, sampling, concurrency = pop_kwargs(kwargs, [('error_type', None),
+                                                                                   ('help_msg', None),
+                                                                                   ('none_policy', None),
+                                                                                   ('sampling', None),
+                                                                                   ('concurrency', None)],
+                                                                          allow_others=True)
     # the rest of keyword arguments is used as context.
     kw_context_args = kwargs
 
@@ -552,7 +770,8 @@ def decorate_cls_with_validation(cls,               # type: DecoratedClass
                                                        **kw_context_args)
 
             # -- create the new setter with validation
-            new_setter = decorate_with_validators(func, func_signature=func_sig, **{descriptor_arg_name: new_validator})
+            new_setter = decorate_with_validators(func, func_signature=func_sig, _sampling_=sampling,
+                                                  _concurrency_=concurrency, **{descriptor_arg_name: new_validator})
 
             # replace the old one
             if isinstance(var, property):
@@ -591,9 +810,10 @@ def decorate_cls_with_validation(cls,               # type: DecoratedClass
                 except AttributeError:
                     pass
 
-            cls.__init__ = decorate_with_validation(init_func, field_name, *validation_func, help_msg=help_msg,
-                                                    _constructor_of_cls_=cls,
-                                                    error_type=error_type, none_policy=none_policy, **kw_context_args)
+            cls.__init__ = _decorate_with_validation(init_func, field_name, *validation_func, help_msg=help_msg,
+                                                     _constructor_of_cls_=cls, sampling=sampling,
+                                                     concurrency=concurrency, error_type=error_type,
+                                                     none_policy=none_policy, **kw_context_args)
 
         except InvalidNameError:
             # the field was not found
@@ -611,6 +831,8 @@ def decorate_cls_with_validation(cls,               # type: DecoratedClass
 def decorate_several_with_validation(func,               # type: DecoratedFunc
                                      _out_=None,         # type: ValidationFuncs
                                      none_policy=None,   # type: int
+                                     _sampling_=None,    # type: Union[int, float]
+                                     _concurrency_=None, # type: Union[bool, int]
                                      **validation_funcs  # type: ValidationFuncs
                                      ):
     # type: (...) -> DecoratedFunc
@@ -627,16 +849,21 @@ def decorate_several_with_validation(func,               # type: DecoratedFunc
     :param _out_:
     :param validation_funcs:
     :param none_policy:
+    :param _sampling_: an optional sampling configuration, see `ValidationSampler`
+    :param _concurrency_: for coroutine functions only, an optional concurrency option, see
+        `valid8.entry_points_async.check_concurrency`
     :return: a function decorated with validation for all of the listed arguments and output if provided.
     """
 
     # add validation for output if provided
     if _out_ is not None:
-        func = decorate_with_validation(func, _OUT_KEY, _out_, none_policy=none_policy)
+        func = decorate_with_validation(func, _OUT_KEY, _out_, none_policy=none_policy, sampling=_sampling_,
+                                        concurrency=_concurrency_)
 
     # add validation for each of the listed arguments
     for att_name, att_validation_funcs in validation_funcs.items():
-        func = decorate_with_validation(func, att_name, att_validation_funcs, none_policy=none_policy)
+        func = decorate_with_validation(func, att_name, att_validation_funcs, none_policy=none_policy,
+                                        sampling=_sampling_, concurrency=_concurrency_)
 
     return func
 
@@ -663,16 +890,33 @@ def decorate_with_validation(func,              # type: DecoratedFunc
     :param help_msg: an optional help message to be used in the raised error in case of validation failure.
     :param none_policy: describes how None values should be handled. See `NoneArgPolicy` for the various possibilities.
         Default is `NoneArgPolicy.ACCEPT_IF_OPTIONAl_ELSE_REJECT`.
+    :param sampling: an optional sampling configuration, see `ValidationSampler`. Default is `None`, meaning
+        `valid8.entry_points_annotations.default_sampling`.
+    :param concurrency: for coroutine functions only, an optional concurrency option, see
+        `valid8.entry_points_async.check_concurrency`. Default is `None`, meaning
+        `valid8.entry_points_async.concurrent_validation`.
     :param kw_context_args: optional contextual information to store in the exception, and that may be also used
         to format the help message
-    :return: the decorated function, that will perform input validation (using `_assert_input_is_valid`) before
-        executing the function's code everytime it is executed.
-    """
-    error_type, help_msg, none_policy, _constructor_of_cls_ = pop_kwargs(kwargs, [('error_type', None),
-                                                                                  ('help_msg', None),
-                                                                                  ('none_policy', None),
-                                                                                  ('_constructor_of_cls_', None)],
-                                                                         allow_others=True)
+    :return: the decorated function, that will perform input validation before executing the function's code everytime
+        it is executed.
+    """
+    if _is_validation_disabled_for(func):
+        # validation is disabled: the function is returned untouched
+        _register_disabled_validation(func, arg_name, validation_func, kwargs)
+        return func
+
+    return _decorate_with_validation(func, arg_name, *validation_func, **kwargs)
+
+
+def _decorate_with_validation(func,              # type: DecoratedFunc
+                              arg_name,          # type: str
+                              *validation_func,  # type: ValidationFuncs
+                              **kwargs):
+    # type: (...) -> DecoratedFunc
+    """ The implementation of `decorate_with_validation`, without the disable switch """
+    error_type, help_msg, none_policy, sampling, concurrency, _constructor_of_cls_ = \
+        pop_kwargs(kwargs, [('error_type', None), ('help_msg', None), ('none_policy', None), ('sampling', None),
+                            ('concurrency', None), ('_constructor_of_cls_', None)], allow_others=True)
     # the rest of keyword arguments is used as context.
     kw_context_args = kwargs
 
@@ -697,7 +941,8 @@ def decorate_with_validation(func,              # type: DecoratedFunc
                                                    **kw_context_args)
 
     # decorate or update decorator with this new validator
-    return decorate_with_validators(func, func_signature=func_sig, **{arg_name: new_validator})
+    return decorate_with_validators(func, func_signature=func_sig, _sampling_=sampling, _concurrency_=concurrency,
+                                    **{arg_name: new_validator})
 
 
 def _get_final_none_policy_for_validator(is_nonable,   # type: bool
@@ -784,8 +1029,111 @@ def _create_function_validator(validated_func,    # type: Callable
                                    error_type=error_type, help_msg=help_msg, **kw_context_args)
 
 
+default_sampling = None
+""" The sampling configuration used by the decorators when no explicit `sampling` is provided, see `ValidationSampler`.
+It is read at decoration time, so it should be set before the decorated modules are imported. Default is `None`: all
+calls are validated. """
+
+
+class ValidationSampler(object):
+    """
+    Decides which calls of a decorated function are validated, when the decorator receives a `sampling` argument (or
+    when `default_sampling` is set):
+
+     - an integer `n >= 1` means that one call out of `n` is validated, starting with the first one. `1` validates all
+       calls.
+     - a float `p` in [0, 1] means that each call is validated with probability `p`.
+
+    Calls that are not sampled skip validation entirely: inputs and output are not validated. The sampler counts the
+    `validated` and `skipped` calls, see `get_validation_sampler`. The counters are protected by a lock, so that the
+    sampling rate is respected when the decorated function is called from several threads.
+    """
+    __slots__ = ('sampling', 'validated', 'skipped', '_period', '_countdown', '_probability', '_lock')
+
+    def __init__(self,
+                 sampling  # type: Union[int, float]
+                 ):
+        """
+        Constructor
+
+        :param sampling: an integer `n >= 1` to validate one call out of `n`, or a float in [0, 1] to validate each
+            call with this probability.
+        """
+        if isinstance(sampling, bool) or not isinstance(sampling, (Integral, float)):
+            raise TypeError("sampling should be an integer or a float, found: %r" % (sampling, ))
+        if isinstance(sampling, Integral):
+            if sampling < 1:
+                raise ValueError("An integer sampling should be >= 1, found: %r" % sampling)
+            self._period = sampling
+            self._probability = None
+        else:
+            if not (0. <= sampling <= 1.):
+                raise ValueError("A float sampling should be a probability in [0, 1], found: %r" % sampling)
+            self._period = None
+            self._probability = sampling
+
+        self.sampling = sampling
+        self._lock = Lock()
+        self._countdown = 1
+        self.validated = 0
+        self.skipped = 0
+
+    def __repr__(self):
+        return "ValidationSampler(%r, validated=%s, skipped=%s)" % (self.sampling, self.validated, self.skipped)
+
+    def should_validate(self):
+        # type: (...) -> bool
+        """ Returns True if the current call should be validated, and updates the counters accordingly """
+        if self._period is None:
+            sampled = random() < self._probability
+        with self._lock:
+            if self._period is not None:
+                self._countdown -= 1
+                sampled = self._countdown <= 0
+                if sampled:
+                    self._countdown = self._period
+
+            if sampled:
+                self.validated += 1
+            else:
+                self.skipped += 1
+        return sampled
+
+    def reset(self):
+        """ Resets the counters. The next call will be validated if the sampling is an integer """
+        with self._lock:
+            self._countdown = 1
+            self.validated = 0
+            self.skipped = 0
+
+
+def _make_sampler(sampling  # type: Optional[Union[int, float]]
+                  ):
+    # type: (...) -> Optional[ValidationSampler]
+    """ Returns a `ValidationSampler` for `sampling`, or None if all calls should be validated """
+    return None if sampling is None else ValidationSampler(sampling)
+
+
+def get_validation_sampler(f  # type: Callable
+                           ):
+    # type: (...) -> Optional[ValidationSampler]
+    """
+    Returns the `ValidationSampler` of a function decorated with validation, or None if it validates all calls (no
+    sampling) or if it is not decorated with valid8.
+
+    :param f: a function decorated with `@validate_arg`, `@validate_out`, `@validate_io`, or a setter or constructor
+        decorated by `@validate_field`.
+    :return:
+    """
+    if hasattr(f, '__wrapped__') and hasattr(f.__wrapped__, '__validators__'):
+        f = f.__wrapped__
+    return getattr(f, '__validation_sampler__', None)
+
+
 def decorate_with_validators(func,                 # type: DecoratedFunc
                              func_signature=None,  # type: Signature
+                             _sampling_=None,      # type: Union[int, float]
+                             _concurrency_=None,   # type: Union[bool, int]
                              **validators          # type: Union[Validator, List[Validator]]
                              ):
     # type: (...) -> DecoratedFunc
@@ -797,9 +1145,18 @@ def decorate_with_validators(func,                 # type: DecoratedFunc
         another wrapper in this case, simply adding the validators to the existing wrapper
     :param func_signature: the function's signature if it is already known (internal calls), otherwise it will be found
         again by inspection
+    :param _sampling_: an optional sampling configuration for the function, see `ValidationSampler`. If the function
+        is already decorated with a different explicit sampling configuration, a `ValueError` is raised.
+    :param _concurrency_: an optional concurrency option for coroutine functions and asynchronous generator functions,
+        see `valid8.entry_points_async.check_concurrency`. If the function is already decorated with a different
+        explicit concurrency option, a `ValueError` is raised.
     :param validators: a dictionary of arg_name (or _out_) => Validator or list of Validator
     :return:
     """
+    if _concurrency_ is not None:
+        from valid8.entry_points_async import check_concurrency
+        check_concurrency(_concurrency_)
+
     # first turn the dictionary values into lists only
     for arg_name, validator in validators.items():
         if not isinstance(validator, list):
@@ -808,6 +1165,10 @@ def decorate_with_validators(func,                 # type: DecoratedFunc
     if hasattr(func, '__wrapped__') and hasattr(func.__wrapped__, '__validators__'):
         # ---- This function is already wrapped by our validation wrapper ----
 
+        # default values are constant: validate them once now (not possible for asynchronous validation)
+        if not _is_async_function(func.__wrapped__):
+            _assert_defaults_are_valid(func_signature or signature(func.__wrapped__), validators)
+
         # Update the dictionary of validators with the new validator(s)
         for arg_name, validator in validators.items():
             for v in validator:
@@ -816,12 +1177,43 @@ def decorate_with_validators(func,                 # type: DecoratedFunc
                 else:
                     func.__wrapped__.__validators__[arg_name] = [v]
 
+        # the validation plan will be re-created on next call
+        func.__wrapped__.__validation_plan__ = None
+
+        # update the sampling configuration if needed
+        if _sampling_ is not None:
+            current_sampling = func.__wrapped__.__validation_sampling__
+            if current_sampling is None:
+                func.__wrapped__.__validation_sampling__ = _sampling_
+                func.__wrapped__.__validation_sampler__ = _make_sampler(_sampling_)
+            elif current_sampling != _sampling_:
+                raise ValueError("Function '%s' is already decorated with validation sampling %r, it can not be "
+                                 "changed to %r" % (get_callable_name(func.__wrapped__), current_sampling, _sampling_))
+
+        # update the concurrency option if needed
+        if _concurrency_ is not None:
+            current_concurrency = func.__wrapped__.__validation_concurrency__
+            if current_concurrency is None:
+                func.__wrapped__.__validation_concurrency__ = _concurrency_
+            elif current_concurrency != _concurrency_:
+                raise ValueError("Function '%s' is already decorated with validation concurrency %r, it can not be "
+                                 "changed to %r" % (get_callable_name(func.__wrapped__), current_concurrency,
+                                                    _concurrency_))
+
         # return the function, no need to wrap it further (it is already wrapped)
         return func
 
     else:
         # ---- This function is not yet wrapped by our validator. ----
 
+        # either reuse or recompute function signature
+        func_signature = func_signature or signature(func)
+
+        # default values are constant: validate them once now (not possible for asynchronous validation)
+        is_async = _is_async_function(func)
+        if not is_async:
+            _assert_defaults_are_valid(func_signature, validators)
+
         # Store the dictionary of validators as an attribute of the function
         if hasattr(func, '__validators__'):
             raise ValueError('Function ' + str(func) + ' already has a defined __validators__ attribute, valid8 '
@@ -832,50 +1224,258 @@ def decorate_with_validators(func,                 # type: DecoratedFunc
             except AttributeError:
                 raise ValueError("Error - Could not add validators list to function '%s'" % func)
 
-        # either reuse or recompute function signature
-        func_signature = func_signature or signature(func)
+        # the validation plan is created lazily on first call, see `_make_inputs_plan`
+        func.__validation_plan__ = None
+
+        # the sampling configuration: the explicit one is remembered to detect conflicts
+        func.__validation_sampling__ = _sampling_
+        func.__validation_sampler__ = _make_sampler(default_sampling if _sampling_ is None else _sampling_)
+
+        # the concurrency option of asynchronous validation. None means the defaults of `valid8.entry_points_async`
+        func.__validation_concurrency__ = _concurrency_
+
+        if is_async:
+            # the wrapper should await the validation and the coroutine, or iterate on the asynchronous generator
+            from valid8.entry_points_async import make_async_validating_wrapper
+            return make_async_validating_wrapper(func, func_signature)
+
+        # for generator functions, each yielded item is validated (lazily) instead of the generator itself
+        is_generator = isgeneratorfunction(func)
 
-        # create a wrapper with the same signature
-        @wraps(func)
-        def validating_wrapper(*args, **kwargs):
+        # the implementation of the wrapper generated with the exact same signature (see `create_signature_wrapper`):
+        # `values` are the values of all parameters in signature order, and `args`, `kwargs` are used to call func.
+        def validating_call(values, args, kwargs):
             """ This is the wrapper that will be called everytime the function is called """
 
-            # (a) Perform input validation by applying `_assert_input_is_valid` on all received arguments
-            apply_on_each_func_args_sig(func, args, kwargs, func_signature,
-                                        func_to_apply=_assert_input_is_valid,
-                                        func_to_apply_params_dict=func.__validators__)
+            sampler = func.__validation_sampler__
+            if sampler is not None and not sampler.should_validate():
+                # this call is not sampled: no validation at all
+                return func(*args, **kwargs)
+
+            plan = func.__validation_plan__
+            if plan is None:
+                plan = func.__validation_plan__ = _make_validation_plan(func_signature, func.__validators__)
+            inputs_plan, output_check = plan
+
+            # (a) Perform input validation on all validated arguments
+            for input_name, position, input_check, default in inputs_plan:
+                input_value = values[position]
+                if input_value is not default:
+                    # note: the (immutable) default value was already validated at decoration time
+                    input_check(input_value)
 
             # (b) execute the function as usual
             res = func(*args, **kwargs)
 
             # (c) validate output if needed
-            if _OUT_KEY in func.__validators__:
-                for _v in func.__validators__[_OUT_KEY]:
-                    # noinspection PyArgumentList
-                    _v.assert_valid(res)  # indeed OutputValidator's assert_valid signature has one less argument
+            if output_check is not None:
+                if is_generator:
+                    return ValidatedGenerator(res, output_check)
+                output_check(res)
 
             return res
 
+        validating_wrapper = create_signature_wrapper(func, func_signature, validating_call)
         return validating_wrapper
 
 
-# noinspection PyUnusedLocal
-def _assert_input_is_valid(input_value,     # type: Any
-                           validators,      # type: List[InputValidator]
-                           validated_func,  # type: Callable
-                           input_name       # type: str
-                           ):
+def _is_async_function(func  # type: Callable
+                       ):
+    # type: (...) -> bool
+    """ Returns True if func is a coroutine function or an asynchronous generator function """
+    return iscoroutinefunction(func) or isasyncgenfunction(func)
+
+
+class ValidatedGenerator(object):
+    """
+    The generator returned by a generator function decorated with output validation (`@validate_out`...): it yields
+    the items of the inner generator, validating each of them on the fly with the output validators. The first invalid
+    item raises the `OutputValidationError` of the validator that failed, with an additional `item_index` attribute.
+
+    `send`, `throw` and `close` are forwarded to the inner generator.
     """
-    Called by the `validating_wrapper` in the first step (a) `apply_on_each_func_args` for each function input before
-    executing the function. It simply delegates to the validator. The signature of this function is hardcoded to
-    correspond to `apply_on_each_func_args`'s behaviour and should therefore not be changed.
+    __slots__ = ('gen', 'item_check', 'item_index')
 
-    :param input_value: the value to validate
-    :param validators: the Validators that will be applied on input_value_to_validate
-    :param validated_func: the function for which this validation is performed. This is not used, since the Validator
-        knows it already, but we should not change the signature here.
-    :param input_name: the name of the function input that is being validated
-    :return: Nothing
+    def __init__(self,
+                 gen,        # type: Generator
+                 item_check  # type: Callable[[Any], None]
+                 ):
+        """
+        Constructor
+
+        :param gen: the generator to wrap
+        :param item_check: the function validating each item, raising a `ValidationError` in case of failure
+        """
+        self.gen = gen
+        self.item_check = item_check
+        self.item_index = 0
+
+    def __iter__(self):
+        return self
+
+    def _validate(self, item):
+        """ Validates the next item and returns it """
+        item_index = self.item_index
+        self.item_index = item_index + 1
+        try:
+            self.item_check(item)
+        except ValidationError as e:
+            e.item_index = item_index
+            raise
+        return item
+
+    def __next__(self):
+        return self._validate(next(self.gen))
+
+    # python 2
+    next = __next__
+
+    def send(self, value):
+        return self._validate(self.gen.send(value))
+
+    def throw(self, *args):
+        return self._validate(self.gen.throw(*args))
+
+    def close(self):
+        self.gen.close()
+
+
+def _make_validation_plan(func_signature,  # type: Signature
+                          validators,      # type: Dict[str, List[Validator]]
+                          is_async=False   # type: bool
+                          ):
+    # type: (...) -> Tuple[Tuple[Tuple[str, int, Callable, Any], ...], Callable]
+    """
+    Creates the plan used by the `validating_wrapper`. It is a tuple `(inputs_plan, output_check)` where
+    `output_check` is the merged check for the `_OUT_KEY` validators, or None (see `_make_merged_check`).
+
+    `inputs_plan` allows the wrapper to find the value of each validated input in the values of the parameters that it
+    receives (see `create_signature_wrapper`): it is a tuple of `(input_name, position, check, default)` in signature
+    order, where `position` is the index of the parameter in the signature. `check` is the merged check for all
+    validators of this input. `default` is the default value of the argument if it is immutable, so that its validation
+    can be skipped (it was validated at decoration time, see `_assert_defaults_are_valid`), or `_NO_DEFAULT`.
+
+    :param func_signature: the signature of the decorated function
+    :param validators: the dictionary of validators for each input name (and possibly `_OUT_KEY`)
+    :param is_async: if True, the plan is created for a coroutine function: the checks are created with
+        `valid8.entry_points_async.make_async_merged_check`, and default values are not skipped since they could not
+        be validated at decoration time.
+    :return:
     """
-    for validator in validators:
-        validator.assert_valid(input_name, input_value)
+    if is_async:
+        from valid8.entry_points_async import make_async_merged_check as make_check
+    else:
+        make_check = _make_merged_check
+
+    if _OUT_KEY in validators:
+        output_check = make_check(None, validators[_OUT_KEY], is_output=True)
+    else:
+        output_check = None
+
+    inputs_plan = []
+    for position, (name, p) in enumerate(func_signature.parameters.items()):
+        if name in validators:
+            if not is_async and p.default is not p.empty and _is_immutable(p.default):
+                default = p.default
+            else:
+                default = _NO_DEFAULT
+            inputs_plan.append((name, position, make_check(name, validators[name]), default))
+
+    return tuple(inputs_plan), output_check
+
+
+def _make_merged_check(name,             # type: Optional[str]
+                       validators,       # type: List[Validator]
+                       is_output=False   # type: bool
+                       ):
+    # type: (...) -> Callable[[Any], None]
+    """
+    Merges all the validators stacked on the same function input (or on the output) into a single function
+    `check(value)`. It is equivalent to calling `validator.assert_valid(name, value)` for each validator in order:
+    the first failure is raised, as a `ValidationError` created by the validator that failed. However the main
+    function of each validator is called directly, and validators with a `SKIP` none policy are skipped at once when
+    the value is None, without calling their none handler.
+
+    Validators that override `assert_valid` are called as is.
+
+    :param name: the name of the input, or None for the output
+    :param validators: the list of validators, in order
+    :param is_output: a boolean indicating if the validators are `OutputValidator`s
+    :return:
+    """
+    steps = []
+    for v in validators:
+        if type(v).assert_valid == (OutputValidator.assert_valid if is_output else Validator.assert_valid):
+            main_function = v.main_function
+            skip_none = v.none_policy is NonePolicy.SKIP
+            if skip_none:
+                # the None check is done by `check`: remove the none handler if possible
+                definition = get_definition(main_function)
+                if definition is not None and definition[0] == 'skip_on_none':
+                    main_function = definition[1][0]
+            steps.append((main_function, v.kw_context_args, skip_none, v))
+        else:
+            steps.append((None, None, False, v))
+    steps = tuple(steps)
+    name = 'result' if is_output else name
+
+    def check(value):
+        for main_function, ctx, skip_none, validator in steps:
+            if main_function is None:
+                # custom validator
+                if is_output:
+                    # noinspection PyArgumentList
+                    validator.assert_valid(value)
+                else:
+                    validator.assert_valid(name, value)
+
+            elif value is not None or not skip_none:
+                try:
+                    # perform validation with the main function (it will always be a failure raiser)
+                    main_function(value, **ctx)
+                except ValidationFailure as f:
+                    # noinspection PyProtectedMember
+                    raise_(validator._create_validation_error(name, value, validation_outcome=f, **ctx))
+
+    return check
+
+
+_NO_DEFAULT = object()
+""" A marker used in inputs plans for arguments without immutable default value """
+
+
+def _is_immutable(value  # type: Any
+                  ):
+    # type: (...) -> bool
+    """
+    Returns True if `value` is an immutable builtin value, or a tuple or frozenset of such values. A default argument
+    value for which this returns True can not have been modified since decoration time.
+    """
+    if isinstance(value, _PRIMITIVE_TYPES):
+        return True
+    elif isinstance(value, (tuple, frozenset)):
+        return all(_is_immutable(v) for v in value)
+    else:
+        return False
+
+
+def _assert_defaults_are_valid(func_signature,  # type: Signature
+                               validators       # type: Dict[str, List[Validator]]
+                               ):
+    """
+    Validates the default value of each argument in `validators` that has one, with its validators. This is called at
+    decoration time, so that an invalid default value raises an error as soon as the function is decorated.
+
+    :param func_signature: the signature of the decorated function
+    :param validators: the dictionary of validators for each input name (and possibly `_OUT_KEY`)
+    :return:
+    """
+    for arg_name, arg_validators in validators.items():
+        try:
+            p = func_signature.parameters[arg_name]
+        except KeyError:
+            # _OUT_KEY
+            continue
+        if p.default is not p.empty:
+            for validator in arg_validators:
+                validator.assert_valid(arg_name, p.default)
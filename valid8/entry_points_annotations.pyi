@@ -1,4 +1,5 @@
-from typing import Callable, List, Union, Any, Type, TypeVar
+from typing import Callable, List, Union, Any, Type, TypeVar, Optional, Tuple, Dict, NamedTuple
+from weakref import WeakKeyDictionary
 
 try:
     from inspect import signature, Signature
@@ -14,7 +15,7 @@ class InputValidationError(ValidationError):
 
 
 class OutputValidationError(ValidationError):
-    ...
+    item_index: Optional[int]
 
 
 class ClassFieldValidationError(ValidationError):
@@ -58,6 +59,9 @@ def validate_field(field_name,
                    help_msg: str = None,
                    error_type: Type[InputValidationError] = None,
                    none_policy: int = None,
+                   compile: bool = False,
+                   sampling: Union[int, float] = None,
+                   concurrency: Union[bool, int] = None,
                    **kw_context_args) -> Callable[[DecoratedClass], DecoratedClass]:
     ...
 
@@ -67,6 +71,8 @@ DecoratedFunc = TypeVar("DecoratedFunc", bound=Callable)
 
 def validate_io(none_policy: int=None,
                 _out_: ValidationFuncs=None,
+                _sampling_: Union[int, float]=None,
+                _concurrency_: Union[bool, int]=None,
                 **kw_validation_funcs: ValidationFuncs
                 ) -> Callable[[DecoratedFunc], DecoratedFunc]:
     ...
@@ -77,6 +83,9 @@ def validate_arg(arg_name,
                  help_msg: str = None,
                  error_type: Type[InputValidationError] = None,
                  none_policy: int = None,
+                 compile: bool = False,
+                 sampling: Union[int, float] = None,
+                 concurrency: Union[bool, int] = None,
                  **kw_context_args) -> Callable[[DecoratedFunc], DecoratedFunc]:
     ...
 
@@ -85,16 +94,38 @@ def validate_out(*validation_func: ValidationFuncs,
                  help_msg: str = None,
                  error_type: Type[OutputValidationError] = None,
                  none_policy: int = None,
+                 compile: bool = False,
+                 sampling: Union[int, float] = None,
+                 concurrency: Union[bool, int] = None,
                  **kw_context_args) -> Callable[[DecoratedFunc], DecoratedFunc]:
     ...
 
 
+validation_disabled: bool
+enabled_modules: Tuple[str, ...]
+
+
+class DisabledValidation(NamedTuple):
+    name: str
+    validation_func: Tuple[ValidationFuncs, ...]
+    kwargs: Dict[str, Any]
+
+
+disabled_validations: 'WeakKeyDictionary[Any, List[DisabledValidation]]'
+
+
+def enable_validation(target: Union[DecoratedFunc, DecoratedClass]) -> Union[DecoratedFunc, DecoratedClass]:
+    ...
+
+
 def decorate_cls_with_validation(cls: DecoratedClass,
                                  field_name: str,
                                  *validation_func: ValidationFuncs,
                                  help_msg: str = None,
                                  error_type: 'Union[Type[InputValidationError], Type[OutputValidationError]]' = None,
                                  none_policy: int = None,
+                                 sampling: Union[int, float] = None,
+                                 concurrency: Union[bool, int] = None,
                                  **kw_context_args) -> DecoratedClass:
     ...
 
@@ -102,6 +133,8 @@ def decorate_cls_with_validation(cls: DecoratedClass,
 def decorate_several_with_validation(func: DecoratedFunc,
                                      _out_: ValidationFuncs = None,
                                      none_policy: int = None,
+                                     _sampling_: Union[int, float] = None,
+                                     _concurrency_: Union[bool, int] = None,
                                      **validation_funcs: ValidationFuncs
                                      ) -> DecoratedFunc:
     ...
@@ -113,11 +146,35 @@ def decorate_with_validation(func: DecoratedFunc,
                              help_msg: str = None,
                              error_type: Union[Type[InputValidationError], Type[OutputValidationError]] = None,
                              none_policy: int = None,
+                             sampling: Union[int, float] = None,
+                             concurrency: Union[bool, int] = None,
                              _constructor_of_cls_: Type=None,
                              **kw_context_args) -> DecoratedFunc:
     ...
 
 
+default_sampling = None  # type: Optional[Union[int, float]]
+
+
+class ValidationSampler(object):
+    sampling: Union[int, float]
+    validated: int
+    skipped: int
+
+    def __init__(self, sampling: Union[int, float]):
+        ...
+
+    def should_validate(self) -> bool:
+        ...
+
+    def reset(self):
+        ...
+
+
+def get_validation_sampler(f: Callable) -> Optional[ValidationSampler]:
+    ...
+
+
 class InvalidNameError(ValueError):
     ...
 
@@ -137,6 +194,8 @@ def _create_function_validator(validated_func: Callable,
 
 def decorate_with_validators(func: DecoratedFunc,
                              func_signature: Signature = None,
+                             _sampling_: Union[int, float] = None,
+                             _concurrency_: Union[bool, int] = None,
                              **validators: Union[Validator, List[Validator]]
                              ) -> DecoratedFunc:
     ...
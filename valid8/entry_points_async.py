@@ -0,0 +1,643 @@
+"""
+Asynchronous validation (python 3.5+).
+
+Validation functions may be `async def` functions, or more generally return awaitables: for example a uniqueness
+check performed against a database. Such functions can not be used with the synchronous entry points (`assert_valid`,
+`is_valid`, and the decorators on standard functions) since their result would never be awaited. This module provides
+the asynchronous equivalents:
+
+ - `Validator.aassert_valid(name, value)` and `Validator.ais_valid(value)`, that rely on `aassert_valid_with` and
+   `ais_valid_with`,
+ - the decorators (`@validate_arg`, `@validate_out`, `@validate_io`...) automatically use
+   `make_async_validating_wrapper` when they decorate a coroutine function (`async def`): inputs are validated before
+   the coroutine is awaited, and the output is validated on the awaited result. On asynchronous generator functions
+   (python 3.6+), each yielded item is validated instead, see `ValidatedAsyncGenerator`.
+
+By default the validation functions combined in a validator (`and_`, as well as `or_`, `xor_`, `not_`,
+`skip_on_none` and `fail_on_none`) are awaited one after the other, with the same short-circuit as the synchronous
+operators: for example an `instance_of(str)` placed before an expensive asynchronous check prevents it from being
+called on an invalid value. The validators stacked on the same input or output, and the inputs of a decorated function,
+are validated in order too. With the `concurrency` option of `aassert_valid`, `ais_valid` and of the decorators, all of
+them are instead run concurrently with `asyncio.gather` and without short-circuit, and the number of awaitables awaited
+at the same time during one validation can be limited. The module-level `concurrent_validation` and
+`default_max_concurrency` are only the defaults used when no `concurrency` is provided. In both modes, when several
+functions fail the first one in declaration order is reported. Other validation functions (for example `on_all_` or `on_each_`) are called as usual,
+and their result is awaited if needed.
+"""
+import asyncio
+from inspect import isawaitable
+from numbers import Integral
+
+try:  # python 3.6+
+    from inspect import isasyncgenfunction
+except ImportError:
+    def isasyncgenfunction(f):
+        return False
+
+try:  # python 3.5+
+    # noinspection PyUnresolvedReferences
+    from typing import Callable, Any, List, Tuple, Dict, Optional, Awaitable, Union
+    from inspect import Signature
+    try:  # python 3.5.3-
+        from typing import Type
+    except ImportError:
+        pass
+    else:
+        # noinspection PyUnresolvedReferences
+        from valid8.base import ValidationCallable
+        # noinspection PyUnresolvedReferences
+        from valid8.entry_points import Validator
+except ImportError:
+    pass
+
+from valid8.base import FailureRaiser, DefinedCallable, ValidationFailure, ValueIsNone, NP_TRUE, get_definition, \
+    get_callable_name, ExecutorError
+from valid8.composition import AtLeastOneFailed, AllValidatorsFailed, XorTooManySuccess, DidNotFail
+from valid8.entry_points import NonePolicy, ValidationError
+from valid8.utils.cache_tools import IdentityDict
+from valid8.utils.decoration_tools import create_signature_wrapper
+
+
+concurrent_validation = False
+""" The default `concurrency` mode, used when no `concurrency` is provided to `aassert_valid`, `ais_valid` or to the
+decorators. If True, the validation functions combined with `and_`, `or_` and `xor_`, the validators stacked on the
+same input or output, and the inputs of a decorated coroutine function are all validated concurrently, without
+short-circuit. Since it applies to all users of valid8 in the process, prefer the `concurrency` option. """
+
+default_max_concurrency = 16
+""" The maximum number of awaitables awaited concurrently during one asynchronous concurrent validation (one call to
+`aassert_valid` or `ais_valid`, or one call of a decorated coroutine function), when the `concurrency` option is True
+or when no `concurrency` is provided and `concurrent_validation` is True. `None` means no limit. """
+
+
+def check_concurrency(concurrency  # type: Optional[Union[bool, int]]
+                      ):
+    """
+    Checks that `concurrency` is a valid `concurrency` option: `None` to use the module defaults
+    (`concurrent_validation` and `default_max_concurrency`), `False` for sequential validation with short-circuit,
+    `True` for concurrent validation limited to `default_max_concurrency` awaitables, or a positive integer `n` for
+    concurrent validation limited to `n` awaitables.
+    """
+    if concurrency is None or isinstance(concurrency, bool):
+        return
+    if not isinstance(concurrency, Integral):
+        raise TypeError("concurrency should be None, a boolean or a positive integer, found: %r" % (concurrency, ))
+    if concurrency < 1:
+        raise ValueError("An integer concurrency should be >= 1, found: %r" % concurrency)
+
+
+class _Limiter(object):
+    """
+    The state of one asynchronous validation: whether the validation functions are evaluated concurrently, and the
+    number of awaitables that may be awaited at the same time. It is an asynchronous context manager used around each
+    awaited result, see `_await_result`.
+    """
+    __slots__ = ('concurrent', '_semaphore')
+
+    def __init__(self,
+                 concurrent,      # type: bool
+                 max_concurrency  # type: Optional[int]
+                 ):
+        self.concurrent = concurrent
+        self._semaphore = asyncio.Semaphore(max_concurrency) if concurrent and max_concurrency is not None else None
+
+    async def __aenter__(self):
+        if self._semaphore is not None:
+            await self._semaphore.acquire()
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        if self._semaphore is not None:
+            self._semaphore.release()
+
+
+def _new_limiter(concurrency=None  # type: Optional[Union[bool, int]]
+                 ):
+    # type: (...) -> _Limiter
+    """ Returns the `_Limiter` of a new validation, for the `concurrency` option (see `check_concurrency`) """
+    if concurrency is None:
+        return _Limiter(concurrent_validation, default_max_concurrency)
+    elif concurrency is True:
+        return _Limiter(True, default_max_concurrency)
+    elif concurrency is False:
+        return _Limiter(False, None)
+    else:
+        return _Limiter(True, concurrency)
+
+
+async def _await_result(res, limiter):
+    """ Awaits `res` (the result of a validation callable) if it is an awaitable, within the concurrency limit """
+    if isawaitable(res):
+        async with limiter:
+            res = await res
+    return res
+
+
+async def _aeval(validation_callable,  # type: ValidationCallable
+                 x,                    # type: Any
+                 ctx,                  # type: Dict[str, Any]
+                 limiter
+                 ):
+    """
+    The asynchronous equivalent of `validation_callable(x, **ctx)`, for a validation callable created by valid8:
+    it returns the result or raises a failure, exactly like the synchronous call, but awaits the results of the inner
+    validation functions.
+
+    :param validation_callable:
+    :param x:
+    :param ctx:
+    :param limiter: the asynchronous context manager limiting the concurrency, see `_new_limiter`
+    :return:
+    """
+    if isinstance(validation_callable, FailureRaiser):
+        # see `FailureRaiser.__call__`
+        f = validation_callable
+        try:
+            if _get_async_op(f.validation_callable) is not None:
+                res = await _aeval(f.validation_callable, x, ctx, limiter)
+            elif f.receives_ctx:
+                res = await _await_result(f._target(x, **ctx), limiter)
+            else:
+                res = await _await_result(f._target(x), limiter)
+        except ExecutorError:
+            raise
+        except Exception as e:
+            raise f.create_failure(x, e)
+
+        # if not result_is_success(res): <= DO NOT REMOVE THIS COMMENT
+        if (res is not None) and (res is not True) and (res is not NP_TRUE):
+            raise f.create_failure(x, res, raised=False)
+        return None
+
+    op = _get_async_op(validation_callable)
+    if op is not None:
+        return await _ASYNC_OPS[op](get_definition(validation_callable)[1], x, ctx, limiter)
+
+    # any other callable
+    return await _await_result(validation_callable(x, **ctx), limiter)
+
+
+def _get_async_op(validation_callable  # type: ValidationCallable
+                  ):
+    # type: (...) -> Optional[str]
+    """ Returns the name of the operator if validation_callable is a `DefinedCallable` supported by `_ASYNC_OPS` """
+    if isinstance(validation_callable, DefinedCallable):
+        op = get_definition(validation_callable)[0]
+        if op in _ASYNC_OPS:
+            return op
+    return None
+
+
+async def _aoutcome(validation_callable, x, ctx, limiter):
+    """ Returns the tuple (result, exception) of `_aeval`, so that results can be gathered and examined in order """
+    try:
+        return await _aeval(validation_callable, x, ctx, limiter), None
+    except ExecutorError:
+        raise
+    except Exception as e:
+        return None, e
+
+
+async def _aplay(validation_funcs,       # type: List[ValidationCallable]
+                 x,                      # type: Any
+                 ctx,                    # type: Dict[str, Any]
+                 limiter,
+                 stop_at_failure=False,  # type: bool
+                 max_successes=None      # type: int
+                 ):
+    # type: (...) -> Tuple[List[str], IdentityDict]
+    """
+    Evaluates the validation functions and returns the tuple `(successes, failures)`, in the same form than
+    `CompositionFailure.play_all_validators`. They are evaluated in order, and the evaluation stops at the first
+    failure if `stop_at_failure` is True, or as soon as `max_successes` functions succeeded: the functions that were
+    not evaluated do not appear in the results. If the validation is concurrent (see `_Limiter`), they are all evaluated
+    concurrently.
+    """
+    if limiter.concurrent:
+        outcomes = await asyncio.gather(*[_aoutcome(v, x, ctx, limiter) for v in validation_funcs])
+    else:
+        outcomes = await _asequence(validation_funcs, x, ctx, limiter, stop_at_failure, max_successes)
+
+    successes = list()
+    failures = IdentityDict()
+    for validator, (res, exc) in zip(validation_funcs, outcomes):
+        if exc is not None:
+            failures[validator] = exc
+        # if result_is_success(res): <= DO NOT REMOVE THIS COMMENT
+        elif (res is None) or (res is True) or (res is NP_TRUE):
+            successes.append(get_callable_name(validator))
+        else:
+            failures[validator] = res
+    return successes, failures
+
+
+async def _asequence(validation_funcs, x, ctx, limiter, stop_at_failure, max_successes):
+    """ Returns the outcomes `(result, exception)` of the validation functions evaluated in order, see `_aplay` """
+    outcomes = []
+    nb_successes = 0
+    for validator in validation_funcs:
+        res, exc = outcome = await _aoutcome(validator, x, ctx, limiter)
+        outcomes.append(outcome)
+        # if result_is_success(res): <= DO NOT REMOVE THIS COMMENT
+        if exc is None and ((res is None) or (res is True) or (res is NP_TRUE)):
+            nb_successes += 1
+            if max_successes is not None and nb_successes >= max_successes:
+                break
+        elif stop_at_failure:
+            break
+    return outcomes
+
+
+def _composition_failure(failure_type, validation_funcs, x, ctx, results, cause=None):
+    """ Creates a `CompositionFailure` with the results already computed, so that they are not replayed """
+    return failure_type(validation_funcs, x, ctx, cause=cause, results=results)
+
+
+async def _aand(args, x, ctx, limiter):
+    """ See `valid8.composition.and_` """
+    validation_funcs, = args
+    results = await _aplay(validation_funcs, x, ctx, limiter, stop_at_failure=True)
+    failures = results[1]
+    if len(failures) > 0:
+        # the first failure in declaration order
+        first = next(iter(failures.values()))
+        raise _composition_failure(AtLeastOneFailed, validation_funcs, x, ctx, results,
+                                   cause=first if isinstance(first, Exception) else None)
+    return True
+
+
+async def _aor(args, x, ctx, limiter):
+    """ See `valid8.composition.or_` """
+    validation_funcs, = args
+    results = await _aplay(validation_funcs, x, ctx, limiter, max_successes=1)
+    if len(results[0]) > 0:
+        return True
+    raise _composition_failure(AllValidatorsFailed, validation_funcs, x, ctx, results)
+
+
+async def _axor(args, x, ctx, limiter):
+    """ See `valid8.composition.xor_` """
+    validation_funcs, = args
+    results = await _aplay(validation_funcs, x, ctx, limiter, max_successes=2)
+    nb_ok = len(results[0])
+    if nb_ok == 1:
+        return True
+    elif nb_ok > 1:
+        raise _composition_failure(XorTooManySuccess, validation_funcs, x, ctx, results)
+    else:
+        raise _composition_failure(AllValidatorsFailed, validation_funcs, x, ctx, results)
+
+
+async def _anot(args, x, ctx, limiter):
+    """ See `valid8.composition.not_` """
+    validation_func, catch_all = args
+    try:
+        res = await _aeval(validation_func, x, ctx, limiter)
+        # if not result_is_success(res): <= DO NOT REMOVE THIS COMMENT
+        if (res is not None) and (res is not True) and (res is not NP_TRUE):
+            return True
+    except ValidationFailure:
+        return True
+    except ExecutorError:
+        raise
+    except Exception:
+        if not catch_all:
+            raise
+        return True
+
+    raise DidNotFail(validation_func=validation_func, wrong_value=x, validation_outcome=res)
+
+
+async def _askip_on_none(args, x, ctx, limiter):
+    """ See `valid8.base._none_accepter` """
+    if x is not None:
+        await _aeval(args[0], x, ctx, limiter)
+
+
+async def _afail_on_none(args, x, ctx, limiter):
+    """ See `valid8.base._none_rejecter` """
+    if x is not None:
+        await _aeval(args[0], x, ctx, limiter)
+    else:
+        raise ValueIsNone(wrong_value=x)
+
+
+_ASYNC_OPS = {
+    # op: coroutine function receiving the definition args, the value, the context and the limiter
+    'and': _aand,
+    'or': _aor,
+    'xor': _axor,
+    'not': _anot,
+    'skip_on_none': _askip_on_none,
+    'fail_on_none': _afail_on_none,
+}
+
+
+async def _avalidate(validator,  # type: Validator
+                     value,      # type: Any
+                     ctx,        # type: Dict[str, Any]
+                     limiter
+                     ):
+    """
+    The asynchronous equivalent of `validator.main_function(value, **ctx)`. Note that the validation functions are
+    used rather than the main function, so that compiled validators are supported too.
+    """
+    if value is None:
+        if validator.none_policy is NonePolicy.SKIP:
+            return
+        elif validator.none_policy is NonePolicy.FAIL:
+            raise ValueIsNone(wrong_value=value)
+
+    validation_funcs = validator.validation_funcs
+    if len(validation_funcs) == 1:
+        await _aeval(validation_funcs[0], value, ctx, limiter)
+    else:
+        await _aand((validation_funcs, ), value, ctx, limiter)
+
+
+async def aassert_valid_with(validator,        # type: Validator
+                             name,             # type: str
+                             value,            # type: Any
+                             error_type=None,  # type: Type[ValidationError]
+                             help_msg=None,    # type: str
+                             concurrency=None,  # type: Union[bool, int]
+                             **kw_context_args):
+    """
+    The implementation of `Validator.aassert_valid`: the asynchronous equivalent of `validator.assert_valid`.
+
+    :param validator: the `Validator` to use
+    :param name: the name of the variable to validate (for error messages)
+    :param value: the value to validate
+    :param error_type: a subclass of `ValidationError` to raise in case of validation failure. By default a
+        `ValidationError` will be raised with the provided `help_msg`
+    :param help_msg: an optional help message to be used in the raised error in case of validation failure.
+    :param concurrency: the concurrency of this validation, see `check_concurrency`. Default is `None`, meaning
+        `concurrent_validation` and `default_max_concurrency`.
+    :param kw_context_args: optional contextual information to store in the exception, and that may be also used
+        to format the help message
+    :return: nothing in case of success. Otherwise, raises a ValidationError
+    """
+    check_concurrency(concurrency)
+    if len(kw_context_args) > 0:
+        ctx = dict(validator.kw_context_args)
+        ctx.update(kw_context_args)
+    else:
+        ctx = validator.kw_context_args
+    try:
+        await _avalidate(validator, value, ctx, _new_limiter(concurrency))
+    except ValidationFailure as f:
+        # noinspection PyProtectedMember
+        raise validator._create_validation_error(name, value, validation_outcome=f, error_type=error_type,
+                                                 help_msg=help_msg, **ctx)
+
+
+async def ais_valid_with(validator,        # type: Validator
+                         value,            # type: Any
+                         concurrency=None  # type: Union[bool, int]
+                         ):
+    # type: (...) -> bool
+    """
+    The implementation of `Validator.ais_valid`: the asynchronous equivalent of `validator.is_valid`.
+
+    :param validator: the `Validator` to use
+    :param value: the value to validate
+    :param concurrency: the concurrency of this validation, see `check_concurrency`. Default is `None`, meaning
+        `concurrent_validation` and `default_max_concurrency`.
+    :return: a boolean flag indicating success or failure
+    """
+    check_concurrency(concurrency)
+    # noinspection PyBroadException
+    try:
+        await _avalidate(validator, value, dict(), _new_limiter(concurrency))
+        return True
+    except ExecutorError:
+        raise
+    except Exception:
+        return False
+
+
+async def _araise_first(awaitables,  # type: List[Awaitable]
+                        concurrent   # type: bool
+                        ):
+    """
+    Awaits all awaitables and raises the exception of the first one that failed, in order, if any. They are awaited one
+    after the other, the remaining ones being closed without being awaited as soon as one fails. If `concurrent` is
+    True they are all awaited concurrently.
+    """
+    if concurrent:
+        results = await asyncio.gather(*awaitables, return_exceptions=True)
+        for res in results:
+            if isinstance(res, BaseException):
+                raise res
+    else:
+        for i, awaitable in enumerate(awaitables):
+            try:
+                await awaitable
+            except BaseException:
+                for remaining in awaitables[i + 1:]:
+                    remaining.close()
+                raise
+
+
+def make_async_merged_check(name,             # type: Optional[str]
+                            validators,       # type: List[Validator]
+                            is_output=False   # type: bool
+                            ):
+    # type: (...) -> Callable[[Any, Any], Awaitable[None]]
+    """
+    The asynchronous equivalent of `valid8.entry_points_annotations._make_merged_check`: returns a coroutine function
+    `check(value, limiter)` running all validators in order (or concurrently, see `_Limiter`), and raising
+    the `ValidationError` of the first one that failed in order. Validators that override `assert_valid` are called as
+    is.
+
+    :param name: the name of the input, or None for the output
+    :param validators: the list of validators, in order
+    :param is_output: a boolean indicating if the validators are `OutputValidator`s
+    :return:
+    """
+    # avoid circular import
+    from valid8.entry_points_annotations import Validator, OutputValidator
+
+    standard_assert_valid = OutputValidator.assert_valid if is_output else Validator.assert_valid
+    steps = tuple((v, type(v).assert_valid == standard_assert_valid) for v in validators)
+    name = 'result' if is_output else name
+
+    async def check_one(validator, is_standard, value, limiter):
+        if not is_standard:
+            # custom validator
+            if is_output:
+                validator.assert_valid(value)
+            else:
+                validator.assert_valid(name, value)
+            return
+
+        ctx = validator.kw_context_args
+        try:
+            await _avalidate(validator, value, ctx, limiter)
+        except ValidationFailure as f:
+            # noinspection PyProtectedMember
+            raise validator._create_validation_error(name, value, validation_outcome=f, **ctx)
+
+    async def check(value, limiter):
+        await _araise_first([check_one(validator, is_standard, value, limiter) for validator, is_standard in steps],
+                            limiter.concurrent)
+
+    return check
+
+
+def make_async_validating_wrapper(func,           # type: Callable
+                                  func_signature  # type: Signature
+                                  ):
+    """
+    Creates the validating wrapper of a coroutine function or asynchronous generator function decorated with
+    validation, see `valid8.entry_points_annotations.decorate_with_validators`. The validation of all inputs is
+    performed before the coroutine is awaited (in order, or concurrently according to the `concurrency` option of the
+    decorators, see `check_concurrency`), and the output validation is performed on the awaited result. For
+    asynchronous generator functions, each yielded item is validated, see `ValidatedAsyncGenerator`.
+
+    :param func: the coroutine function or asynchronous generator function. Its validators, sampler and concurrency
+        option should already be attached to it.
+    :param func_signature: its signature
+    :return:
+    """
+    if isasyncgenfunction(func):
+        def validating_call(values, args, kwargs):
+            """ This is the wrapper that will be called everytime the asynchronous generator function is called """
+
+            sampler = func.__validation_sampler__
+            if sampler is not None and not sampler.should_validate():
+                # this call is not sampled: no validation at all
+                return func(*args, **kwargs)
+
+            return ValidatedAsyncGenerator(func, func_signature, values, args, kwargs)
+
+        return create_signature_wrapper(func, func_signature, validating_call)
+
+    async def validating_call(values, args, kwargs):
+        """ This is the wrapper that will be called everytime the coroutine function is called """
+
+        sampler = func.__validation_sampler__
+        if sampler is not None and not sampler.should_validate():
+            # this call is not sampled: no validation at all
+            return await func(*args, **kwargs)
+
+        inputs_plan, output_check = _get_async_plan(func, func_signature)
+        limiter = _new_limiter(func.__validation_concurrency__)
+
+        # (a) Perform input validation
+        await _avalidate_inputs(inputs_plan, values, limiter)
+
+        # (b) execute the coroutine function as usual
+        res = await func(*args, **kwargs)
+
+        # (c) validate output if needed
+        if output_check is not None:
+            await output_check(res, limiter)
+
+        return res
+
+    return create_signature_wrapper(func, func_signature, validating_call, is_coroutine=True)
+
+
+def _get_async_plan(func,           # type: Callable
+                    func_signature  # type: Signature
+                    ):
+    """ Returns the validation plan of func, creating it if needed. See `_make_validation_plan` """
+    plan = func.__validation_plan__
+    if plan is None:
+        # avoid circular import
+        from valid8.entry_points_annotations import _make_validation_plan
+        plan = func.__validation_plan__ = _make_validation_plan(func_signature, func.__validators__, is_async=True)
+    return plan
+
+
+async def _avalidate_inputs(inputs_plan,
+                            values,       # type: Tuple
+                            limiter
+                            ):
+    """
+    Validates all inputs according to the inputs plan, from the values of all parameters received by the wrapper. See
+    `_make_validation_plan` and `_araise_first`
+    """
+    checks = [input_check(values[position], limiter)
+              for input_name, position, input_check, default in inputs_plan if values[position] is not default]
+    if len(checks) > 0:
+        await _araise_first(checks, limiter.concurrent)
+
+
+class ValidatedAsyncGenerator(object):
+    """
+    The asynchronous generator returned by an asynchronous generator function decorated with validation. The inputs
+    are validated when the first item is requested, then the items of the inner asynchronous generator are yielded,
+    each of them being validated on the fly with the output validators. The first invalid item raises the
+    `OutputValidationError` of the validator that failed, with an additional `item_index` attribute.
+
+    `asend`, `athrow` and `aclose` are forwarded to the inner asynchronous generator.
+    """
+    __slots__ = ('func', 'func_signature', 'values', 'args', 'kwargs', 'agen', 'item_check', 'item_index', '_limiter')
+
+    def __init__(self,
+                 func,            # type: Callable
+                 func_signature,  # type: Signature
+                 values,          # type: Tuple
+                 args,            # type: Tuple
+                 kwargs           # type: Dict[str, Any]
+                 ):
+        """
+        Constructor
+
+        :param func: the decorated asynchronous generator function
+        :param func_signature: its signature
+        :param values: the values of all parameters received, in signature order (see `create_signature_wrapper`)
+        :param args: the positional arguments to call func with
+        :param kwargs: the keyword arguments to call func with
+        """
+        self.func = func
+        self.func_signature = func_signature
+        self.values = values
+        self.args = args
+        self.kwargs = kwargs
+        self.agen = None
+        self.item_check = None
+        self.item_index = 0
+        self._limiter = None
+
+    def __aiter__(self):
+        return self
+
+    async def _start(self):
+        """ Validates the inputs and creates the inner asynchronous generator """
+        inputs_plan, self.item_check = _get_async_plan(self.func, self.func_signature)
+        self._limiter = _new_limiter(self.func.__validation_concurrency__)
+        await _avalidate_inputs(inputs_plan, self.values, self._limiter)
+        self.agen = self.func(*self.args, **self.kwargs)
+
+    async def _validate(self, item):
+        """ Validates the next item and returns it """
+        item_index = self.item_index
+        self.item_index = item_index + 1
+        if self.item_check is not None:
+            try:
+                await self.item_check(item, self._limiter)
+            except ValidationError as e:
+                e.item_index = item_index
+                raise
+        return item
+
+    async def __anext__(self):
+        if self.agen is None:
+            await self._start()
+        return await self._validate(await self.agen.__anext__())
+
+    async def asend(self, value):
+        if self.agen is None:
+            await self._start()
+        return await self._validate(await self.agen.asend(value))
+
+    async def athrow(self, *args):
+        if self.agen is None:
+            await self._start()
+        return await self._validate(await self.agen.athrow(*args))
+
+    async def aclose(self):
+        if self.agen is not None:
+            await self.agen.aclose()
@@ -0,0 +1,286 @@
+"""
+Declarative validator specifications: validators defined as data (python dicts and lists, or JSON strings), for example
+loaded from a configuration file.
+
+A spec is a dict where each key is the name of an operator and each value is its argument, for example
+`{"instance_of": "int", "gt": 0}`. Several entries in the same dict are combined with `and_`. A list of specs is an
+implicit `and_` too, and a string is a shortcut for an operator without arguments such as `"non_empty"`. See
+`spec_operators` for the available operators.
+"""
+import json
+from numbers import Integral, Real, Number
+
+from six import string_types
+
+from valid8.base import pop_kwargs, failure_raiser
+from valid8.composition import and_, or_, xor_, not_, not_all, skip_on_none, fail_on_none
+from valid8.entry_points import Validator
+from valid8.utils.cache_tools import LRUCache, make_definition_key, UnhashableDefinition
+from valid8.validation_lib import instance_of, subclass_of, gt, gts, lt, lts, between, is_even, is_odd, \
+    is_multiple_of, minlen, maxlen, has_length, length_between, non_empty, empty, is_in, is_subset, contains, \
+    is_superset, on_all_, on_each_
+
+try:  # python 3.5+
+    # noinspection PyUnresolvedReferences
+    from typing import Any, Dict, Union, List
+    # noinspection PyUnresolvedReferences
+    from valid8.base import ValidationCallable
+except ImportError:
+    pass
+
+
+class InvalidSpecError(ValueError):
+    """ Raised by `from_spec` and `make_spec_callable` when a validation spec is not valid """
+
+    def __init__(self, path, msg):
+        self.path = path
+        super(InvalidSpecError, self).__init__("Invalid validation spec at %s: %s" % (path, msg))
+
+
+spec_types = {
+    'None': type(None), 'bool': bool, 'int': int, 'float': float, 'complex': complex, 'str': str, 'bytes': bytes,
+    'list': list, 'tuple': tuple, 'dict': dict, 'set': set, 'frozenset': frozenset,
+    'Integral': Integral, 'Real': Real, 'Number': Number
+}
+""" The types that can be referred to by name in `instance_of` and `subclass_of` specs. Add your own types to this dict
+to use them in specs. """
+
+
+def _resolve_types(arg, path):
+    """ Returns the type or set of types referred to by `arg`, a name from `spec_types`, a type or a list of those. """
+    if isinstance(arg, list):
+        return set(_resolve_types(a, path) for a in arg)
+    elif isinstance(arg, type):
+        return arg
+    try:
+        return spec_types[arg]
+    except (KeyError, TypeError):
+        raise InvalidSpecError(path, "unknown type %r. Known types are %s, see `valid8.spec.spec_types`"
+                                     % (arg, sorted(spec_types)))
+
+
+def _types_operator(func):
+    def build(arg, path):
+        return func(_resolve_types(arg, path))
+    return build
+
+
+def _args_operator(func):
+    """ The argument is passed as is, or as keyword arguments if it is a dict, or as positional arguments if a list """
+    def build(arg, path):
+        if isinstance(arg, dict):
+            return func(**arg)
+        elif isinstance(arg, list):
+            return func(*arg)
+        else:
+            return func(arg)
+    return build
+
+
+def _set_operator(func):
+    """ The argument is a collection of values, converted to a set if possible (JSON does not have sets) """
+    def build(arg, path):
+        if isinstance(arg, dict):
+            return func(**arg)
+        try:
+            return func(set(arg))
+        except TypeError:
+            # non-hashable values
+            return func(arg)
+    return build
+
+
+def _value_operator(func):
+    """ The argument is passed as is """
+    def build(arg, path):
+        return func(arg)
+    return build
+
+
+def _flag_operator(func):
+    """ An operator without arguments: the argument should be `True` """
+    def build(arg, path):
+        if arg is not True:
+            raise InvalidSpecError(path, "the only value supported is true, found %r" % (arg, ))
+        return func
+    return build
+
+
+def _composition_operator(func, several=True):
+    """ An operator receiving one or several specs. If several is False, a list of specs is not accepted """
+    def build(arg, path):
+        if isinstance(arg, list):
+            if not several:
+                raise InvalidSpecError(path, "a single spec is expected, found a list. Use 'not_all' to negate several "
+                                             "specs, or combine them with 'and' or 'or'")
+            return func(*[make_spec_callable(a, '%s[%s]' % (path, i)) for i, a in enumerate(arg)])
+        else:
+            return func(make_spec_callable(arg, path))
+    return build
+
+
+spec_operators = {
+    # composition
+    'and': _composition_operator(and_),
+    'or': _composition_operator(or_),
+    'xor': _composition_operator(xor_),
+    'not': _composition_operator(not_, several=False),
+    'not_all': _composition_operator(not_all),
+    'skip_on_none': _composition_operator(skip_on_none),
+    'fail_on_none': _composition_operator(fail_on_none),
+    # types
+    'instance_of': _types_operator(instance_of),
+    'subclass_of': _types_operator(subclass_of),
+    # comparables
+    'gt': _args_operator(gt),
+    'gts': _args_operator(gts),
+    'lt': _args_operator(lt),
+    'lts': _args_operator(lts),
+    'between': _args_operator(between),
+    # numbers
+    'is_even': _flag_operator(is_even),
+    'is_odd': _flag_operator(is_odd),
+    'is_multiple_of': _args_operator(is_multiple_of),
+    # collections
+    'minlen': _args_operator(minlen),
+    'maxlen': _args_operator(maxlen),
+    'has_length': _args_operator(has_length),
+    'length_between': _args_operator(length_between),
+    'non_empty': _flag_operator(non_empty),
+    'empty': _flag_operator(empty),
+    'is_in': _set_operator(is_in),
+    'is_subset': _set_operator(is_subset),
+    'contains': _value_operator(contains),
+    'is_superset': _set_operator(is_superset),
+    'on_all': _composition_operator(on_all_),
+    'on_each': _composition_operator(on_each_),
+}
+""" The operators available in validation specs, by name. Each entry is a function `build(arg, path)` receiving the
+argument found in the spec and the path of the entry (for error messages), and returning a validation callable. Add
+your own entries to this dict to use them in specs. """
+
+
+def make_spec_callable(spec,       # type: Union[Dict[str, Any], List[Any], str]
+                       path='spec'  # type: str
+                       ):
+    # type: (...) -> ValidationCallable
+    """
+    Creates a validation callable from a validation spec. The callable is made of the functions of
+    `valid8.validation_lib` and of the composition operators, so it can be compiled, compared with `==` and pickled.
+
+    >>> from valid8.validation_lib import instance_of, gt
+    >>> f = make_spec_callable({"instance_of": "int", "gt": 0})
+    >>> assert f == and_(instance_of(int), gt(0))
+
+    A `help_msg` entry in a spec dict wraps the other entries of the dict in a `failure_raiser` with this help message.
+
+    :param spec: a dict of `{<operator name>: <argument>}`, a list of specs, the name of an operator without argument,
+        or a validation callable. See `spec_operators` for the available operators.
+    :param path: the path of this spec in the enclosing spec, used in error messages.
+    :return: a validation callable
+    :raises InvalidSpecError: if the spec is not valid
+    """
+    if isinstance(spec, dict):
+        entries = [(k, v) for k, v in spec.items() if k != 'help_msg']
+        if len(entries) == 0:
+            raise InvalidSpecError(path, "a spec dict should contain at least one operator")
+        funcs = []
+        for op_name, arg in entries:
+            sub_path = '%s.%s' % (path, op_name)
+            try:
+                build = spec_operators[op_name]
+            except (KeyError, TypeError):
+                raise InvalidSpecError(sub_path, "unknown operator %r, see `valid8.spec.spec_operators`" % (op_name, ))
+            try:
+                funcs.append(build(arg, sub_path))
+            except InvalidSpecError:
+                raise
+            except Exception as e:
+                raise InvalidSpecError(sub_path, "%s: %s" % (type(e).__name__, e))
+        func = funcs[0] if len(funcs) == 1 else and_(*funcs)
+
+        help_msg = spec.get('help_msg', None)
+        if help_msg is not None:
+            if not isinstance(help_msg, string_types):
+                raise InvalidSpecError(path + '.help_msg', "help_msg should be a string, found %r" % (help_msg, ))
+            try:
+                func = failure_raiser(func, help_msg=help_msg)
+            except Exception as e:
+                raise InvalidSpecError(path + '.help_msg', "%s: %s" % (type(e).__name__, e))
+        return func
+
+    elif isinstance(spec, list):
+        if len(spec) == 0:
+            raise InvalidSpecError(path, "a spec list should contain at least one spec")
+        return _composition_operator(and_)(spec, path)
+
+    elif isinstance(spec, string_types):
+        # an operator without argument
+        return make_spec_callable({spec: True}, path)
+
+    elif callable(spec):
+        return spec
+
+    else:
+        raise InvalidSpecError(path, "a spec should be a dict, a list or a string, found %r" % (spec, ))
+
+
+specs_cache = LRUCache(maxsize=256)
+""" The cache of `Validator`s created by `from_spec`, keyed by the spec and the other arguments. Use
+`specs_cache.cache_info()` to get statistics and `specs_cache.clear()` to empty it. Set `specs_cache.maxsize = 0` to
+disable it. """
+
+
+def from_spec(spec,  # type: Union[Dict[str, Any], List[Any], str]
+              **kwargs
+              ):
+    # type: (...) -> Validator
+    """
+    Creates a `Validator` from a validation spec, that is, a definition made of data rather than of python code.
+
+    >>> v = from_spec('{"instance_of": "int", "gt": 0, "help_msg": "should be a positive integer"}')
+    >>> v.is_valid(1), v.is_valid(-1)
+    (True, False)
+
+    The validator is compiled by default (see `valid8.compiler`), and cached in `specs_cache`: calling `from_spec`
+    again with an equal spec returns the same `Validator` without parsing nor compiling it again. Validators created
+    from specs only contain functions from `valid8.validation_lib` and composition operators, so they can be pickled
+    and sent to other processes. Note that two specs with the same entries in a different order are different specs.
+
+    :param spec: a dict of `{<operator name>: <argument>}` (see `make_spec_callable` and `spec_operators`), a list of
+        specs, or a JSON string representing one of those.
+    :param error_type: a subclass of ValidationError to raise in case of validation failure. See `Validator`.
+    :param help_msg: an optional help message to be used in the raised error in case of validation failure.
+    :param none_policy: describes how None values should be handled. See `NonePolicy` for the various possibilities.
+    :param compile: if True (default) the validator is compiled. See `Validator`.
+    :param kw_context_args: optional contextual information to store in the exception, and that may be also used
+        to format the help message
+    :return: a `Validator`
+    :raises InvalidSpecError: if the spec is not valid
+    """
+    error_type, help_msg, none_policy, compile_ = pop_kwargs(kwargs, [('error_type', None),
+                                                                      ('help_msg', None),
+                                                                      ('none_policy', None),
+                                                                      ('compile', True)], allow_others=True)
+    try:
+        key = make_definition_key((spec, error_type, help_msg, none_policy, compile_, kwargs))
+    except UnhashableDefinition:
+        key = None
+    else:
+        validator = specs_cache.get(key)
+        if validator is not None:
+            return validator
+
+    if isinstance(spec, string_types):
+        try:
+            spec_data = json.loads(spec)
+        except ValueError as e:
+            raise InvalidSpecError('spec', "invalid JSON: %s" % e)
+    else:
+        spec_data = spec
+
+    validator = Validator(make_spec_callable(spec_data), error_type=error_type, help_msg=help_msg,
+                          none_policy=none_policy, compile=compile_, **kwargs)
+    if key is not None:
+        specs_cache.put(key, validator)
+    return validator
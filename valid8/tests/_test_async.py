@@ -0,0 +1,187 @@
+import asyncio
+
+import pytest
+
+from valid8 import Validator, ValidationError, or_, not_, skip_on_none, validate_arg, validate_out, validate_io, \
+    InputValidationError, OutputValidationError, AtLeastOneFailed, AllValidatorsFailed
+from valid8.validation_lib import gt, is_even, instance_of
+
+
+def run(coro):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+class FakeDb(object):
+    """ A stand-in for a database, that records the maximum number of concurrent queries """
+    def __init__(self, names):
+        self.names = set(names)
+        self.running = 0
+        self.max_running = 0
+
+    async def is_unique(self, x):
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        await asyncio.sleep(0.01)
+        self.running -= 1
+        return x not in self.names
+
+    async def is_short(self, x):
+        return await self.is_unique(x) and len(x) < 5
+
+
+def test_async_validator(monkeypatch):
+    db = FakeDb(['a', 'b'])
+    v = Validator(db.is_unique, db.is_short, (db.is_unique, 'should be unique'), not_(skip_on_none(is_even)),
+                  compile=True)
+
+    run(v.aassert_valid('name', 'c'))
+    assert db.max_running == 1
+    assert run(v.ais_valid('c'))
+    assert not run(v.ais_valid('a'))
+
+    with pytest.raises(ValidationError) as exc_info:
+        run(v.aassert_valid('name', 'a'))
+    failure = exc_info.value.failure
+    assert isinstance(failure, AtLeastOneFailed)
+    # the evaluation stopped at the first failure
+    assert failure.successes == []
+    assert list(failure.failures.keys()) == list(failure.validators[:1])
+
+    # composition operators
+    v2 = Validator(or_(db.is_unique, gt('x')))
+    run(v2.aassert_valid('name', 'z'))
+    with pytest.raises(ValidationError) as exc_info:
+        run(v2.aassert_valid('name', 'a'))
+    assert isinstance(exc_info.value.failure, AllValidatorsFailed)
+
+    # concurrent validation
+    import valid8.entry_points_async as epa
+    monkeypatch.setattr(epa, 'concurrent_validation', True)
+    db.max_running = 0
+    run(v.aassert_valid('name', 'c'))
+    assert db.max_running == 3
+
+    with pytest.raises(ValidationError) as exc_info:
+        run(v.aassert_valid('name', 'a'))
+    failure = exc_info.value.failure
+    # all results are known without replaying the validators
+    assert failure.successes == ['not(skip_on_none(is_even))']
+    assert list(failure.failures.keys()) == list(failure.validators[:3])
+
+    # concurrency limit
+    monkeypatch.setattr(epa, 'default_max_concurrency', 1)
+    db.max_running = 0
+    run(v.aassert_valid('name', 'c'))
+    assert db.max_running == 1
+
+
+def test_async_short_circuit():
+    """ A type check placed before an asynchronous check prevents it from being called on invalid values """
+    calls = []
+
+    async def is_known(x):
+        calls.append(x)
+        return x.lower() in ('a', 'b')
+
+    v = Validator(instance_of(str), is_known)
+    assert run(v.ais_valid('A'))
+    assert not run(v.ais_valid(1))
+    assert calls == ['A']
+
+    # or_ stops at the first success
+    assert run(Validator(or_(instance_of(int), is_known)).ais_valid(1))
+    assert calls == ['A']
+
+    # stacked validators (applied from the innermost) and inputs are validated in order too
+    @validate_arg('n', is_known)
+    @validate_arg('name', is_known)
+    @validate_arg('name', instance_of(str))
+    async def f(name, n):
+        return name
+
+    with pytest.raises(InputValidationError):
+        run(f(1, 'a'))
+    assert calls == ['A']
+
+
+def test_async_decorators():
+    db = FakeDb(['a', 'b'])
+
+    @validate_arg('name', db.is_unique)
+    @validate_arg('n', is_even)
+    @validate_out(db.is_short)
+    async def create(name, n=2):
+        await asyncio.sleep(0)
+        return name * n
+
+    assert run(create('c')) == 'cc'
+    with pytest.raises(InputValidationError):
+        run(create('a'))
+    with pytest.raises(InputValidationError):
+        run(create('c', n=1))
+    with pytest.raises(OutputValidationError):
+        run(create('c', n=6))
+
+
+def test_async_concurrency_option(monkeypatch):
+    """ The concurrency can be set per call and per decorator, the module-level values are only defaults """
+    import valid8.entry_points_async as epa
+
+    db = FakeDb(['a', 'b'])
+    v = Validator(db.is_unique, db.is_short, (db.is_unique, 'should be unique'))
+
+    # per call
+    run(v.aassert_valid('name', 'c', concurrency=True))
+    assert db.max_running == 3
+    db.max_running = 0
+    assert run(v.ais_valid('c', concurrency=2))
+    assert db.max_running == 2
+    db.max_running = 0
+    run(v.aassert_valid('name', 'c'))
+    assert db.max_running == 1
+
+    # the default is only used when no concurrency is provided
+    monkeypatch.setattr(epa, 'concurrent_validation', True)
+    db.max_running = 0
+    run(v.aassert_valid('name', 'c', concurrency=False))
+    assert db.max_running == 1
+    monkeypatch.setattr(epa, 'concurrent_validation', False)
+
+    with pytest.raises(ValueError):
+        run(v.aassert_valid('name', 'c', concurrency=0))
+    with pytest.raises(TypeError):
+        run(v.ais_valid('c', concurrency='yes'))
+
+    # per decorator
+    @validate_arg('name', db.is_unique, db.is_short, concurrency=True)
+    @validate_arg('other', db.is_unique)
+    async def create(name, other):
+        return name
+
+    db.max_running = 0
+    assert run(create('c', 'd')) == 'c'
+    assert db.max_running == 3
+
+    @validate_io(name=[db.is_unique, db.is_short], _concurrency_=2)
+    async def create_io(name):
+        return name
+
+    db.max_running = 0
+    assert run(create_io('c')) == 'c'
+    assert db.max_running == 2
+
+    @validate_arg('name', db.is_unique, db.is_short)
+    async def create_seq(name):
+        return name
+
+    db.max_running = 0
+    assert run(create_seq('c')) == 'c'
+    assert db.max_running == 1
+
+    # a conflicting concurrency option on the same function is an error
+    with pytest.raises(ValueError):
+        validate_arg('other', db.is_short, concurrency=False)(create)
@@ -0,0 +1,45 @@
+import asyncio
+
+import pytest
+
+from valid8 import validate_arg, validate_out, InputValidationError, OutputValidationError
+from valid8.validation_lib import gt, is_even
+
+from ._test_async import run
+
+
+async def is_small(x):
+    await asyncio.sleep(0)
+    return x < 6
+
+
+def test_async_generator():
+
+    @validate_arg('n', gt(0))
+    @validate_out(is_even, is_small)
+    async def evens(n):
+        for i in range(n):
+            await asyncio.sleep(0)
+            yield 2 * i
+
+    async def consume(agen):
+        return [i async for i in agen]
+
+    assert run(consume(evens(3))) == [0, 2, 4]
+
+    # inputs are validated when the first item is requested
+    agen = evens(-1)
+    with pytest.raises(InputValidationError):
+        run(consume(agen))
+
+    # items are validated lazily, the error carries the item index
+    received = []
+
+    async def consume_all(agen):
+        async for i in agen:
+            received.append(i)
+
+    with pytest.raises(OutputValidationError) as exc_info:
+        run(consume_all(evens(5)))
+    assert received == [0, 2, 4]
+    assert exc_info.value.item_index == 3
@@ -13,6 +13,12 @@ def create_for_test_validate_none_enforce():
     return myfunc
 
 
+def create_for_test_validate_arg_kinds():
+    def myfunc(a, b=2, *args, c, d=4, **kwargs):
+        return a, b, args, c, d, kwargs
+    return myfunc
+
+
 def create_for_test_validate_none_pytypes():
     def myfunc(a: Integral, b = None):
         print('hello')
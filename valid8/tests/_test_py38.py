@@ -0,0 +1,51 @@
+from inspect import signature
+
+import pytest
+
+from valid8 import validate_arg, validate_io, InputValidationError
+from valid8.validation_lib import is_even, maxlen
+
+
+def test_validate_arg_kinds_positional_only():
+    def myfunc(a, b=2, /, c=4, *args, d, e=6, **kwargs):
+        return a, b, c, args, d, e, kwargs
+
+    validated = validate_io(a=is_even, b=is_even, c=is_even, args=maxlen(1), d=is_even, e=is_even,
+                            kwargs=maxlen(1))(myfunc)
+    assert signature(validated) == signature(myfunc)
+
+    # all calling styles
+    assert validated(0, d=8) == (0, 2, 4, (), 8, 6, {})
+    assert validated(0, 2, 4, 6, d=8, e=10, f=12) == (0, 2, 4, (6,), 8, 10, {'f': 12})
+    assert validated(0, c=4, d=8) == (0, 2, 4, (), 8, 6, {})
+    assert validated(0, 2, c=4, d=8, f=12) == (0, 2, 4, (), 8, 6, {'f': 12})
+    assert validated(*(0, 2, 4), **dict(d=8, e=10)) == (0, 2, 4, (), 8, 10, {})
+
+    # the invalid value of each parameter is detected whatever the calling style
+    for args, kwargs in [((1,), dict(d=8)), ((0, 1), dict(d=8)), ((0, 2, 1), dict(d=8)), ((0,), dict(c=1, d=8)),
+                         ((0, 2, 4, 6, 8), dict(d=8)), ((0,), dict(d=1)), ((0,), dict(d=8, e=1)),
+                         ((0,), dict(d=8, f=1, g=2))]:
+        with pytest.raises(InputValidationError):
+            validated(*args, **kwargs)
+
+    # keywords named as positional-only parameters are received in the var-keyword parameter
+    assert validated(0, d=8, a=1) == (0, 2, 4, (), 8, 6, {'a': 1})
+    with pytest.raises(InputValidationError):
+        validated(0, d=8, a=1, b=3)
+
+    # the signature errors are the ones of the function
+    with pytest.raises(TypeError):
+        validated(d=8)
+    with pytest.raises(TypeError):
+        validated(0)
+
+    # a validator on a positional-only parameter only
+    @validate_arg('a', is_even)
+    def pos_only(a, /):
+        return a
+
+    assert pos_only(0) == 0
+    with pytest.raises(InputValidationError):
+        pos_only(1)
+    with pytest.raises(TypeError):
+        pos_only(a=0)
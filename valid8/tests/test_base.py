@@ -143,3 +143,34 @@ def test_getfullargspec(case_data):
 
     # test the validator
     assert callit(input, ctx_a=0)
+
+
+def test_receives_ctx_cache():
+    """ Checks that the signature inspection results are cached, including for bound methods and builtins """
+    import gc
+    from valid8.base import receives_ctx, signature_cache
+
+    class Foo(object):
+        def check(self, x, **ctx):
+            return True
+
+    def bar(x):
+        return True
+
+    signature_cache.clear()
+    foo = Foo()
+    p = partial(bar)
+    for _ in range(3):
+        assert receives_ctx(bar) is False
+        assert receives_ctx(foo.check) is True
+        assert receives_ctx(callable) is False
+        assert receives_ctx(p) is False
+    info = signature_cache.cache_info()
+    assert info.misses == 4
+    assert info.hits == 8
+    assert info.uncacheable == 0
+
+    # the cache does not keep functions alive
+    del bar, p
+    gc.collect()
+    assert signature_cache.cache_info().currsize == 2
@@ -0,0 +1,289 @@
+import pytest
+
+from valid8 import Validator, ValidationError, ValidationFailure, NonePolicy, compile_validator, failure_raiser
+from valid8 import validate_arg, InputValidationError, or_, xor_, not_, not_all, skip_on_none, fail_on_none
+from valid8.validation_lib import gt, lt, is_even, is_odd, instance_of, between, is_in, minlen, maxlen, non_empty, \
+    is_multiple_of, on_all_, on_each_
+
+
+class MyFailure(ValidationFailure):
+    help_msg = "custom failure for {wrong_value}"
+
+
+def is_positive(x):
+    return x > 0
+
+
+def is_small_with_ctx(x, **ctx):
+    return x < 100
+
+
+def raises_failure(x):
+    if x == 3:
+        raise MyFailure(wrong_value=x)
+    return True
+
+
+def opaque_creator(f, help_msg=None, failure_type=None):
+    """A custom callable creator: the created callables are not inlined by the compiler"""
+    r = failure_raiser(f, help_msg=help_msg, failure_type=failure_type)
+
+    def opaque(x, **ctx):
+        return r(x, **ctx)
+
+    opaque.__name__ = r.__name__
+    return opaque
+
+
+class OpaqueValidator(Validator):
+    def get_callables_creator(self):
+        return opaque_creator
+
+
+DEFINITIONS = [
+    (is_positive,),
+    (is_positive, is_small_with_ctx),
+    ((is_positive, 'x should be positive'),),
+    ((is_positive, MyFailure), is_even),
+    (raises_failure,),
+    (raises_failure, is_positive),
+    ((raises_failure, 'wrapped failure'),),
+    (instance_of(int), gt(0), lt(100)),
+    (instance_of(int), (gt(0, strict=True), 'should be strictly positive'), is_positive, is_multiple_of(2)),
+    (between(0, 3, open_right=True), is_in({0, 1, 3, 150})),
+    (is_in({0, 1, 4, 'a'}), (non_empty, MyFailure)),
+    ((minlen(1), 'too short'), maxlen(2)),
+]
+
+
+@pytest.mark.parametrize('none_policy', [NonePolicy.VALIDATE, NonePolicy.SKIP, NonePolicy.FAIL],
+                         ids=['validate', 'skip', 'fail'])
+@pytest.mark.parametrize('validator_type', [Validator, OpaqueValidator], ids=['std', 'opaque'])
+@pytest.mark.parametrize('vfs', DEFINITIONS)
+def test_compiled_same_behaviour(vfs, validator_type, none_policy):
+    """ Checks that a compiled Validator behaves exactly like the non-compiled one """
+    v_ref = validator_type(*vfs, none_policy=none_policy)
+    v_comp = validator_type(*vfs, none_policy=none_policy, compile=True)
+
+    assert v_comp.get_main_function_name() == v_ref.get_main_function_name()
+    assert repr(v_comp) == repr(v_ref)
+
+    for value in (None, -1, 0, 1, 2, 3, 4, 150, 'a'):
+        try:
+            res_ref = v_ref.main_function(value)
+        except Exception as e:
+            with pytest.raises(type(e)) as exc_info:
+                v_comp.main_function(value)
+            assert str(exc_info.value) == str(e)
+            cause = exc_info.value.__cause__
+            assert type(cause) is type(e.__cause__)
+            assert str(cause) == str(e.__cause__)
+
+            with pytest.raises(ValidationError) as exc_info_ref:
+                v_ref.assert_valid('foo', value)
+            with pytest.raises(ValidationError) as exc_info_comp:
+                v_comp.assert_valid('foo', value)
+            assert type(exc_info_comp.value) is type(exc_info_ref.value)
+            assert str(exc_info_comp.value) == str(exc_info_ref.value)
+        else:
+            assert v_comp.main_function(value) == res_ref
+
+        assert v_comp.is_valid(value) == v_ref.is_valid(value)
+
+
+def test_compile_validator():
+    """ Checks that `compile_validator` compiles an existing Validator in place, and that the source is available """
+    from inspect import getsource
+
+    def is_even_(x):
+        return x % 2 == 0
+
+    v = Validator(is_positive, (is_even_, "x should be even"))
+    assert compile_validator(v) is v
+    assert v.main_function.__name__ == 'and(is_positive, is_even_)'
+    assert '_u0(x)' in getsource(v.main_function)
+
+    v.assert_valid('x', 2)
+    with pytest.raises(ValidationError) as exc_info:
+        v.assert_valid('x', 1)
+    assert str(exc_info.value) == "Error validating [x=1]. At least one validation function failed for value 1. " \
+                                  "Successes: ['is_positive'] / " \
+                                  "Failures: {'is_even_': 'InvalidValue: x should be even. Returned False.'}."
+
+
+def test_compiled_ctx():
+    """ Checks that the context is correctly received by functions accepting it """
+
+    def check_ctx(x, **ctx):
+        return ctx['ref'] == x
+
+    v = Validator(check_ctx, is_positive, help_msg="invalid {var_name}", ref=1, compile=True)
+    v.assert_valid('x', 1)
+    with pytest.raises(ValidationError):
+        v.assert_valid('x', 2)
+    with pytest.raises(ValidationError):
+        v.assert_valid('x', 2, ref=3)
+    v.assert_valid('x', 2, ref=2)
+
+
+def test_compiled_fused_lib_functions():
+    """ Checks that the validation_lib functions are fused into a single inline check, with the same failures """
+    from inspect import getsource
+
+    v = Validator(instance_of(int), gt(0), lt(100, strict=True), compile=True)
+    src = getsource(v.main_function)
+    assert "ok = bool((isinstance(x, _d0_0)) and (x >= _d1_0) and (x < _d2_0))" in src
+
+    v.assert_valid('x', 1)
+    with pytest.raises(ValidationError) as exc_info:
+        v.assert_valid('x', 100)
+    assert str(exc_info.value) == "Error validating [x=100]. At least one validation function failed for value 100. " \
+                                  "Successes: [\"instance_of_%r\", 'greater_than_0'] / " \
+                                  "Failures: {'strictly_lesser_than_100': 'TooBig: x < 100 does not hold for x=100.'}." \
+                                  % int
+
+
+def test_compiled_mutable_type_set():
+    """ Checks that compiled validators see the modifications of the set of types given to `instance_of` """
+    from inspect import getsource
+
+    types = {int}
+    v_ref = Validator(instance_of(types), gt(0))
+    v_comp = Validator(instance_of(types), gt(0), compile=True)
+    assert "isinstance" not in getsource(v_comp.main_function)
+    assert not v_comp.is_valid(1.5) and not v_ref.is_valid(1.5)
+    types.add(float)
+    assert v_comp.is_valid(1.5) and v_ref.is_valid(1.5)
+    v_comp.assert_valid('x', 1.5)
+
+
+@pytest.mark.parametrize('vfs', [(gt(0),), (gt(0), lt(5)), (is_in({1, 2}),), (gt(0), is_positive)],
+                         ids=str)
+def test_compiled_numpy_arrays(vfs):
+    """ Checks that fused checks on values with an ambiguous truth value raise the same errors than non-compiled ones """
+    np = pytest.importorskip("numpy")
+
+    v_ref = Validator(*vfs)
+    v_comp = Validator(*vfs, compile=True)
+    for value in (np.array([1, 2]), np.array([1]), np.array([-1]), np.array([])):
+        try:
+            v_ref.assert_valid('x', value)
+        except ValidationError as e:
+            with pytest.raises(ValidationError) as exc_info:
+                v_comp.assert_valid('x', value)
+            assert type(exc_info.value) is type(e)
+            assert str(exc_info.value) == str(e)
+        else:
+            v_comp.assert_valid('x', value)
+        assert v_comp.is_valid(value) == v_ref.is_valid(value)
+
+
+def test_compiled_decorator():
+    """ Checks that decorators accept the `compile` option """
+
+    @validate_arg('a', instance_of(int), gt(0), compile=True)
+    def foo(a):
+        return a
+
+    from inspect import getsource
+    v = foo.__wrapped__.__validators__['a'][0]
+    assert v.main_function.__name__ == "and(instance_of_%r, greater_than_0)" % int
+    assert "ok = " in getsource(v.main_function)
+    assert foo(1) == 1
+    with pytest.raises(InputValidationError):
+        foo(-1)
+
+
+def raises_assertion(x):
+    assert x > 2
+
+
+PREDICATE_DEFINITIONS = [
+    (or_(is_even, gt(3)),),
+    (xor_(is_even, gt(3), raises_assertion),),
+    (not_(is_even),),
+    (not_(raises_assertion),),
+    (not_(raises_assertion, catch_all=True),),
+    (not_all(is_even, gt(3)), is_positive),
+    (skip_on_none(gt(1)), fail_on_none(lt(3))),
+    ([instance_of(int), or_(gt(3), (is_even, 'must be even'))],),
+    (on_all_(gt(0), is_even),),
+    (on_each_(gt(0), [is_even, lt(10)]),),
+    (or_(not_(on_all_(is_even)), minlen(3)),),
+]
+
+
+@pytest.mark.parametrize('none_policy', [NonePolicy.VALIDATE, NonePolicy.SKIP, NonePolicy.FAIL],
+                         ids=['validate', 'skip', 'fail'])
+@pytest.mark.parametrize('vfs', DEFINITIONS + PREDICATE_DEFINITIONS)
+def test_compiled_predicate(vfs, none_policy):
+    """ Checks that the boolean predicate of a compiled Validator gives the same results than the standard path """
+    v_ref = Validator(*vfs, none_policy=none_policy)
+    v_comp = Validator(*vfs, none_policy=none_policy, compile=True)
+    assert v_ref.main_predicate is None
+    assert v_comp.main_predicate is not None
+
+    for value in (None, -1, 0, 1, 2, 3, 4, 5, 6, 150, 'a', (), (1, 2), (2, 4), (2, 4, 6), [-2, 2]):
+        assert v_comp.is_valid(value) == v_ref.is_valid(value), value
+
+
+def test_compiled_predicate_no_failure(monkeypatch):
+    """ Checks that no failure is ever created by the compiled predicate """
+    from valid8.base import ValidationFailure
+
+    def forbidden(self, *args, **kwargs):
+        raise AssertionError("a failure was created")
+
+    v = Validator(instance_of(int), or_(gt(3), is_even), not_(is_odd), compile=True)
+    monkeypatch.setattr(ValidationFailure, '__init__', forbidden)
+    assert not v.is_valid('a')
+    assert not v.is_valid(1)
+    assert v.is_valid(4)
+
+
+def returns_failure(x):
+    if x == 3:
+        return MyFailure(wrong_value=x)
+    return True
+
+
+@pytest.mark.parametrize("compile", [False, True], ids="compile={}".format)
+def test_returned_failure_is_wrapped(compile):
+    """ A failure returned (not raised) by a validation function is wrapped, like any other non-success result """
+    from valid8.base import InvalidValue
+
+    v = Validator(returns_failure, compile=compile)
+    with pytest.raises(ValidationError) as exc_info:
+        v.assert_valid('x', 3)
+    failure = exc_info.value.failure
+    assert type(failure) is InvalidValue
+    assert isinstance(failure.validation_outcome, MyFailure)
+    assert str(failure) == "Function [returns_failure] raised MyFailure: custom failure for 3. Wrong value: 3."
+
+    v = Validator(raises_failure, compile=compile)
+    with pytest.raises(ValidationError) as exc_info:
+        v.assert_valid('x', 3)
+    assert type(exc_info.value.failure) is MyFailure
+
+
+@pytest.mark.parametrize("compile", [False, True], ids="compile={}".format)
+def test_wrapped_type_failure_is_invalid_value(compile):
+    """ A failure inheriting from TypeError that is wrapped because of a help_msg is an InvalidValue, not InvalidType """
+    from valid8.base import InvalidValue, InvalidType
+    from valid8.validation_lib.types import HasWrongType
+
+    with pytest.raises(InvalidValue) as exc_info:
+        failure_raiser(instance_of(int), help_msg='must be int')('a')
+    assert type(exc_info.value) is InvalidValue
+    assert isinstance(exc_info.value.validation_outcome, HasWrongType)
+
+    v = Validator(failure_raiser(instance_of(int), help_msg='must be int'), compile=compile)
+    with pytest.raises(ValidationError) as exc_info:
+        v.assert_valid('x', 'a')
+    assert type(exc_info.value.failure) is InvalidValue
+
+    # raw TypeErrors are still wrapped in an InvalidType
+    v = Validator(is_positive, help_msg='must be positive', compile=compile)
+    with pytest.raises(ValidationError) as exc_info:
+        v.assert_valid('x', 1j)
+    assert type(exc_info.value.failure) is InvalidType
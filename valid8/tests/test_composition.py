@@ -2,7 +2,9 @@ import pytest
 
 from valid8.composition import make_validation_func_callables, or_, AllValidatorsFailed, xor_, XorTooManySuccess, and_
 from valid8 import not_, AtLeastOneFailed, not_all, DidNotFail, failure_raiser
+from valid8.base import get_definition
 from valid8.validation_lib import is_even, gt, is_multiple_of
+from valid8.validation_lib.numbers import IsNotEven
 
 
 def test_empty_validators_list():
@@ -71,7 +73,7 @@ def test_validate_or():
         or_([])
 
     # single element simplification
-    # assert or_(is_even) == failure_raiser(is_even)  TODO enable when equality works
+    assert or_(is_even) == failure_raiser(is_even)
 
     # lists
     a=or_(is_even, is_multiple_of(3))
@@ -101,7 +103,7 @@ def test_validate_xor():
         xor_([])
 
     # single element simplification
-    # assert xor_(is_even) == failure_raiser(is_even) TODO enable when equality works
+    assert xor_(is_even) == failure_raiser(is_even)
 
     # lists
     a=xor_(is_even, is_multiple_of(3))
@@ -125,7 +127,7 @@ def test_validate_and():
         and_()
 
     # single element simplification
-    # assert and_([is_even]) == failure_raiser(is_even) TODO enable when equality works
+    assert and_([is_even]) == failure_raiser(is_even)
 
     # nominal
     a=and_(is_even, gt(1))
@@ -150,3 +152,97 @@ def test_validate_and():
     with pytest.raises(AtLeastOneFailed):
         # a is not >= 1
         a(0)
+
+
+def test_composition_failure_lazy_replay():
+    """ Tests that the validators are replayed lazily, only once, and that the replay can be disabled """
+
+    calls = []
+
+    def is_big(x):
+        calls.append(x)
+        return x > 10
+
+    a = and_(is_even, is_big)
+    op, (validators,) = get_definition(a)
+    with pytest.raises(AtLeastOneFailed) as exc_info:
+        a(3)
+    e = exc_info.value
+    # no replay yet
+    assert calls == []
+
+    assert e.successes == []
+    assert list(e.failures.keys()) == list(validators)
+    assert isinstance(e.failures[validators[0]], IsNotEven)
+    assert calls == [3]
+
+    str(e)
+    assert calls == [3]
+    assert str(e) == "At least one validation function failed for value 3. Successes: [] / " \
+                     "Failures: {'is_even': 'IsNotEven: Value should be even.', 'is_big': 'Returned False.'}."
+
+    class NoReplay(AtLeastOneFailed):
+        __replay_validators__ = False
+
+    e = NoReplay(validators, 3, dict())
+    assert str(e) == "At least one validation function failed for value 3. " \
+                     "Successes / Failures details are not available."
+    assert e.successes is None and e.failures is None
+    assert calls == [3]
+
+
+def test_structural_equality():
+    """ Tests that the validation callables created by valid8 compare and hash by definition """
+    from valid8.validation_lib import lt, between, is_in, on_all_, instance_of
+
+    def is_small(x):
+        return x < 10
+
+    assert gt(0) == gt(0)
+    assert hash(gt(0)) == hash(gt(0))
+    assert gt(0) != gt(1)
+    assert gt(0) != gt(0, strict=True)
+    assert gt(0) != lt(0)
+    assert between(0, 1) == between(0, 1)
+    assert instance_of(int) == instance_of(int)
+    assert instance_of(int) != instance_of(bool)
+    assert is_multiple_of(3) == is_multiple_of(3)
+
+    # composition
+    assert and_(is_even, gt(1)) == and_(is_even, gt(1))
+    assert and_(is_even, gt(1)) != and_(gt(1), is_even)
+    assert or_(is_small, gt(1)) == or_(is_small, gt(1))
+    assert not_(gt(1)) == not_(gt(1))
+    assert not_(gt(1)) != not_(gt(1), catch_all=True)
+    assert on_all_(gt(0), is_even) == on_all_(gt(0), is_even)
+    assert len({and_(is_even, gt(1)), and_(is_even, gt(1)), or_(is_even, gt(1))}) == 2
+
+    # failure raisers
+    assert failure_raiser(is_small, help_msg='too big') == failure_raiser(is_small, help_msg='too big')
+    assert failure_raiser(is_small, help_msg='too big') != failure_raiser(is_small, help_msg='big')
+    assert failure_raiser(is_small) != failure_raiser(lambda x: x < 10)
+
+    # mutable definition elements: equality compares their content, and the hash does not change when they are modified
+    assert is_in([1, 2]) == is_in([1, 2])
+    assert is_in([1, 2]) != is_in([1, 3])
+    assert hash(is_in([1, 2])) == hash(is_in([1, 2]))
+    allowed = [1, 2]
+    f = is_in(allowed)
+    s = {f}
+    h = hash(f)
+    allowed.append(3)
+    assert hash(f) == h
+    assert f in s
+    assert is_in(allowed) in s
+
+    # structurally equal members are all reported in composition failures
+    from valid8 import Validator, ValidationError
+    with pytest.raises(ValidationError) as exc_info:
+        Validator(or_(gt(5), gt(5), gt(5))).assert_valid('x', 1)
+    failure = exc_info.value.failure
+    assert len(failure.failures) == 3
+    assert [k is v for k, v in zip(failure.failures, failure.validators)] == [True] * 3
+    assert failure.failures[failure.validators[1]] is not failure.failures[failure.validators[0]]
+    assert str(exc_info.value).endswith("Failures: {'greater_than_5': 'TooSmall: x >= 5 does not hold for x=1.', "
+                                        "'greater_than_5_': 'TooSmall: x >= 5 does not hold for x=1.', "
+                                        "'greater_than_5__': 'TooSmall: x >= 5 does not hold for x=1.'}.")
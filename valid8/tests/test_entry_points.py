@@ -1,4 +1,8 @@
-from valid8 import ValidationError
+import sys
+
+import pytest
+
+from valid8 import ValidationError, Validator, NonePolicy
 
 
 def test_validate_create_manually():
@@ -12,3 +16,384 @@ def test_validate_create_manually():
                                              var_value=foo)
     assert str(e) == "Something is not valid in 1. " \
                      "Error validating [foo=1] with function [custom_validation_function] (no failure details available)"
+
+
+def test_assert_valid_is_valid_cache():
+    """ Tests that `assert_valid` and `is_valid` reuse cached validators for identical definitions """
+    import pytest
+    from valid8 import assert_valid, is_valid
+    from valid8.entry_points import validators_cache, clear_validators_cache
+    from valid8.validation_lib import gt, lt, is_in
+
+    clear_validators_cache()
+
+    def is_small(x):
+        return x < 10
+
+    for i in range(5):
+        assert is_valid(i, gt(1), is_small) == (i >= 1)
+        assert_valid('x', 3, [gt(0), (lt(5), 'should be < 5')], help_msg='hey')
+    info = validators_cache.cache_info()
+    # the definition containing `is_small` is only cached the second time it is seen
+    assert (info.hits, info.misses, info.evictions, info.currsize) == (7, 3, 0, 2)
+
+    # errors are the same
+    with pytest.raises(ValidationError) as exc_info:
+        assert_valid('x', 7, [gt(0), (lt(5), 'should be < 5')], help_msg='hey')
+    assert str(exc_info.value) == "hey. Error validating [x=7]. At least one validation function failed for value 7. " \
+                                  "Successes: ['greater_than_0'] / Failures: {'lesser_than_5': 'InvalidValue: " \
+                                  "should be < 5. TooBig: x <= 5 does not hold for x=7.'}."
+
+    # unhashable definitions bypass the cache
+    class Unhashable(object):
+        __hash__ = None
+
+    assert is_valid(1, is_in((Unhashable(), 1)))
+    assert validators_cache.cache_info().currsize == 2
+
+    # eviction
+    validators_cache.maxsize = 2
+    assert is_valid(1, lt(2))
+    assert validators_cache.cache_info().evictions == 1
+    validators_cache.maxsize = 256
+
+    # mutable arguments are keyed by identity: modifying them does not impact other definitions
+    allowed = [1, 2]
+    for _ in range(2):
+        assert not is_valid(3, is_in(allowed))
+    allowed.append(3)
+    assert is_valid(3, is_in(allowed))
+    assert not is_valid(3, is_in([1, 2]))
+
+    # clearing the cache also forgets the definitions seen once
+    clear_validators_cache()
+    assert is_valid(1, gt(1), is_small)
+    assert validators_cache.cache_info().currsize == 0
+    assert is_valid(1, gt(1), is_small)
+    assert validators_cache.cache_info().currsize == 1
+
+    # lambdas created at each call are not kept alive
+    clear_validators_cache()
+    for i in range(5):
+        assert is_valid(i, lambda x: x >= 0)
+    assert validators_cache.cache_info().currsize == 0
+
+    # cached validators raise the same errors than non-cached ones, for example for numpy arrays
+    try:
+        import numpy as np
+    except ImportError:
+        pass
+    else:
+        for _ in range(2):
+            with pytest.raises(ValidationError) as exc_info:
+                assert_valid('x', np.array([1, 2]), gt(0))
+            assert isinstance(exc_info.value.__cause__.__cause__, ValueError)
+            assert not is_valid(np.array([1, 2]), gt(0))
+
+    clear_validators_cache()
+    assert validators_cache.cache_info() == (0, 0, 0, 256, 0)
+
+
+def test_validator_chains_interning():
+    """ Tests that validators with identical definitions share the same validation chain """
+    import gc
+    import pytest
+    from valid8 import validate_arg, InputValidationError
+    from valid8.entry_points import validator_chains
+    from valid8.validation_lib import instance_of, minlen, is_in
+
+    validator_chains.clear()
+
+    def create_foo():
+        @validate_arg('a', instance_of(str), (minlen(1), 'a should not be empty'))
+        def foo(a):
+            return a
+        return foo
+
+    foos = [create_foo() for _ in range(5)]
+    validators = [f.__wrapped__.__validators__['a'][0] for f in foos]
+    assert all(v.main_function is validators[0].main_function for v in validators)
+    assert all(v.validation_funcs is validators[0].validation_funcs for v in validators)
+    info = validator_chains.cache_info()
+    assert (info.hits, info.misses, info.currsize) == (4, 1, 1)
+    assert info.bytes_saved > 0
+
+    # per-validator information is not shared
+    foos[2]('hello')
+    with pytest.raises(InputValidationError) as exc_info:
+        foos[3]('')
+    assert exc_info.value.validator is validators[3]
+    assert "a should not be empty" in str(exc_info.value)
+
+    # a different definition, none policy or compile flag does not share the chain
+    v1 = Validator(instance_of(str), minlen(1))
+    v2 = Validator(instance_of(str), minlen(1), none_policy=NonePolicy.SKIP)
+    v3 = Validator(instance_of(str), minlen(1), compile=True)
+    v4 = Validator(instance_of(str), minlen(2))
+    assert len({id(v.main_function) for v in (v1, v2, v3, v4)}) == 4
+
+    # mutable arguments are keyed by identity: modifying them does not impact the other validators
+    allowed = [1, 2]
+    v5 = Validator(is_in(allowed))
+    v6 = Validator(is_in([1, 2]))
+    assert v5.main_function is not v6.main_function
+    assert Validator(is_in(allowed)).main_function is v5.main_function
+    allowed.append(3)
+    assert v5.is_valid(3) and not v6.is_valid(3)
+
+    # entries disappear when the validators are garbage collected
+    del foos, validators, exc_info, v1, v2, v3, v4, v5, v6
+    gc.collect()
+    assert validator_chains.cache_info().currsize == 0
+
+    # disabled
+    validator_chains.enabled = False
+    try:
+        assert Validator(minlen(1)).main_function is not Validator(minlen(1)).main_function
+    finally:
+        validator_chains.enabled = True
+
+
+@pytest.mark.skipif(sys.version_info < (3, 5), reason="async/await not supported before python 3.5")
+def test_async_validator(monkeypatch):
+    """ Tests `Validator.aassert_valid` and `Validator.ais_valid` with validation functions returning awaitables """
+
+    from ._test_async import test_async_validator
+    test_async_validator(monkeypatch)
+
+
+@pytest.mark.skipif(sys.version_info < (3, 5), reason="async/await not supported before python 3.5")
+def test_async_concurrency_option(monkeypatch):
+    """ Tests that the concurrency of asynchronous validation can be set per call and per decorator """
+
+    from ._test_async import test_async_concurrency_option
+    test_async_concurrency_option(monkeypatch)
+
+
+@pytest.mark.parametrize('compile_', [False, True], ids="compile={}".format)
+def test_validate_many(compile_):
+    """ Tests `Validator.validate_many` in its three modes """
+    from valid8.validation_lib import gt, TooSmall
+
+    v = Validator(gt(0), none_policy=NonePolicy.SKIP, compile=compile_, help_msg="{foo} should be positive", foo='x')
+    values = [1, -1, None, 2, -3]
+
+    assert v.validate_many(values) == [v.is_valid(x) for x in values] == [True, False, True, True, False]
+
+    e = v.validate_many(values, mode='first_error', name='xs', foo='y')
+    assert isinstance(e, ValidationError)
+    with pytest.raises(ValidationError) as exc_info:
+        v.assert_valid('xs[1]', -1, foo='y')
+    assert str(e) == str(exc_info.value)
+    assert v.validate_many([1, 2], mode='first_error') is None
+
+    errors = v.validate_many(iter(values), mode='all_errors')
+    assert [i for i, f in errors] == [1, 4]
+    assert all(isinstance(f, TooSmall) for i, f in errors)
+
+    with pytest.raises(ValueError):
+        v.validate_many(values, mode='foo')
+
+    # numpy arrays of numbers are validated at once when possible, with the same results
+    try:
+        import numpy as np
+    except ImportError:
+        pass
+    else:
+        from valid8.validation_lib import between, is_in
+        for v in (Validator(gt(0), (between(-2, 5), 'small'), compile=compile_),
+                  Validator(is_in((1, 2)), compile=compile_),
+                  Validator(gt(0), lambda x: x != 3, compile=compile_)):
+            arr = np.array([1., 2., -1., float('nan'), 3., 10.])
+            assert v.validate_many(arr) == [v.is_valid(x) for x in arr]
+        assert Validator(gt(0))._get_vectorized_mask(np.array([1, -1])) is not None
+        assert Validator(gt(0), lambda x: x != 3)._get_vectorized_mask(np.array([1, -1])) is None
+
+
+def test_bounded_value_display():
+    """ Tests that huge values are not rendered in error messages, and that others are displayed as before """
+    from valid8 import assert_valid
+    from valid8.validation_lib import maxlen, lt
+    from valid8.utils.string_tools import bounded_repr, bounded_str
+
+    for obj in (b'ab', 'ab', -12, 1.5, (1,), [1, 'a', (2, 3.5)], {'a': {1, 2}}, frozenset(), [[b'x'] * 20], 10 ** 99):
+        for max_length in (0, 2, 10, 100):
+            assert bounded_repr(obj, max_length) == (repr(obj) if len(repr(obj)) <= max_length else None)
+            assert bounded_str(obj, max_length) == (str(obj) if len(str(obj)) <= max_length else None)
+
+    with pytest.raises(ValidationError) as exc_info:
+        assert_valid('payload', b'x' * 10 ** 7, maxlen(10), help_msg="{payload} is too long", payload=b'x' * 10 ** 7)
+    assert str(exc_info.value) == "(too big for display) is too long. Error validating [payload]. " \
+                                  "TooLong: len(x) <= 10 does not hold for x=(too big for display). " \
+                                  "Wrong value: (Actual value is too big to be printed in this message)."
+
+    # attributes and items of values too big for display are not rendered either
+    with pytest.raises(ValidationError) as exc_info:
+        assert_valid('payload', b'x' * 10 ** 7, maxlen(10), help_msg="{payload[0]} and {payload.hex!r:>3} are wrong",
+                     payload=b'x' * 10 ** 7)
+    assert str(exc_info.value).startswith("(too big for display) and (too big for display) are wrong. ")
+
+    # this number can not even be converted to string on recent python versions
+    with pytest.raises(ValidationError) as exc_info:
+        assert_valid('n', 10 ** 5000, lt(0))
+    assert str(exc_info.value).startswith("Error validating [n]")
+
+
+def test_help_msg_templates():
+    """ Tests that help message templates are parsed once, and that missing variables are detected early """
+    from valid8 import ValidationFailure, failure_raiser
+    from valid8.base import HelpMsgFormattingException, help_msg_templates, get_help_msg_placeholders
+    from valid8.validation_lib import is_even
+
+    assert get_help_msg_placeholders("{a} {{b}} {c.d} {e[0]!r} {f:{g}}") == {'a', 'c', 'e', 'f', 'g'}
+
+    help_msg_templates.clear()
+    f = failure_raiser(is_even, help_msg="{wrong_value!r} is odd, {validation_func} {foo:>4}", foo='x')
+    for i in range(3):
+        with pytest.raises(ValidationFailure) as exc_info:
+            f(1)
+        assert str(exc_info.value) == "1 is odd, is_even    x. " \
+                                      "Function [is_even] raised IsNotEven: Value should be even. Wrong value: 1."
+        if i == 0:
+            misses = help_msg_templates.cache_info().misses
+    # the templates were only parsed once
+    assert help_msg_templates.cache_info().misses == misses
+
+    # missing variables are detected when the failure raiser is created
+    with pytest.raises(HelpMsgFormattingException):
+        failure_raiser(is_even, help_msg="{foo} is odd")
+    failure_raiser(is_even, help_msg="{wrong_value} is odd: {validation_outcome}, {help_msg} {foo}", foo=1)
+
+    class ExtraContextFailure(ValidationFailure):
+        def get_context_for_help_msgs(self):
+            return dict(self.__dict__, extra=1)
+
+    # the context of failure types overriding the context is not known in advance
+    failure_raiser(is_even, help_msg="{extra} is odd", failure_type=ExtraContextFailure)
+
+    if sys.version_info >= (3, 6):
+        # invalid templates are detected when the class is defined
+        with pytest.raises(ValueError):
+            class WrongFailure(ValidationFailure):
+                help_msg = "{wrong_value is wrong"
+
+
+@pytest.mark.parametrize('policy', ['SUMMARY', 'WEAKREF', 'DROP'])
+def test_retention_policy(monkeypatch, policy):
+    """ Tests that failures and errors do not retain the values when a retention policy is set """
+    import gc
+    import weakref
+    from valid8 import ValidationFailure, RetentionPolicy, failure_raiser
+    from valid8.base import ValueSummary, WeakValue, NOT_RETAINED
+    from valid8.validation_lib import maxlen, is_even
+
+    policy = getattr(RetentionPolicy, policy)
+    monkeypatch.setattr(ValidationFailure, '__retention_policy__', policy)
+    monkeypatch.setattr(ValidationError, '__retention_policy__', policy)
+    monkeypatch.setattr(ValidationError, '__clear_tracebacks__', True)
+
+    class Row(list):
+        pass
+
+    v = Validator(maxlen(2), (is_even, 'should be even'))
+    row = Row([1, 2, 3])
+    with pytest.raises(ValidationError) as exc_info:
+        v.assert_valid('row', row)
+    e = exc_info.value
+    failure = e.failure
+    msg = str(e)
+    assert e.__traceback__ is None and failure.__traceback__ is None
+
+    ref = weakref.ref(row)
+    del row, exc_info
+    gc.collect()
+    assert ref() is None
+    if policy == RetentionPolicy.DROP:
+        assert e.var_value is NOT_RETAINED
+        assert msg.startswith("Error validating [row=(value not retained)]. At least one validation function failed "
+                              "for value (value not retained).")
+    else:
+        assert isinstance(e.var_value, WeakValue if policy == RetentionPolicy.WEAKREF else ValueSummary)
+        if policy == RetentionPolicy.SUMMARY:
+            # the message is unchanged
+            assert msg.startswith("Error validating [row=[1, 2, 3]]. At least one validation function failed for "
+                                  "value [1, 2, 3]. Successes: [] / Failures: {'length_lesser_than_2': "
+                                  "'TooLong: len(x) <= 2 does not hold for x=[1, 2, 3].'")
+        else:
+            assert e.var_value.get() is None
+
+    # format specs written for the original value are ignored when they do not apply to its replacement
+    with pytest.raises(ValidationFailure) as exc_info:
+        failure_raiser(is_even, help_msg="value {wrong_value:.2f} is wrong, {wrong_value:>4}")(1.5)
+    replacement = '(value not retained)' if policy == RetentionPolicy.DROP else '1.5'
+    assert str(exc_info.value).startswith("value %s is wrong, %4s. " % (replacement, replacement))
+    row = Row([1])
+    assert '{0:.2f}'.format(WeakValue(row)) == '[1]'
+
+
+class MyError(ValidationError):
+    help_msg = "{var_name} should be positive, found {foo}"
+
+
+def test_pickle_validation_errors():
+    """ Tests that validation errors with dynamically created types can be pickled, and that these types are unique """
+    import pickle
+    from valid8.entry_points import add_base_type_dynamically, dynamic_error_types
+    from valid8.validation_lib import TooSmall
+
+    failure = TooSmall(wrong_value=-1, min_value=0, strict=False)
+    e = MyError.create_with_dynamic_type(validator=None, name='x', value=-1, validation_outcome=failure,
+                                         help_msg=None, foo=1)
+    assert type(e) is dynamic_error_types[(MyError, ValueError)]
+    assert type(e) is add_base_type_dynamically(MyError, ValueError)
+
+    e2 = pickle.loads(pickle.dumps(e))
+    assert type(e2) is type(e)
+    assert isinstance(e2, ValueError)
+    assert str(e2) == str(e) == "x should be positive, found 1. Error validating [x=-1]. " \
+                                "TooSmall: x >= 0 does not hold for x=-1. Wrong value: -1."
+    assert isinstance(e2.failure, TooSmall) and e2.failure.min_value == 0
+    assert e2.__cause__ is e2.failure
+
+    # no more limit in the number of dynamic types
+    types = [type('Error%s' % i, (ValidationError,), {}) for i in range(40)]
+    created = [add_base_type_dynamically(t, TypeError) for t in types]
+    assert [add_base_type_dynamically(t, TypeError) for t in types] == created
+
+
+def is_small(x):
+    return x < 10
+
+
+@pytest.mark.parametrize("compile", [False, True], ids="compile={}".format)
+def test_pickle_validators(compile):
+    """ Tests that validators can be pickled, and that the unpickled validator shares the same validation chain """
+    import pickle
+    from valid8 import and_, or_, not_, failure_raiser
+    from valid8.validation_lib import gt, between, is_in, instance_of, on_all_, on_each_, minlen, TooSmall
+
+    funcs = [instance_of(int), gt(0), is_small, or_(is_in({1, 2}), not_(between(3, 4))),
+             failure_raiser(gt(1), help_msg="should be > {min_value}", min_value=1),
+             on_all_(gt(0)), on_each_(minlen(1))]
+    for f in funcs:
+        assert pickle.loads(pickle.dumps(f)) == f
+
+    v = Validator(instance_of(int), and_(gt(0), is_small), (gt(1), TooSmall), none_policy=NonePolicy.SKIP,
+                  compile=compile, help_msg="x should be small", foo=1)
+    v2 = pickle.loads(pickle.dumps(v))
+    assert v2._chain is v._chain
+    assert v2.main_function is v.main_function
+    assert v2.kw_context_args == {'foo': 1}
+    assert v2.is_valid(None) and v2.is_valid(5) and not v2.is_valid(11)
+
+    with pytest.raises(ValidationError) as exc_info:
+        v2.assert_valid('x', 0)
+    e = exc_info.value
+    assert e.validator is v2
+    e2 = pickle.loads(pickle.dumps(e))
+    assert str(e2) == str(e)
+    assert e2.validator.is_valid(5)
+
+    # lambdas can not be pickled
+    with pytest.raises(Exception):
+        pickle.dumps(Validator(lambda x: x > 0))
@@ -4,7 +4,7 @@ import pytest
 
 from valid8 import validate_io, InputValidationError, decorate_with_validation, ValidationFailure, \
     validate_arg, NonePolicy, validate_out, OutputValidationError, ValidationError, validate_field, \
-    ClassFieldValidationError
+    ClassFieldValidationError, get_validation_sampler, enable_validation
 from valid8.validation_lib import is_even, gt, lt
 
 
@@ -450,3 +450,358 @@ def test_validate_tracebacks():
 
     e = exc_info.value
     assert e.__cause__ is not None
+
+
+@pytest.mark.skipif(sys.version_info < (3, 0), reason="keyword-only arguments are not supported in python 2")
+def test_validate_arg_kinds():
+    """ Tests that validated inputs are found whatever the way they are received """
+
+    from ._test_pep484 import create_for_test_validate_arg_kinds
+    myfunc = create_for_test_validate_arg_kinds()
+    myfunc = validate_io(a=is_even, b=is_even, c=is_even, d=is_even)(myfunc)
+    assert myfunc.__wrapped__.__validation_plan__ is None
+
+    assert myfunc(0, 2, 1, c=6) == (0, 2, (1, ), 6, 4, {})
+    inputs_plan, output_check = myfunc.__wrapped__.__validation_plan__
+    assert [p[0:2] for p in inputs_plan] == [('a', 0), ('b', 1), ('c', 3), ('d', 4)]
+    assert output_check is None
+    assert myfunc(a=0, c=6, e=1) == (0, 2, (), 6, 4, {'e': 1})
+    for args, kwargs in [((1, 2), dict(c=0)), ((0, 3), dict(c=0)), ((0, ), dict(c=1)), ((0,), dict(c=0, d=1)),
+                         ((), dict(a=1, c=0))]:
+        with pytest.raises(InputValidationError):
+            myfunc(*args, **kwargs)
+
+    # adding a validator on the var-keyword argument: it receives the dictionary of extra keyword arguments
+    myfunc = validate_arg('kwargs', lambda kw: len(kw) == 0)(myfunc)
+    assert myfunc.__wrapped__.__validation_plan__ is None
+    assert myfunc(0, c=0) == (0, 2, (), 0, 4, {})
+    inputs_plan, _ = myfunc.__wrapped__.__validation_plan__
+    assert [p[0:2] for p in inputs_plan] == [('a', 0), ('b', 1), ('c', 3), ('d', 4), ('kwargs', 5)]
+    with pytest.raises(InputValidationError):
+        myfunc(0, c=0, e=1)
+    with pytest.raises(InputValidationError):
+        myfunc(0, c=1)
+
+
+def test_validate_arg_names_shadowing_builtins():
+    """ Tests that the parameter names of the decorated function do not shadow the names used by the wrapper """
+
+    @validate_arg('dict', is_even)
+    def myfunc(dict, _impl_, _dict_=0, **kwargs):
+        return dict, _impl_, _dict_, kwargs
+
+    assert myfunc(0, 1, e=2) == (0, 1, 0, {'e': 2})
+    assert myfunc(dict=2, _impl_=1, _dict_=3) == (2, 1, 3, {})
+    with pytest.raises(InputValidationError):
+        myfunc(1, 1)
+
+
+@pytest.mark.skipif(sys.version_info < (3, 8), reason="positional-only arguments are not supported before python 3.8")
+def test_validate_arg_kinds_positional_only():
+    """ Tests that the validating wrapper has the exact signature of the function, for all kinds of parameters """
+
+    from ._test_py38 import test_validate_arg_kinds_positional_only
+    test_validate_arg_kinds_positional_only()
+
+
+def test_validate_defaults_at_decoration_time():
+    """ Tests that default values are validated once when decorating, and not on each call """
+
+    checked = []
+
+    def is_small(x):
+        checked.append(x)
+        return x < 10
+
+    @validate_arg('b', is_small)
+    @validate_arg('a', is_small)
+    def myfunc(a, b=1, c=None):
+        return a, b
+
+    assert checked == [1]
+    del checked[:]
+
+    assert myfunc(2) == (2, 1)
+    assert myfunc(3, 1) == (3, 1)
+    assert checked == [2, 3]
+    with pytest.raises(InputValidationError):
+        myfunc(1, 11)
+
+    # invalid default values raise an error when decorating
+    def myfunc(a, b=1):
+        return a, b
+
+    with pytest.raises(InputValidationError):
+        validate_arg('b', gt(2))(myfunc)
+
+    with pytest.raises(InputValidationError):
+        validate_arg('b', gt(2))(validate_arg('a', gt(2))(myfunc))
+
+    # mutable default values are validated on each call, since they may have been modified
+    del checked[:]
+
+    @validate_arg('b', lambda l: is_small(len(l)))
+    def myfunc(b=[]):
+        b.append(1)
+        return b
+
+    assert checked == [0]
+    myfunc()
+    myfunc()
+    assert checked == [0, 0, 1]
+
+
+def test_stacked_validators_merged():
+    """ Tests that stacked validators on the same argument or output are merged, with the right error attribution """
+
+    @validate_arg('a', lt(10), help_msg='layer 3')
+    @validate_arg('a', is_even, help_msg='layer 2', none_policy=NonePolicy.SKIP)
+    @validate_arg('a', gt(1), help_msg='layer 1', none_policy=NonePolicy.SKIP)
+    @validate_out(is_even, help_msg='out 1')
+    @validate_out(gt(1), help_msg='out 2')
+    def myfunc(a, r=2):
+        return r
+
+    validators = myfunc.__wrapped__.__validators__
+    assert myfunc(4) == 2
+
+    # first failure is raised, attributed to the right validator
+    for value, expected_layer in [(0, 0), (3, 1), (12, 2), (None, 2)]:
+        with pytest.raises(InputValidationError) as exc_info:
+            myfunc(value)
+        assert exc_info.value.validator is validators['a'][expected_layer]
+        assert str(exc_info.value).startswith('layer %s' % (expected_layer + 1))
+
+    for r, expected_out, expected_msg in [(0, 0, 'out 2'), (3, 1, 'out 1')]:
+        with pytest.raises(OutputValidationError) as exc_info:
+            myfunc(4, r)
+        assert exc_info.value.validator is validators['_out_'][expected_out]
+        assert str(exc_info.value).startswith(expected_msg)
+
+
+def test_validation_sampling(monkeypatch):
+    """ Tests the `sampling` option of the decorators and the global default """
+
+    @validate_arg('a', gt(0), sampling=3)
+    @validate_out(is_even)
+    def myfunc(a):
+        return a
+
+    sampler = get_validation_sampler(myfunc)
+    assert sampler.sampling == 3
+
+    # calls 1, 4, 7... are validated
+    with pytest.raises(InputValidationError):
+        myfunc(-1)
+    assert myfunc(-1) == -1
+    assert myfunc(1) == 1
+    with pytest.raises(OutputValidationError):
+        myfunc(1)
+    assert (sampler.validated, sampler.skipped) == (2, 2)
+
+    # conflicting sampling on the same function
+    with pytest.raises(ValueError):
+        validate_arg('a', lt(10), sampling=2)(myfunc)
+
+    # probability
+    @validate_io(a=gt(0), _sampling_=0.)
+    def never(a):
+        return a
+
+    assert never(-1) == -1
+    assert (get_validation_sampler(never).validated, get_validation_sampler(never).skipped) == (0, 1)
+
+    # validate_io does not confuse the sampling option with an argument named 'sampling'
+    @validate_io(sampling=gt(0))
+    def g(sampling):
+        return sampling
+
+    with pytest.raises(InputValidationError):
+        g(-1)
+    assert get_validation_sampler(g) is None
+
+    # invalid configurations
+    for wrong_sampling, error_type in [(0, ValueError), (1.5, ValueError), ('1', TypeError), (True, TypeError)]:
+        with pytest.raises(error_type):
+            @validate_arg('a', gt(0), sampling=wrong_sampling)
+            def foo(a):
+                pass
+
+    # global default, read at decoration time
+    import valid8.entry_points_annotations as epa
+    assert get_validation_sampler(validate_arg('a', gt(0))(lambda a: a)) is None
+    monkeypatch.setattr(epa, 'default_sampling', 2)
+
+    @validate_field('a', gt(0))
+    class Foo(object):
+        def __init__(self, a):
+            self.a = a
+
+    with pytest.raises(ClassFieldValidationError):
+        Foo(-1)
+    assert Foo(-1).a == -1
+    assert get_validation_sampler(Foo.__init__).sampling == 2
+
+
+def test_validate_io_reserved_names():
+    """ Tests that the options of validate_io do not clash with the arguments named 'sampling' or 'concurrency' """
+
+    @validate_io(sampling=gt(0), concurrency=gt(0))
+    def g(sampling, concurrency):
+        return sampling, concurrency
+
+    assert g(1, 1) == (1, 1)
+    with pytest.raises(InputValidationError):
+        g(-1, 1)
+    with pytest.raises(InputValidationError):
+        g(1, -1)
+    assert get_validation_sampler(g) is None
+
+
+def test_validation_sampling_threads():
+    """ Tests that the sampling rate is respected when the decorated function is called from several threads """
+    from threading import Thread
+
+    checked = []
+
+    def check(a):
+        checked.append(a)
+        return True
+
+    @validate_arg('a', check, sampling=4)
+    def myfunc(a):
+        return a
+
+    def call_many():
+        for i in range(1000):
+            myfunc(i)
+
+    threads = [Thread(target=call_many) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    sampler = get_validation_sampler(myfunc)
+    assert (sampler.validated, sampler.skipped) == (2000, 6000)
+    assert len(checked) == 2000
+
+
+def test_validation_disabled(monkeypatch):
+    """ Tests that decorators leave functions and classes untouched when validation is disabled """
+    import valid8.entry_points_annotations as epa
+    monkeypatch.setattr(epa, 'validation_disabled', True)
+
+    def myfunc(a, b):
+        return a
+
+    @validate_field('a', gt(0))
+    class Foo(object):
+        def __init__(self, a):
+            self.a = a
+
+    init = Foo.__init__
+    assert validate_io(a=gt(0), _out_=lt(10))(validate_arg('b', is_even)(myfunc)) is myfunc
+    assert myfunc(-1, 1) == -1
+    assert Foo(-1).a == -1
+    assert Foo.__init__ is init
+    assert [v.name for v in epa.disabled_validations[myfunc]] == ['b', '_out_', 'a']
+
+    # the validations can still be applied
+    validated_func = enable_validation(myfunc)
+    assert myfunc not in epa.disabled_validations
+    assert validated_func(2, 2) == 2
+    for a, b, error_type in [(-1, 2, InputValidationError), (2, 1, InputValidationError),
+                             (12, 2, OutputValidationError)]:
+        with pytest.raises(error_type):
+            validated_func(a, b)
+
+    assert enable_validation(Foo) is Foo
+    with pytest.raises(ClassFieldValidationError):
+        Foo(-1)
+
+    # validation remains enabled in the listed modules
+    monkeypatch.setattr(epa, 'enabled_modules', (myfunc.__module__.split('.')[0], ))
+
+    @validate_arg('a', gt(0))
+    def otherfunc(a):
+        return a
+
+    with pytest.raises(InputValidationError):
+        otherfunc(-1)
+
+
+@pytest.mark.skipif(sys.version_info < (3, 5), reason="async/await not supported before python 3.5")
+def test_validate_coroutine_function():
+    """ Tests that decorated coroutine functions validate their inputs and awaited output asynchronously """
+
+    from ._test_async import test_async_decorators
+    test_async_decorators()
+
+
+def test_validate_generator_output():
+    """ Tests that the output of a generator function is validated item by item, lazily """
+
+    @validate_arg('n', gt(0))
+    @validate_out(is_even, lt(6, strict=True), help_msg='item {item_index} is invalid')
+    def evens(n):
+        for i in range(n):
+            yield 2 * i
+
+    # inputs are validated when the function is called
+    with pytest.raises(InputValidationError):
+        evens(-1)
+
+    assert list(evens(3)) == [0, 2, 4]
+
+    received = []
+    with pytest.raises(OutputValidationError) as exc_info:
+        for i in evens(10):
+            received.append(i)
+    assert received == [0, 2, 4]
+    assert exc_info.value.item_index == 3
+    assert str(exc_info.value).startswith("item 3 is invalid. Error validating item #3 of the output of function "
+                                          "[evens].")
+
+
+@pytest.mark.skipif(sys.version_info < (3, 6), reason="async generators not supported before python 3.6")
+def test_validate_async_generator_output():
+    """ Tests that the output of an asynchronous generator function is validated item by item, lazily """
+
+    from ._test_async_gen import test_async_generator
+    test_async_generator()
+
+
+@validate_arg('x', is_even)
+@validate_out(lt(10))
+def double_even(x):
+    return 2 * x
+
+
+class Doubler(object):
+    @validate_arg('x', is_even)
+    def double(self, x):
+        return 2 * x
+
+
+def test_pickle_decorator_errors():
+    """ Tests that the errors raised by decorated functions can be pickled, even when the function is not importable """
+    import pickle
+
+    def local_double(x):
+        return 2 * x
+    local_double = validate_arg('x', is_even)(local_double)
+
+    for f, arg in ((double_even, 1), (double_even, 6), (Doubler().double, 1), (local_double, 1)):
+        with pytest.raises(ValidationError) as exc_info:
+            f(arg)
+        e = exc_info.value
+        e2 = pickle.loads(pickle.dumps(e))
+        assert type(e2) is type(e)
+        assert str(e2) == str(e)
+        assert e2.validator.get_validated_func_display_name() == e.validator.get_validated_func_display_name()
+
+    # importable functions are unpickled as the decorated function
+    with pytest.raises(InputValidationError) as exc_info:
+        double_even(1)
+    assert pickle.loads(pickle.dumps(exc_info.value)).validator.validated_func is double_even
@@ -0,0 +1,85 @@
+import pickle
+
+import pytest
+
+from valid8 import from_spec, InvalidSpecError, Validator, ValidationError, NonePolicy, and_, or_, not_, \
+    failure_raiser
+from valid8.spec import make_spec_callable, specs_cache, spec_types
+from valid8.validation_lib import instance_of, gt, between, is_in, minlen, contains, on_all_, on_each_, non_empty, \
+    is_even
+
+
+def test_spec_callables():
+    """ Tests that specs create the same callables as the equivalent python definition """
+    assert make_spec_callable({"gt": 0}) == gt(0)
+    assert make_spec_callable({"gt": {"min_value": 0, "strict": True}}) == gt(0, strict=True)
+    assert make_spec_callable({"between": [0, 10]}) == between(0, 10)
+    assert make_spec_callable({"instance_of": ["int", "float"]}) == instance_of({int, float})
+    assert make_spec_callable({"instance_of": "int", "is_even": True}) == and_(instance_of(int), is_even)
+    assert make_spec_callable(["non_empty", {"is_in": [1, 2]}]) == and_(non_empty, is_in({1, 2}))
+    assert make_spec_callable({"or": [{"minlen": 3}, {"contains": 2}], "not": "is_even"}) \
+        == and_(or_(minlen(3), contains(2)), not_(is_even))
+    assert make_spec_callable({"on_all": {"gt": 0}, "on_each": [{"gt": 1}, {"gt": 2}]}) \
+        == and_(on_all_(gt(0)), on_each_(gt(1), gt(2)))
+    assert make_spec_callable({"gt": 0, "help_msg": "should be positive"}) \
+        == failure_raiser(gt(0), help_msg="should be positive")
+
+
+@pytest.mark.parametrize("invalid_spec, path", [({"foo": 1}, "spec.foo"),
+                                                ({"gt": {"foo": 1}}, "spec.gt"),
+                                                ({"is_even": 1}, "spec.is_even"),
+                                                ({"instance_of": "Foo"}, "spec.instance_of"),
+                                                ({"on_each": [{"gt": 0}, {"foo": 1}]}, "spec.on_each[1].foo"),
+                                                ({"not": ["is_even", {"gt": 0}]}, "spec.not"),
+                                                ({"help_msg": "foo"}, "spec"),
+                                                ({"gt": 0, "help_msg": "{foo}"}, "spec.help_msg"),
+                                                ([], "spec"),
+                                                (1, "spec"),
+                                                ('{"gt": ', "spec")])
+def test_invalid_spec(invalid_spec, path):
+    """ Tests that invalid specs raise an InvalidSpecError with the path of the faulty entry """
+    with pytest.raises(InvalidSpecError) as exc_info:
+        from_spec(invalid_spec)
+    assert exc_info.value.path == path
+    assert isinstance(exc_info.value, ValueError)
+
+
+@pytest.mark.parametrize("compile", [False, True], ids="compile={}".format)
+def test_from_spec(compile):
+    """ Tests that from_spec creates a validator that behaves as the equivalent one, and caches it """
+    specs_cache.clear()
+    spec = '{"instance_of": ["int", "float"], "between": {"min_val": 0, "max_val": 10, "open_right": true}}'
+    v = from_spec(spec, compile=compile, help_msg="{var} should be small", var='x')
+    ref = Validator(and_(instance_of({int, float}), between(0, 10, open_right=True)), compile=compile,
+                    help_msg="{var} should be small", var='x')
+    assert v.validation_funcs == ref.validation_funcs
+
+    assert v.is_valid(0) and v.is_valid(9.5)
+    assert not v.is_valid(10) and not v.is_valid('a') and not v.is_valid(None)
+    with pytest.raises(ValidationError) as exc_info:
+        v.assert_valid('a', 10)
+    assert str(exc_info.value).startswith("x should be small. Error validating [a=10].")
+
+    # cache
+    assert from_spec(spec, compile=compile, help_msg="{var} should be small", var='x') is v
+    assert from_spec(spec, compile=compile, none_policy=NonePolicy.SKIP) is not v
+    assert specs_cache.cache_info()[0:2] == (1, 2)
+
+    # pickle
+    v2 = pickle.loads(pickle.dumps(v))
+    assert v2.is_valid(5) and not v2.is_valid(10)
+
+
+def test_spec_types():
+    """ Tests that custom types can be registered """
+    class Foo(object):
+        pass
+
+    with pytest.raises(InvalidSpecError):
+        make_spec_callable({"instance_of": "Foo"})
+
+    spec_types['Foo'] = Foo
+    try:
+        assert make_spec_callable({"instance_of": "Foo"})(Foo())
+    finally:
+        del spec_types['Foo']
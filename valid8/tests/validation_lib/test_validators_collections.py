@@ -1,9 +1,13 @@
+import sys
+from time import sleep
+
 import pytest
 
 from mini_lambda import make_lambda_friendly_method, _, x
 from valid8 import ValidationFailure
 from valid8.validation_lib import on_each_, is_even, maxlen, on_all_, is_subset, is_superset, is_in, minlen, TooShort, \
-    TooLong, length_between, LengthNotInRange, lt, contains, has_length, WrongLength, empty, NotEmpty, non_empty, Empty
+    TooLong, length_between, LengthNotInRange, lt, contains, has_length, WrongLength, empty, NotEmpty, non_empty, Empty, \
+    stream_all_, InvalidItemInSequence, par_on_all_
 
 
 def test_is_in():
@@ -56,6 +60,220 @@ def test_on_all():
         a((0, -10, -1))
 
 
+def test_stream_all():
+    """ Checks that stream_all_ validates the elements lazily, as they are consumed """
+
+    consumed = []
+
+    def gen():
+        for i in (0, -10, -1, -2):
+            consumed.append(i)
+            yield i
+
+    stream = stream_all_(is_even, lt(0))(gen())
+    assert consumed == []
+    assert next(stream) == 0
+    assert next(stream) == -10
+    assert consumed == [0, -10]
+    with pytest.raises(InvalidItemInSequence) as exc_info:
+        next(stream)
+    assert exc_info.value.item_index == 2
+    assert consumed == [0, -10, -1]
+
+    assert list(stream_all_(is_even)([0, 2])) == [0, 2]
+
+    # it is not a validation function: using it as such is an error
+    from valid8 import validate, Validator, and_, validate_arg, failure_raiser
+    s = stream_all_(is_even)
+    with pytest.raises(TypeError) as exc_info:
+        validate('x', [1], custom=s)
+    assert str(exc_info.value).startswith("stream_<is_even>_on_all_elts can not be used as a validation function")
+    for misuse in (lambda: Validator(s), lambda: Validator((s, 'should be even')), lambda: and_(is_even, s),
+                   lambda: validate_arg('x', s)(lambda x: x), lambda: failure_raiser(s), lambda: on_all_(s)):
+        with pytest.raises(TypeError):
+            misuse()
+
+
+def test_on_all_numpy():
+    """ Checks that on_all_ on a numpy array is vectorized and raises the same failure than the element-wise loop """
+    np = pytest.importorskip("numpy")
+    from valid8.validation_lib import gt, between, is_odd, is_multiple_of, get_vectorized_check
+    from valid8.validation_lib.collections import _apply_vectorized_check
+
+    v = on_all_(between(0, 100, open_left=True), (is_in(frozenset({1, 3, 5, 7, 9, 11})), 'should be small'), is_odd)
+    assert get_vectorized_check(v.__valid8_def__[1][0]) is not None
+    x = np.array([1, 3, 5, 7, 9, 11] * 10)
+    assert v(x)
+    x[37] = 4
+    x[40] = 2
+    with pytest.raises(InvalidItemInSequence) as exc_info:
+        v(x)
+    assert exc_info.value.item_index == 37
+    assert type(exc_info.value.item_index) is int
+    with pytest.raises(InvalidItemInSequence) as exc_info2:
+        v(list(x))
+    assert str(exc_info.value) == str(exc_info2.value)
+
+    # NaN is invalid, as in the element-wise loop
+    with pytest.raises(InvalidItemInSequence) as exc_info:
+        on_all_(gt(0))(np.array([1., float('nan')]))
+    assert exc_info.value.item_index == 1
+    assert type(exc_info.value.item_index) is int
+
+    # non-vectorizable validation functions and arrays fall back to the element-wise loop
+    assert get_vectorized_check(on_all_(is_multiple_of(3), lambda x: True).__valid8_def__[1][0]) is None
+    assert on_all_(is_multiple_of(3), lambda x: x < 10)(np.array([3, 6]))
+    assert _apply_vectorized_check(get_vectorized_check(gt(0)), np.array(['a'])) is None
+    with pytest.raises(InvalidItemInSequence):
+        on_all_(gt('a'))(np.array([1]))
+
+    # containers that are not iterable or may be modified are not vectorized
+    class Odd(object):
+        def __contains__(self, item):
+            return item % 2 == 1
+
+    assert get_vectorized_check(is_in(Odd())) is None
+    assert on_all_(is_in(Odd()))(np.array([1, 3]))
+    allowed = [1, 2, 3]
+    f = on_all_(is_in(allowed))
+    allowed.remove(3)
+    for x in (np.array([1, 3]), [1, 3]):
+        with pytest.raises(InvalidItemInSequence) as exc_info:
+            f(x)
+        assert exc_info.value.item_index == 1
+
+
+def test_on_all_numpy_is_in_range():
+    """ Checks that is_in on a range is vectorized without materializing it, and only when an array is validated """
+    np = pytest.importorskip("numpy")
+    from valid8.validation_lib import get_vectorized_check
+    from valid8.validation_lib.collections import _apply_vectorized_check
+
+    # nothing is computed when the validator is created, and the range is not materialized when it is used
+    assert on_all_(is_in(range(10 ** 9)))(np.array([0, 5, 10 ** 9 - 1]))
+    with pytest.raises(InvalidItemInSequence) as exc_info:
+        on_all_(is_in(range(0, 100, 5)))(np.array([0, 5, 12]))
+    assert exc_info.value.item_index == 2
+
+    # the mask is exactly the element-wise test
+    x_int = np.arange(-12, 13)
+    x_float = np.array([-6., -5.5, 0., 0.5, 3., 4., 7., 9., float('nan'), float('inf')])
+    for r in (range(0), range(5), range(-3, 10, 3), range(10, -7, -4), range(7, 8)):
+        check = get_vectorized_check(is_in(r))
+        for x in (x_int, x_float, np.array([True, False])):
+            assert list(_apply_vectorized_check(check, x)) == [e in r for e in x.tolist()]
+
+    # very large bounds fall back to the element-wise test
+    assert get_vectorized_check(is_in(range(2 ** 60, 2 ** 61))) is None
+
+
+@pytest.mark.skipif(sys.version_info < (3, 2), reason="concurrent.futures is not available")
+def test_par_on_all():
+    """ Checks that par_on_all_ reports the lowest invalid index, with the same failure than on_all_ """
+    from concurrent.futures import ThreadPoolExecutor
+    from valid8.validation_lib.collections import get_shared_executor
+
+    values = list(range(0, -100, -2))
+    values[37] = -1
+    values[40] = 1
+
+    with pytest.raises(InvalidItemInSequence) as exc_info:
+        on_all_(is_even, lt(0))(values)
+    expected = str(exc_info.value)
+
+    with ThreadPoolExecutor(max_workers=4) as ex:
+        a = par_on_all_(is_even, lt(0), executor=ex, chunksize=7)
+        assert a(values[0:30])
+        for _i in range(5):
+            with pytest.raises(InvalidItemInSequence) as exc_info:
+                a(values)
+            assert exc_info.value.item_index == 37
+            assert str(exc_info.value) == expected
+
+    # default executor, shared by all validators
+    assert par_on_all_(is_even)([0, 2, 4])
+    shared = get_shared_executor()
+    with pytest.raises(InvalidItemInSequence):
+        par_on_all_(is_even, chunksize=1)([0, 1, 3])
+    assert get_shared_executor() is shared
+
+    # nested validators on the shared executor do not wait for each other
+    nested = par_on_all_(par_on_all_(is_even, chunksize=1), chunksize=1)
+    assert nested([[0, 2]] * 100)
+    with pytest.raises(InvalidItemInSequence) as exc_info:
+        nested([[0], [2, 3], [4]])
+    assert exc_info.value.item_index == 1
+
+    # chunks after the first invalid one are cancelled, even if a chunk before it is still running
+    calls = []
+
+    def slow_first(x):
+        calls.append(x)
+        if x == 0:
+            sleep(0.3)
+        return x != 1
+
+    with ThreadPoolExecutor(max_workers=2) as ex:
+        with pytest.raises(InvalidItemInSequence) as exc_info:
+            par_on_all_(slow_first, executor=ex, chunksize=1)(list(range(100)))
+    assert exc_info.value.item_index == 1
+    assert len(calls) < 10
+
+
+@pytest.mark.skipif(sys.version_info < (3, 2), reason="concurrent.futures is not available")
+def test_par_on_all_process_pool():
+    """ Checks that par_on_all_ works on a process pool, and that executor errors are not validation failures """
+    from concurrent.futures import ProcessPoolExecutor
+    from valid8 import Validator
+    from valid8.validation_lib import ExecutorError
+
+    values = list(range(0, -100, -2))
+    values[37] = -1
+
+    with ProcessPoolExecutor(max_workers=2) as ex:
+        a = par_on_all_(is_even, lt(0), executor=ex, chunksize=7)
+        assert a(values[0:30])
+        with pytest.raises(InvalidItemInSequence) as exc_info:
+            a(values)
+        assert exc_info.value.item_index == 37
+
+        # a non-picklable validation function can not be sent to the workers: this is not reported as invalid data
+        v = Validator(par_on_all_(lambda x: x > 0, executor=ex))
+        with pytest.raises(ExecutorError) as exc_info:
+            v.assert_valid('x', [1, 2])
+        assert "should be picklable" in str(exc_info.value)
+        assert exc_info.value.__cause__ is not None
+        with pytest.raises(ExecutorError):
+            v.is_valid([1, 2])
+
+
+
+@pytest.mark.skipif(sys.version_info < (3, 2), reason="concurrent.futures is not available")
+@pytest.mark.parametrize("compile_", [False, True], ids="compile={}".format)
+def test_par_on_all_executor_error(compile_):
+    """ Checks that executor errors are regular exceptions, re-raised as is by all validation layers """
+    from concurrent.futures import ThreadPoolExecutor
+    from valid8 import Validator, or_, not_, is_valid
+    from valid8.base import RootException
+    from valid8.validation_lib import ExecutorError
+
+    ex = ThreadPoolExecutor(max_workers=1)
+    ex.shutdown()
+    broken = par_on_all_(is_even, executor=ex)
+
+    for v in (broken, or_(broken, is_even), not_(broken, catch_all=True), on_all_(broken), [broken, is_even]):
+        validator = Validator(v, compile=compile_)
+        with pytest.raises(ExecutorError) as exc_info:
+            validator.assert_valid('x', [[1, 2]])
+        assert isinstance(exc_info.value, RootException)
+        assert isinstance(exc_info.value.__cause__, RuntimeError)
+        with pytest.raises(ExecutorError):
+            validator.is_valid([[1, 2]])
+        with pytest.raises(ExecutorError):
+            validator.validate_many([[[1, 2]]])
+    with pytest.raises(ExecutorError):
+        is_valid([1, 2], broken)
+
 def test_on_each():
     """ Checks that on_each works """
 
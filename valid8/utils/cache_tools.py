@@ -0,0 +1,508 @@
+from collections import OrderedDict, namedtuple
+from threading import RLock
+from types import MethodType
+from weakref import WeakKeyDictionary, WeakValueDictionary, ref
+
+try:  # python 3.3+
+    from collections.abc import MutableMapping
+except ImportError:
+    from collections import MutableMapping
+
+try:  # python 3.5+
+    # noinspection PyUnresolvedReferences
+    from typing import Any, Hashable, Optional, Callable, List
+except ImportError:
+    pass
+
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'evictions', 'maxsize', 'currsize'])
+""" Statistics about a `LRUCache`, returned by `LRUCache.cache_info()` """
+
+
+class LRUCache(object):
+    """
+    A bounded, thread-safe, least-recently-used cache with hit/miss/eviction statistics.
+
+    As opposed to `functools.lru_cache` it is not a function decorator: keys are built explicitly by the caller, so
+    that arguments that are not hashable (for example lists or dicts of validation functions) can be supported.
+    """
+    __slots__ = ('maxsize', 'hits', 'misses', 'evictions', '_data', '_lock')
+
+    def __init__(self,
+                 maxsize=128  # type: int
+                 ):
+        """
+        Constructor
+
+        :param maxsize: the maximum number of entries in the cache. When it is exceeded, the least recently used entry
+            is evicted. A maxsize of 0 disables the cache.
+        """
+        if maxsize < 0:
+            raise ValueError("maxsize should be a positive integer")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data = OrderedDict()
+        self._lock = RLock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self,
+            key,          # type: Hashable
+            default=None  # type: Any
+            ):
+        # type: (...) -> Any
+        """
+        Returns the value cached for `key`, or `default` if there is none. Statistics are updated accordingly.
+
+        :param key:
+        :param default:
+        :return:
+        """
+        with self._lock:
+            try:
+                # pop and re-insert: most recently used entries are at the end (move_to_end is python 3 only)
+                value = self._data.pop(key)
+            except KeyError:
+                self.misses += 1
+                return default
+            else:
+                self._data[key] = value
+                self.hits += 1
+                return value
+
+    def put(self,
+            key,   # type: Hashable
+            value  # type: Any
+            ):
+        """
+        Stores `value` for `key` in the cache, possibly evicting the least recently used entry.
+
+        :param key:
+        :param value:
+        :return:
+        """
+        if self.maxsize == 0:
+            return
+        with self._lock:
+            self._data.pop(key, None)
+            self._data[key] = value
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def pop(self,
+            key,          # type: Hashable
+            default=None  # type: Any
+            ):
+        # type: (...) -> Any
+        """
+        Removes the entry for `key` from the cache and returns its value, or `default` if there is none. Statistics are
+        not updated.
+
+        :param key:
+        :param default:
+        :return:
+        """
+        with self._lock:
+            return self._data.pop(key, default)
+
+    def clear(self):
+        """ Removes all entries from the cache and resets the statistics """
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def cache_info(self):
+        # type: (...) -> CacheInfo
+        """ Returns a `CacheInfo` named tuple with the current statistics of the cache """
+        return CacheInfo(self.hits, self.misses, self.evictions, self.maxsize, len(self._data))
+
+
+class UnhashableDefinition(TypeError):
+    """ Raised by `make_definition_key` when no key can be built for an object """
+
+
+class _IdentityKey(object):
+    """
+    A key element comparing by identity. It holds a weak reference on the object when possible, so that keys do not
+    keep short-lived objects (such as lambdas) alive: once the object is garbage-collected the key does not compare
+    equal to anything, even if its id is reused by another object. Objects that do not support weak references are
+    held by a strong reference, so that their id can not be reused while the key is alive.
+    """
+    __slots__ = ('_ref', '_id')
+
+    def __init__(self, obj):
+        self._id = id(obj)
+        try:
+            self._ref = ref(obj)
+        except TypeError:
+            self._ref = _StrongRef(obj)
+
+    @property
+    def obj(self):
+        return self._ref()
+
+    def __hash__(self):
+        return self._id
+
+    def __eq__(self, other):
+        if not isinstance(other, _IdentityKey) or other._id != self._id:
+            return False
+        obj = self._ref()
+        return obj is not None and other._ref() is obj
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __repr__(self):
+        return "_IdentityKey(%r)" % (self.obj, )
+
+
+class _StrongRef(object):
+    """ Mimics a weak reference for objects that do not support them """
+    __slots__ = ('obj',)
+
+    def __init__(self, obj):
+        self.obj = obj
+
+    def __call__(self):
+        return self.obj
+
+
+class IdentityDict(MutableMapping):
+    """
+    An ordered dictionary whose keys are compared by identity rather than by equality. The keys are the objects
+    themselves: iteration yields them, and they can be used directly to get items. This is useful when keys are
+    compared by definition (such as the validation callables created by valid8), since structurally equal keys are
+    then still distinct entries.
+    """
+    __slots__ = ('_data',)
+
+    def __init__(self, items=()):
+        self._data = OrderedDict()
+        for k, v in items:
+            self[k] = v
+
+    def __getitem__(self, key):
+        return self._data[_IdentityKey(key)][1]
+
+    def __setitem__(self, key, value):
+        # the key is stored along with the value: it is therefore kept alive as long as the entry exists
+        self._data[_IdentityKey(key)] = (key, value)
+
+    def __delitem__(self, key):
+        del self._data[_IdentityKey(key)]
+
+    def __iter__(self):
+        for k, _ in self._data.values():
+            yield k
+
+    def __len__(self):
+        return len(self._data)
+
+    def items(self):
+        return [(k, v) for k, v in self._data.values()]
+
+    def values(self):
+        return [v for _, v in self._data.values()]
+
+    def __reduce__(self):
+        return IdentityDict, (self.items(), )
+
+    def __repr__(self):
+        return "IdentityDict(%r)" % (self.items(), )
+
+
+_PRIMITIVE_TYPES = (type(None), bool, int, float, complex, str, bytes)
+try:
+    # python 2
+    # noinspection PyUnresolvedReferences
+    _PRIMITIVE_TYPES += (long, unicode)  # noqa: F821
+except NameError:
+    pass
+
+_MUTABLE_CONTAINERS = (list, dict, set, bytearray)
+
+
+def make_definition_key(obj,                        # type: Any
+                        mutables_by_identity=False  # type: bool
+                        ):
+    # type: (...) -> Hashable
+    """
+    Creates a hashable key representing the structure of a validation definition, such as the `*validation_func`
+    arguments received by `assert_valid`. Two definitions that would create the same validators get equal keys:
+
+     - primitive values (str, numbers, None...) are compared by type and value,
+     - tuples, lists, dicts and sets are compared recursively, element by element,
+     - functions created by `valid8` that carry a definition (see `valid8.base.get_definition`) and failure raisers
+       are compared by definition, so that `gt(0)` and another `gt(0)` get the same key,
+     - other callables, types and objects are compared by identity.
+
+    Keys used to cache or share the objects created from a definition should use `mutables_by_identity=True`: the
+    lists, dicts, sets and bytearrays that these objects keep a reference on (the arguments of functions such as
+    `is_in(allowed)`, and the context arguments of failure raisers) are then compared by identity, since they may be
+    modified after the key is created. For example `is_in(a)` then gets a different key than `is_in([1, 2])` even if
+    `a == [1, 2]`. The containers of the validation syntax itself (a list meaning `and_`, a dict of help messages...)
+    are not retained, and are always compared by value.
+
+    :param obj:
+    :param mutables_by_identity: if True, mutable containers retained by the created objects are compared by identity.
+    :return: a hashable key
+    :raises UnhashableDefinition: if obj contains elements that can not be used in a key.
+    """
+    if _base_symbols is None:
+        _load_base_symbols()
+    return _make_key(obj, mutables_by_identity, False)
+
+
+_base_symbols = None
+
+
+def _load_base_symbols():
+    """ Imports the symbols of `valid8.base` used by `_make_key`, that can not be imported at module level """
+    global _base_symbols, get_definition, is_mini_lambda, FailureRaiser
+    from valid8.base import get_definition, is_mini_lambda, FailureRaiser
+    _base_symbols = True
+
+
+def _make_key(obj, mutables_by_identity, retained):
+    """ See `make_definition_key`. `retained` indicates that `obj` is retained by the objects created """
+    if isinstance(obj, _PRIMITIVE_TYPES):
+        return type(obj), obj
+
+    elif retained and mutables_by_identity and isinstance(obj, _MUTABLE_CONTAINERS):
+        return _IdentityKey(obj)
+
+    elif isinstance(obj, tuple):
+        return (tuple, ) + tuple([_make_key(o, mutables_by_identity, retained) for o in obj])
+
+    elif isinstance(obj, list):
+        return (list, ) + tuple([_make_key(o, mutables_by_identity, retained) for o in obj])
+
+    elif isinstance(obj, dict):
+        return (dict, ) + tuple([(_make_key(k, mutables_by_identity, retained),
+                                  _make_key(v, mutables_by_identity, retained)) for k, v in obj.items()])
+
+    elif isinstance(obj, (set, frozenset)):
+        return type(obj), frozenset([_make_key(o, mutables_by_identity, retained) for o in obj])
+
+    elif is_mini_lambda(obj):
+        # note: mini-lambda expressions override the comparison operators, they should not be compared by value
+        return _IdentityKey(obj)
+
+    elif isinstance(obj, FailureRaiser):
+        # the context arguments dict is owned by the failure raiser, but not its values
+        ctx_key = (dict, ) + tuple([(k, _make_key(v, mutables_by_identity, True))
+                                    for k, v in obj.kw_context_args.items()])
+        return (type(obj), _make_key(obj.validation_callable, mutables_by_identity, True),
+                _make_key(obj.help_msg, mutables_by_identity, True),
+                _make_key(obj.failure_type, mutables_by_identity, True), ctx_key)
+
+    definition = get_definition(obj)
+    if definition is not None:
+        op, args = definition
+        return 'def', op, _make_key(args, mutables_by_identity, True)
+
+    elif callable(obj):
+        return _IdentityKey(obj)
+
+    else:
+        try:
+            hash(obj)
+        except TypeError:
+            raise UnhashableDefinition(obj)
+        return type(obj), obj
+
+
+def get_identity_objects(key  # type: Hashable
+                         ):
+    # type: (...) -> List[Any]
+    """
+    Returns the objects compared by identity in a key created by `make_definition_key` (user-defined functions,
+    lambdas, mutable containers when `mutables_by_identity=True`...), except types which are considered long-lived.
+    Keys containing such objects only match again if the same objects are used, which is not the case for example for
+    lambdas created inline at each call.
+
+    :param key:
+    :return: a list of objects, empty if the key does not depend on object identities.
+    """
+    if isinstance(key, _IdentityKey):
+        obj = key.obj
+        return [] if isinstance(obj, type) else [obj]
+    elif isinstance(key, (tuple, frozenset)):
+        return [o for k in key for o in get_identity_objects(k)]
+    else:
+        return []
+
+
+CallableCacheInfo = namedtuple('CallableCacheInfo', ['hits', 'misses', 'uncacheable', 'currsize'])
+""" Statistics about a `CallableInfoCache`, returned by `CallableInfoCache.cache_info()` """
+
+
+class CallableInfoCache(object):
+    """
+    A cache for information computed from callables, such as signature inspection results. Entries are weakly keyed by
+    the callable so that the cache does not keep functions alive:
+
+     - bound methods are keyed by their underlying function (`__func__`), since a new bound method object is created
+       each time that it is accessed. The computed information should therefore not depend on the bound object.
+     - hashable callables that do not support weak references (for example builtins) are stored in a bounded
+       `LRUCache` instead,
+     - unhashable callables are never cached.
+    """
+    __slots__ = ('hits', 'misses', 'uncacheable', '_weak', '_bound', '_strong')
+
+    def __init__(self,
+                 fallback_maxsize=256  # type: int
+                 ):
+        """
+        Constructor
+
+        :param fallback_maxsize: the maximum size of the LRU cache used for callables that do not support weak
+            references.
+        """
+        self.hits = 0
+        self.misses = 0
+        self.uncacheable = 0
+        self._weak = WeakKeyDictionary()
+        self._bound = WeakKeyDictionary()
+        self._strong = LRUCache(maxsize=fallback_maxsize)
+
+    def get_or_compute(self,
+                       f,       # type: Callable
+                       compute  # type: Callable[[Callable], Any]
+                       ):
+        # type: (...) -> Any
+        """
+        Returns the information cached for callable `f`, or computes it with `compute(f)` and stores it.
+
+        :param f: the callable
+        :param compute: the function computing the information from `f`. If it raises, nothing is cached.
+        :return:
+        """
+        if isinstance(f, MethodType):
+            cache, key = self._bound, f.__func__
+        else:
+            cache, key = self._weak, f
+
+        try:
+            res = cache.get(key, _MISSING)
+        except TypeError:
+            # not weakrefable or not hashable
+            try:
+                res = self._strong.get(key, _MISSING)
+            except TypeError:
+                # not hashable: no cache
+                self.uncacheable += 1
+                return compute(f)
+            cache = self._strong
+
+        if res is not _MISSING:
+            self.hits += 1
+            return res
+
+        self.misses += 1
+        res = compute(f)
+        if cache is self._strong:
+            cache.put(key, res)
+        else:
+            cache[key] = res
+        return res
+
+    def clear(self):
+        """ Removes all entries from the cache and resets the statistics """
+        self._weak.clear()
+        self._bound.clear()
+        self._strong.clear()
+        self.hits = 0
+        self.misses = 0
+        self.uncacheable = 0
+
+    def cache_info(self):
+        # type: (...) -> CallableCacheInfo
+        """ Returns a `CallableCacheInfo` named tuple with the current statistics of the cache """
+        return CallableCacheInfo(self.hits, self.misses, self.uncacheable,
+                                 len(self._weak) + len(self._bound) + len(self._strong))
+
+
+InternInfo = namedtuple('InternInfo', ['hits', 'misses', 'currsize', 'bytes_saved'])
+""" Statistics about an `InternTable`, returned by `InternTable.cache_info()` """
+
+
+class InternTable(object):
+    """
+    A thread-safe table of interned objects: `get_or_create` returns the existing object for a key if there is one
+    alive, or creates and registers a new one. Objects are weakly referenced, so an entry disappears as soon as no one
+    uses the interned object anymore. Interned objects should therefore be immutable and support weak references.
+
+    The table keeps track of the approximate memory saved by sharing objects: the size of each object is estimated once
+    at creation time with the provided `size_estimator`, and accumulated each time that it is reused.
+    """
+    __slots__ = ('enabled', 'hits', 'misses', 'bytes_saved', '_data', '_sizes', '_lock')
+
+    def __init__(self):
+        self.enabled = True
+        self.hits = 0
+        self.misses = 0
+        self.bytes_saved = 0
+        self._data = WeakValueDictionary()
+        self._sizes = WeakKeyDictionary()
+        self._lock = RLock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get_or_create(self,
+                      key,                 # type: Hashable
+                      factory,             # type: Callable[[], Any]
+                      size_estimator=None  # type: Callable[[Any], int]
+                      ):
+        # type: (...) -> Any
+        """
+        Returns the object interned for `key`, or creates one with `factory()` and interns it. If the table is disabled
+        (`enabled = False`), `factory()` is always called and nothing is stored.
+
+        :param key: the key
+        :param factory: a function without arguments creating the object to intern
+        :param size_estimator: an optional function returning the approximate size in bytes of an object created with
+            `factory`, used in `cache_info()` to report the memory saved.
+        :return:
+        """
+        if not self.enabled:
+            return factory()
+
+        with self._lock:
+            obj = self._data.get(key)
+            if obj is not None:
+                self.hits += 1
+                self.bytes_saved += self._sizes.get(obj, 0)
+                return obj
+
+            self.misses += 1
+            obj = factory()
+            self._data[key] = obj
+            if size_estimator is not None:
+                self._sizes[obj] = size_estimator(obj)
+            return obj
+
+    def clear(self):
+        """ Removes all entries from the table and resets the statistics. Objects already interned are not modified """
+        with self._lock:
+            self._data.clear()
+            self._sizes.clear()
+            self.hits = 0
+            self.misses = 0
+            self.bytes_saved = 0
+
+    def cache_info(self):
+        # type: (...) -> InternInfo
+        """ Returns an `InternInfo` named tuple with the current statistics of the table """
+        return InternInfo(self.hits, self.misses, len(self._data), self.bytes_saved)
+
+
+_MISSING = object()
@@ -1,8 +1,9 @@
-import sys
-from collections import OrderedDict
+import linecache
+from functools import update_wrapper
+from itertools import count
 
 try:  # python 3.5+
-    from typing import Callable
+    from typing import Callable, Any, Tuple, Dict
 except ImportError:
     pass
 
@@ -12,73 +13,102 @@ except ImportError:
     from funcsigs import Signature
 
 
-def apply_on_each_func_args_sig(func,
-                                cur_args,
-                                cur_kwargs,
-                                sig,  # type: Signature
-                                func_to_apply,
-                                func_to_apply_params_dict):
+_wrapper_counter = count()
+
+
+def create_signature_wrapper(func,                # type: Callable
+                             func_signature,      # type: Signature
+                             impl,                # type: Callable[[Tuple, Tuple, Dict[str, Any]], Any]
+                             is_coroutine=False   # type: bool
+                             ):
+    # type: (...) -> Callable
     """
-    Applies func_to_apply on each argument of func according to what's received in current call (cur_args, cur_kwargs).
-    For each argument of func named 'att' in its signature, the following method is called:
+    Generates and compiles a wrapper for `func`, with the exact signature `func_signature`: positional-only,
+    keyword-only, var-positional and var-keyword parameters are declared as such in the generated code. Since Python
+    itself binds the received arguments to the parameters, the wrapper does not depend on any calling convention. It
+    calls `impl(values, args, kwargs)` where
 
-    `func_to_apply(cur_att_value, func_to_apply_paramers_dict[att], func, att_name)`
+     - `values` is the tuple of the values of all parameters in signature order, defaults applied. A var-positional
+       parameter is a tuple and a var-keyword parameter a dict, as with `Signature.bind`.
+     - `args` and `kwargs` are the arguments to use to call `func`: all parameters that can be passed positionally are
+       in `args`, the keyword-only ones in `kwargs`.
 
-    :param func:
-    :param cur_args:
-    :param cur_kwargs:
-    :param sig:
-    :param func_to_apply:
-    :param func_to_apply_params_dict:
+    The metadata of `func` is copied onto the wrapper, and its `__wrapped__` attribute is set to `func`.
+
+    :param func: the function to wrap
+    :param func_signature: its signature
+    :param impl: the implementation of the wrapper
+    :param is_coroutine: if True, the wrapper is a coroutine function awaiting `impl(values, args, kwargs)`
     :return:
     """
+    names = set(func_signature.parameters)
+
+    def free_name(name):
+        # the names used in the generated code should not be shadowed by the parameters
+        while name in names:
+            name += '_'
+        names.add(name)
+        return name
+
+    glob = dict()
+    impl_name = free_name('_impl_')
+    glob[impl_name] = impl
+    dict_name = free_name('_dict_')
+    glob[dict_name] = dict
+
+    params, values, pos_args, kw_args = [], [], [], []
+    var_pos, var_kw = None, None
+    prev_kind = None
+    for i, (name, p) in enumerate(func_signature.parameters.items()):
+        if prev_kind is p.POSITIONAL_ONLY and p.kind is not p.POSITIONAL_ONLY:
+            params.append('/')
+        if p.kind is p.KEYWORD_ONLY and prev_kind not in (p.KEYWORD_ONLY, p.VAR_POSITIONAL):
+            params.append('*')
+
+        if p.kind is p.VAR_POSITIONAL:
+            params.append('*' + name)
+            var_pos = name
+        elif p.kind is p.VAR_KEYWORD:
+            params.append('**' + name)
+            var_kw = name
+        else:
+            if p.default is not p.empty:
+                default_name = free_name('_default_%s_' % i)
+                glob[default_name] = p.default
+                params.append('%s=%s' % (name, default_name))
+            else:
+                params.append(name)
+
+            if p.kind is p.KEYWORD_ONLY:
+                kw_args.append('%s=%s' % (name, name))
+            else:
+                pos_args.append(name)
+
+        values.append(name)
+        prev_kind = p.kind
+
+    if len(values) > 0 and prev_kind is func_signature.parameters[values[-1]].POSITIONAL_ONLY:
+        params.append('/')
+
+    values_src = '(%s)' % ''.join('%s, ' % v for v in values)
+    args_src = '(%s)' % ''.join('%s, ' % a for a in pos_args)
+    if var_pos is not None:
+        args_src = '%s + %s' % (args_src, var_pos) if len(pos_args) > 0 else var_pos
+    kwargs_src = '%s(%s)' % (dict_name, ', '.join(([var_kw] if var_kw is not None else []) + kw_args))
+
+    call_src = '%s(%s, %s, %s)' % (impl_name, values_src, args_src, kwargs_src)
+    if is_coroutine:
+        src = "async def validating_wrapper(%s):\n    return await %s\n" % (', '.join(params), call_src)
+    else:
+        src = "def validating_wrapper(%s):\n    return %s\n" % (', '.join(params), call_src)
+
+    # register the source so that tracebacks and `inspect.getsource` work
+    filename = '<valid8-wrapper-%s>' % next(_wrapper_counter)
+    linecache.cache[filename] = (len(src), None, src.splitlines(True), filename)
+
+    exec(compile(src, filename, 'exec'), glob)
+    wrapper = glob['validating_wrapper']
 
-    # match the received arguments with the signature to know who is who
-    bound_values = sig.bind(*cur_args, **cur_kwargs)
-
-    # add the default values in here to get a full list
-    apply_defaults(bound_values)
-
-    for att_name, att_value in bound_values.arguments.items():
-        if att_name in func_to_apply_params_dict.keys():
-            # value = a normal value, or cur_kwargs as a whole
-            func_to_apply(att_value, func_to_apply_params_dict[att_name], func, att_name)
-
-        # The behaviour below is removed as it is too complex to explain
-        # else:
-        #     if sig.parameters[att_name].kind == Parameter.VAR_KEYWORD:
-        #         # if the attribute is variable-length keyword argument we can try to find a matching key inside it
-        #         # each item is handled independently (if func signature contains the kw args names such as a, b)
-        #         for name, value in att_value.items():
-        #             if name in func_to_apply_params_dict.keys():
-        #                 func_to_apply(value, func_to_apply_params_dict[name], func, name)
-
-
-if sys.version_info >= (3, 0):
-    def apply_defaults(bound_values):
-        bound_values.apply_defaults()
-else:
-    # TODO when funcsigs implements PR https://github.com/aliles/funcsigs/pull/30 remove this
-    def apply_defaults(bound_values):
-        arguments = bound_values.arguments
-
-        # Creating a new one and not modifying in-place for thread safety.
-        new_arguments = []
-
-        # noinspection PyProtectedMember
-        for name, param in bound_values._signature.parameters.items():
-            try:
-                new_arguments.append((name, arguments[name]))
-            except KeyError:
-                if param.default is not param.empty:
-                    val = param.default
-                elif param.kind is param.VAR_POSITIONAL:
-                    val = ()
-                elif param.kind is param.VAR_KEYWORD:
-                    val = {}
-                else:
-                    # BoundArguments was likely created by bind_partial
-                    continue
-                new_arguments.append((name, val))
-
-        bound_values.arguments = OrderedDict(new_arguments)
+    update_wrapper(wrapper, func)
+    wrapper.__wrapped__ = func  # python 2
+    return wrapper
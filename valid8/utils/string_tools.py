@@ -1,3 +1,18 @@
+try:  # python 3.5+
+    # noinspection PyUnresolvedReferences
+    from typing import Any, Optional
+except ImportError:
+    pass
+
+try:  # python 2
+    # noinspection PyUnresolvedReferences,PyCompatibility
+    _text_types = (str, unicode)
+except NameError:  # python 3
+    _text_types = (str,)
+
+_LOG10_2 = 0.30102999566398
+
+
 def end_with_dot(msg,                  # type: str
                  trailing_space=False  # type: bool
                  ):
@@ -23,3 +38,124 @@ def end_with_dot(msg,                  # type: str
             msg = msg + ' '
 
     return msg
+
+
+class _RecursiveRepr(Exception):
+    """ Raised internally when a container contains itself: the builtin repr is then used """
+
+
+def bounded_repr(obj,        # type: Any
+                 max_length  # type: int
+                 ):
+    # type: (...) -> Optional[str]
+    """
+    Returns `repr(obj)` if it is not longer than `max_length`, or None. For the builtin types (`str`, `bytes`, `int`,
+    `float`, and `list`, `tuple`, `dict`, `set`, `frozenset` of those) the representation is never fully rendered when
+    it is too long: its minimum length is estimated first, and containers are rendered element by element with the
+    remaining length budget. Other objects are rendered with `repr` and then measured, since their representation is
+    not known in advance (note that for example `numpy` arrays summarize their representation if they are large).
+
+    :param obj: the object to represent
+    :param max_length: the maximum length of the representation
+    :return: the representation of obj, or None if it is longer than max_length
+    """
+    try:
+        return _bounded_repr(obj, max_length, set())
+    except _RecursiveRepr:
+        obj_repr = repr(obj)
+        return obj_repr if len(obj_repr) <= max_length else None
+
+
+def bounded_str(obj,        # type: Any
+                max_length  # type: int
+                ):
+    # type: (...) -> Optional[str]
+    """
+    Returns `str(obj)` if it is not longer than `max_length`, or None. Similar to `bounded_repr`: the string of large
+    builtin objects is never fully rendered.
+
+    :param obj: the object to convert to string
+    :param max_length: the maximum length of the string
+    :return: the string of obj, or None if it is longer than max_length
+    """
+    obj_type = type(obj)
+    if obj_type in _text_types:
+        return obj if len(obj) <= max_length else None
+    elif obj_type in _REPR_IS_STR:
+        return bounded_repr(obj, max_length)
+    else:
+        obj_str = str(obj)
+        return obj_str if len(obj_str) <= max_length else None
+
+
+def _bounded_repr(obj, max_length, seen):
+    """ Implementation of `bounded_repr`. `seen` contains the ids of the containers being represented """
+    obj_type = type(obj)
+    if obj_type in _text_types or obj_type is bytes or obj_type is bytearray:
+        # the representation contains at least the characters and the quotes
+        if len(obj) + 2 > max_length:
+            return None
+    elif obj_type is int:
+        # the representation contains at least (nb_bits - 1) * log10(2) digits
+        if (obj.bit_length() - 1) * _LOG10_2 >= max_length:
+            return None
+    elif obj_type in _CONTAINER_FORMATS:
+        return _bounded_container_repr(obj, max_length, seen)
+
+    obj_repr = repr(obj)
+    return obj_repr if len(obj_repr) <= max_length else None
+
+
+def _bounded_container_repr(obj, max_length, seen):
+    obj_type = type(obj)
+    empty_repr, prefix, suffix = _CONTAINER_FORMATS[obj_type]
+    nb_elts = len(obj)
+    if nb_elts == 0:
+        return empty_repr if len(empty_repr) <= max_length else None
+
+    is_dict = obj_type is dict
+    # each element is represented with at least one character (four for dict items 'k: v'), separated with ', '
+    if len(prefix) + len(suffix) + nb_elts * (6 if is_dict else 3) - 2 > max_length:
+        return None
+
+    if id(obj) in seen:
+        raise _RecursiveRepr()
+    seen.add(id(obj))
+    try:
+        budget = max_length - len(prefix) - len(suffix)
+        parts = []
+        for elt in (obj.items() if is_dict else obj):
+            if is_dict:
+                k_repr = _bounded_repr(elt[0], budget - 3, seen)
+                if k_repr is None:
+                    return None
+                v_repr = _bounded_repr(elt[1], budget - 2 - len(k_repr), seen)
+                if v_repr is None:
+                    return None
+                elt_repr = k_repr + ': ' + v_repr
+            else:
+                elt_repr = _bounded_repr(elt, budget, seen)
+                if elt_repr is None:
+                    return None
+            parts.append(elt_repr)
+            budget -= len(elt_repr) + 2
+    finally:
+        seen.discard(id(obj))
+
+    if obj_type is tuple and nb_elts == 1:
+        suffix = ',' + suffix
+    res = prefix + ', '.join(parts) + suffix
+    return res if len(res) <= max_length else None
+
+
+_CONTAINER_FORMATS = {
+    # type: (repr when empty, prefix, suffix)
+    list: ('[]', '[', ']'),
+    tuple: ('()', '(', ')'),
+    dict: ('{}', '{', '}'),
+    set: ('set()', '{', '}'),
+    frozenset: ('frozenset()', 'frozenset({', '})'),
+}
+
+_REPR_IS_STR = (bytes, bytearray, int, float) + tuple(_CONTAINER_FORMATS)
+""" The builtin types for which `str(obj) == repr(obj)` """
@@ -1,7 +1,8 @@
 from .types import HasWrongType, IsWrongType, instance_of, subclass_of
 from .collections import TooLong, TooShort, minlen, maxlen, WrongLength, has_length,\
     LengthNotInRange, length_between, NotInAllowedValues, is_in, NotSubset, is_subset, DoesNotContainValue, contains,\
-    NotSuperset, is_superset, InvalidItemInSequence, on_all_, on_each_, non_empty, Empty, empty, NotEmpty
+    NotSuperset, is_superset, InvalidItemInSequence, on_all_, par_on_all_, ExecutorError, stream_all_,\
+    on_each_, get_vectorized_check, non_empty, Empty, empty, NotEmpty
 from .comparables import NotEqual, TooSmall, gt, gts, TooBig, lt, lts, NotInRange, between
 from .numbers import IsNotEven, is_even, IsNotOdd, is_odd, is_multiple_of, IsNotMultipleOf
 
@@ -13,7 +14,8 @@ __all__ = [
     'TooLong', 'TooShort', 'minlen', 'maxlen', 'WrongLength', 'has_length',
     'non_empty', 'Empty', 'empty', 'NotEmpty', 'LengthNotInRange',
     'length_between', 'NotInAllowedValues', 'is_in', 'NotSubset', 'is_subset', 'DoesNotContainValue', 'contains',
-    'NotSuperset', 'is_superset', 'InvalidItemInSequence', 'on_all_', 'on_each_',
+    'NotSuperset', 'is_superset', 'InvalidItemInSequence', 'on_all_', 'par_on_all_', 'ExecutorError', 'stream_all_',
+    'on_each_', 'get_vectorized_check',
     'NotEqual', 'TooSmall', 'gt', 'gts', 'TooBig', 'lt', 'lts', 'NotInRange', 'between',
     'IsNotEven', 'is_even', 'IsNotOdd', 'is_odd', 'is_multiple_of', 'IsNotMultipleOf'
 ]
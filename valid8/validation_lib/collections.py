@@ -1,11 +1,26 @@
 try:  # python 3.5+
     # noinspection PyUnresolvedReferences
-    from typing import Set, Tuple, Container
+    from typing import Set, Tuple, Container, Optional
+    # noinspection PyUnresolvedReferences
+    from concurrent.futures import Executor
+    # noinspection PyUnresolvedReferences
+    from valid8.base import ValidationCallable
 except ImportError:
     pass
 
+from threading import Lock, local
+
+from six.moves import range as six_range
+
 from valid8.composition import and_
-from valid8.base import ValidationFailure, get_callable_name, NP_TRUE
+from valid8.compiler import is_inlinable
+from valid8.base import ValidationFailure, get_callable_name, NP_TRUE, set_definition, DefinedCallable, pop_kwargs, \
+    get_definition, register_definition_factory, ExecutorError
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 
 class Empty(ValidationFailure, ValueError):
@@ -23,6 +38,9 @@ def non_empty(x):
         raise Empty(wrong_value=x)
 
 
+set_definition(non_empty, 'non_empty')
+
+
 class NotEmpty(ValidationFailure, ValueError):
     """ Custom ValidationFailure raised by non_empty """
     help_msg = 'len(x) == 0 does not hold for x={wrong_value}'
@@ -38,6 +56,9 @@ def empty(x):
         raise NotEmpty(wrong_value=x)
 
 
+set_definition(empty, 'empty')
+
+
 class TooShort(ValidationFailure, ValueError):
     """ Custom ValidationFailure raised by minlen """
     help_msg = 'len(x) >= {min_length} does not hold for x={wrong_value}'
@@ -62,7 +83,10 @@ def minlen(min_length
             raise TooShort(wrong_value=x, min_length=min_length)
 
     minlen_.__name__ = 'length_greater_than_%s' % min_length
-    return minlen_
+    return DefinedCallable(minlen_, 'minlen', min_length)
+
+
+register_definition_factory('minlen', minlen)
 
 
 class TooLong(ValidationFailure, ValueError):
@@ -90,7 +114,10 @@ def maxlen(max_length,
             raise TooLong(wrong_value=x, max_length=max_length)
 
     maxlen_.__name__ = 'length_lesser_than_%s' % max_length
-    return maxlen_
+    return DefinedCallable(maxlen_, 'maxlen', max_length)
+
+
+register_definition_factory('maxlen', maxlen)
 
 
 class WrongLength(ValidationFailure, ValueError):
@@ -116,7 +143,10 @@ def has_length(ref_length):
             raise WrongLength(wrong_value=x, ref_length=ref_length)
 
     has_length_.__name__ = 'length_equals_%s' % ref_length
-    return has_length_
+    return DefinedCallable(has_length_, 'has_length', ref_length)
+
+
+register_definition_factory('has_length', has_length)
 
 
 class LengthNotInRange(ValidationFailure, ValueError):
@@ -146,7 +176,10 @@ def length_between(min_len,
             raise LengthNotInRange(wrong_value=x, min_length=min_len, max_length=max_len)
 
     length_between_.__name__ = 'length_between_%s_and_%s' % (min_len, max_len)
-    return length_between_
+    return DefinedCallable(length_between_, 'length_between', min_len, max_len)
+
+
+register_definition_factory('length_between', length_between)
 
 
 class NotInAllowedValues(ValidationFailure, ValueError):
@@ -175,7 +208,10 @@ def is_in(allowed_values  # type: Container
             raise NotInAllowedValues(wrong_value=x, allowed_values=allowed_values)
 
     is_in_allowed_values.__name__ = 'is_in_%s' % (allowed_values, )
-    return is_in_allowed_values
+    return DefinedCallable(is_in_allowed_values, 'is_in', allowed_values)
+
+
+register_definition_factory('is_in', is_in)
 
 
 class NotSubset(ValidationFailure, ValueError):
@@ -207,7 +243,10 @@ def is_subset(reference_set  # type: Set
             raise NotSubset(wrong_value=x, reference_set=reference_set, unsupported=missing)
 
     is_subset_of.__name__ = 'is_subset_of_%s' % reference_set
-    return is_subset_of
+    return DefinedCallable(is_subset_of, 'is_subset', reference_set)
+
+
+register_definition_factory('is_subset', is_subset)
 
 
 class DoesNotContainValue(ValidationFailure, ValueError):
@@ -233,7 +272,10 @@ def contains(ref_value):
             raise DoesNotContainValue(wrong_value=x, ref_value=ref_value)
 
     contains_ref_value.__name__ = 'contains_%s' % ref_value
-    return contains_ref_value
+    return DefinedCallable(contains_ref_value, 'contains', ref_value)
+
+
+register_definition_factory('contains', contains)
 
 
 class NotSuperset(ValidationFailure, ValueError):
@@ -265,7 +307,10 @@ def is_superset(reference_set  # type: Set
             raise NotSuperset(wrong_value=x, reference_set=reference_set, missing=missing)
 
     is_superset_of.__name__ = 'is_superset_of_%s' % reference_set
-    return is_superset_of
+    return DefinedCallable(is_superset_of, 'is_superset', reference_set)
+
+
+register_definition_factory('is_superset', is_superset)
 
 
 class InvalidItemInSequence(ValidationFailure, ValueError):
@@ -273,6 +318,128 @@ class InvalidItemInSequence(ValidationFailure, ValueError):
     help_msg = 'Provided sequence contains one value that is invalid.'
 
 
+def _is_in_mask(allowed_values):
+    # only immutable collections are vectorized: the content of other containers may change after the validator is
+    # created, or may not even be iterable
+    if isinstance(allowed_values, six_range):
+        return _is_in_range_mask(allowed_values)
+    if not isinstance(allowed_values, (tuple, frozenset)):
+        return None
+
+    allowed = []  # the array of allowed values, created on the first array received since it may be large
+
+    def is_in_mask(x):
+        if len(allowed) == 0:
+            # noinspection PyBroadException
+            try:
+                arr = np.asarray(list(allowed_values))
+            except Exception:
+                arr = None
+            allowed.append(arr if arr is not None and arr.dtype.kind in _NUMERIC_KINDS else None)
+        if allowed[0] is None:
+            # not an array of numbers: the caller will use the element-wise validation
+            return None
+        return np.isin(x, allowed[0])
+    return is_in_mask
+
+
+_EXACT_RANGE_BOUND = 2 ** 52
+""" The maximum absolute value of the bounds of a range for `_is_in_range_mask`, so that float arithmetic is exact """
+
+
+def _is_in_range_mask(r):
+    # a range is not materialized: x is in r if it is between its first and last elements, and is a multiple of the
+    # step away from the first one. This also rejects floats that are not integers, and NaN, as the element-wise test.
+    if len(r) == 0:
+        return lambda x: np.zeros(x.shape, dtype=np.bool_)
+    first, last = r[0], r[-1]
+    if abs(first) > _EXACT_RANGE_BOUND or abs(last) > _EXACT_RANGE_BOUND:
+        return None
+    lo, hi = min(first, last), max(first, last)
+    step = abs(r[1] - first) if len(r) > 1 else 1
+    return lambda x: (x >= lo) & (x <= hi) & ((x - first) % step == 0)
+
+
+_VECTORIZED_CHECKS = {
+    # op: function receiving the definition args and returning a function computing the validity mask of an array.
+    # Each mask is *exactly* the test performed by the corresponding function in `valid8.validation_lib`.
+    'gt': lambda min_value, strict: (lambda x: x > min_value) if strict else (lambda x: x >= min_value),
+    'lt': lambda max_value, strict: (lambda x: x < max_value) if strict else (lambda x: x <= max_value),
+    'between': lambda min_val, max_val, open_left, open_right: (
+        lambda x: ((min_val < x) if open_left else (min_val <= x)) & ((x < max_val) if open_right else (x <= max_val))
+    ),
+    'is_in': _is_in_mask,
+    'is_even': lambda: (lambda x: x % 2 == 0),
+    'is_odd': lambda: (lambda x: x % 2 != 0),
+    'is_multiple_of': lambda ref: (lambda x: x % ref == 0),
+}
+""" The validation_lib operations that `on_all_` can evaluate on a whole numpy array at once """
+
+_NUMERIC_KINDS = 'biuf'
+
+
+def get_vectorized_check(validation_callable):
+    """
+    Returns a function computing the boolean validity mask of a numpy array of numbers, equivalent to applying
+    `validation_callable` on each element. This is only possible if numpy is installed and `validation_callable` is one
+    of `gt`, `gts`, `lt`, `lts`, `between`, `is_in` (on a tuple, a frozenset or a range), `is_even`, `is_odd`,
+    `is_multiple_of` or an `and_` of those. Otherwise None is returned. The returned function may still return None
+    when the reference values are not numbers.
+
+    :param validation_callable:
+    :return:
+    """
+    if np is None:
+        return None
+
+    if is_inlinable(validation_callable):
+        # a failure raiser succeeds exactly when the function it wraps succeeds
+        validation_callable = validation_callable.validation_callable
+
+    definition = get_definition(validation_callable)
+    if definition is None:
+        return None
+
+    op, args = definition
+    if op == 'and':
+        masks = tuple(get_vectorized_check(f) for f in args[0])
+        if any(m is None for m in masks):
+            return None
+
+        def and_mask(x):
+            res = masks[0](x)
+            for m in masks[1:]:
+                res &= m(x)
+            return res
+        return and_mask
+
+    try:
+        make_mask = _VECTORIZED_CHECKS[op]
+    except KeyError:
+        return None
+    else:
+        return make_mask(*args)
+
+
+def _apply_vectorized_check(vectorized_check, x):
+    """
+    Applies `vectorized_check` on numpy array x and returns the resulting boolean mask, or None if x is not an array
+    of numbers or if the result is not a boolean mask (for example if the reference values are not comparable to
+    numbers). In that case the caller should use the element-wise validation.
+    """
+    if x.dtype.kind not in _NUMERIC_KINDS:
+        return None
+    # noinspection PyBroadException
+    try:
+        with np.errstate(all='ignore'):
+            mask = vectorized_check(x)
+    except Exception:
+        return None
+    if not isinstance(mask, np.ndarray) or mask.dtype != np.bool_ or mask.shape != x.shape:
+        return None
+    return mask
+
+
 # TODO rename 'all_on_each'
 def on_all_(*validation_func):
     """
@@ -292,15 +459,35 @@ def on_all_(*validation_func):
     """
     # create the validation functions
     validation_function_func = and_(*validation_func)
+    return _on_all_(validation_function_func)
+
+
+def _on_all_(validation_function_func  # type: ValidationCallable
+             ):
+    vectorized_check = []  # created on the first numpy array received, so as not to slow down other usages
 
     def on_all_val(x):
+        start = 0
+        if np is not None and isinstance(x, np.ndarray) and x.ndim == 1:
+            if len(vectorized_check) == 0:
+                vectorized_check.append(get_vectorized_check(validation_function_func))
+            # fast path: evaluate all elements at once, and only fall back to the loop below from the first invalid one
+            mask = None if vectorized_check[0] is None else _apply_vectorized_check(vectorized_check[0], x)
+            if mask is not None:
+                invalid = np.flatnonzero(~mask)
+                if len(invalid) == 0:
+                    return True
+                start = int(invalid[0])
+
         # validate all elements in x in turn
-        for idx, x_elt in enumerate(x):
+        for idx, x_elt in enumerate(x[start:] if start > 0 else x, start):
             try:
                 res = validation_function_func(x_elt)
+            except ExecutorError:
+                raise
             except Exception as e:
                 raise InvalidItemInSequence(wrong_value=x_elt, validation_func=validation_function_func,
-                                            validation_outcome=e)
+                                            validation_outcome=e, item_index=idx)
 
             # if not result_is_success(res): <= DO NOT REMOVE THIS COMMENT
             if (res is not None) and (res is not True) and (res is not NP_TRUE):
@@ -308,11 +495,273 @@ def on_all_(*validation_func):
                 # raise ValidationFailure('on_all_(' + str(validation_func) + '): failed for input '
                 #                       'element [' + str(idx) + ']: ' + str(x_elt))
                 raise InvalidItemInSequence(wrong_value=x_elt, validation_func=validation_function_func,
-                                            validation_outcome=res)
+                                            validation_outcome=res, item_index=idx)
         return True
 
     on_all_val.__name__ = 'apply_<%s>_on_all_elts' % get_callable_name(validation_function_func)
-    return on_all_val
+    return DefinedCallable(on_all_val, 'on_all', validation_function_func)
+
+
+register_definition_factory('on_all', _on_all_)
+
+
+def par_on_all_(*validation_func, **kwargs):
+    """
+    A parallel version of `on_all_`, for large collections and costly validation functions: the elements of the input
+    are split into chunks of `chunksize` elements, that are validated concurrently on a `concurrent.futures` executor
+    (a `ThreadPoolExecutor` or a `ProcessPoolExecutor`). Chunks are examined as they complete: as soon as an invalid
+    chunk is found, the chunks after it are cancelled and only the chunks before it are waited for. The failure raised
+    is the one of the lowest invalid index, identical to the one raised by `on_all_`: the result does not depend on the
+    order in which chunks complete.
+
+    Note that with a `ProcessPoolExecutor` the validation functions are sent to the worker processes, so they should
+    be picklable. This is the case of the functions of `valid8.validation_lib`, of their compositions and failure
+    raisers, and of module-level functions, but not of lambdas and mini-lambda expressions. Errors of the executor
+    itself, such as pickling errors or a broken pool, are not validation failures: they are raised as an
+    `ExecutorError`.
+
+    The input should be a sequence supporting `len()` and slicing, such as a list, a tuple or a numpy array:
+    generators, iterators and sets are not supported. Use `on_all_` or `stream_all_` for those.
+
+    :param validation_func: the base validation function or list of base validation functions to use. A callable, a
+        tuple(callable, help_msg_str), a tuple(callable, failure_type), a tuple(callable, help_msg, failure_type)
+        or a list of several such elements. Tuples indicate an implicit `failure_raiser`.
+        [mini_lambda](https://smarie.github.io/python-mini-lambda/) expressions can be used instead of callables,
+        they will be transformed to functions automatically.
+    :param executor: the `concurrent.futures.Executor` to use. By default (`None`) a `ThreadPoolExecutor` shared by
+        all `par_on_all_` validators is used, see `get_shared_executor`. Nested `par_on_all_` validators using it are
+        run sequentially in the worker threads, so that they can not wait for each other.
+    :param chunksize: the number of elements validated in each task. Default is 1000.
+    :return:
+    """
+    executor, chunksize = pop_kwargs(kwargs, [('executor', None), ('chunksize', 1000)])
+    if chunksize < 1:
+        raise ValueError("chunksize should be a positive integer")
+
+    # create the validation functions
+    validation_function_func = and_(*validation_func)
+    return _par_on_all_(validation_function_func, executor, chunksize)
+
+
+def _par_on_all_(validation_function_func,  # type: ValidationCallable
+                 executor,                  # type: Optional[Executor]
+                 chunksize                  # type: int
+                 ):
+    def par_on_all_val(x):
+        if executor is not None:
+            idx = _par_find_first_invalid(executor, _find_first_invalid, validation_function_func, x, chunksize)
+        elif getattr(_shared_worker_state, 'active', False):
+            # nested in a task of the shared executor: waiting for other tasks of the same pool could deadlock
+            idx = _find_first_invalid(validation_function_func, x, 0)
+        else:
+            idx = _par_find_first_invalid(get_shared_executor(), _shared_find_first_invalid, validation_function_func,
+                                          x, chunksize)
+
+        if idx is not None:
+            # replay the validation of the invalid element, to raise exactly the same failure than `on_all_`
+            x_elt = x[idx]
+            try:
+                res = validation_function_func(x_elt)
+            except ExecutorError:
+                raise
+            except Exception as e:
+                raise InvalidItemInSequence(wrong_value=x_elt, validation_func=validation_function_func,
+                                            validation_outcome=e, item_index=idx)
+            raise InvalidItemInSequence(wrong_value=x_elt, validation_func=validation_function_func,
+                                        validation_outcome=res, item_index=idx)
+        return True
+
+    par_on_all_val.__name__ = 'par_apply_<%s>_on_all_elts' % get_callable_name(validation_function_func)
+    return DefinedCallable(par_on_all_val, 'par_on_all', validation_function_func, executor, chunksize)
+
+
+register_definition_factory('par_on_all', _par_on_all_)
+
+
+_shared_executor = None
+_shared_executor_lock = Lock()
+_shared_worker_state = local()
+
+
+def get_shared_executor():
+    # type: (...) -> Executor
+    """
+    Returns the `ThreadPoolExecutor` used by the `par_on_all_` validators created without executor. It is created on
+    first use, with the default number of workers, and shared by all of them.
+    """
+    global _shared_executor
+    with _shared_executor_lock:
+        if _shared_executor is None:
+            from concurrent.futures import ThreadPoolExecutor
+            _shared_executor = ThreadPoolExecutor()
+        return _shared_executor
+
+
+def _par_find_first_invalid(executor, find_func, validation_func, x, chunksize):
+    """
+    Submits the validation of all chunks of sequence x on the executor, and returns the lowest invalid index, or None.
+    Chunk results are examined as they complete. As soon as an invalid chunk is found, the chunks after it are cancelled
+    and only the chunks before it (that may contain a lower invalid index) are waited for.
+
+    Errors raised by the executor itself (the validation tasks catch all validation errors) are raised as an
+    `ExecutorError`.
+    """
+    from concurrent.futures import as_completed
+
+    futures = dict()
+    try:
+        try:
+            for start in range(0, len(x), chunksize):
+                futures[executor.submit(find_func, validation_func, x[start:start + chunksize], start)] = start
+        except Exception as e:
+            raise ExecutorError(executor, e)
+
+        first_invalid = None
+        remaining = set(futures)  # the chunks whose result was not examined yet
+        for future in as_completed(futures):
+            remaining.discard(future)
+            if first_invalid is not None and futures[future] > first_invalid:
+                # cancelled, or already running when the invalid chunk was found
+                continue
+
+            try:
+                idx = future.result()
+            except ExecutorError:
+                raise
+            except Exception as e:
+                raise ExecutorError(executor, e)
+
+            if idx is not None and (first_invalid is None or idx < first_invalid):
+                first_invalid = idx
+                for f in remaining:
+                    if futures[f] > idx:
+                        f.cancel()
+                # only the chunks before the invalid one may still contain a lower invalid index
+                remaining = set(f for f in remaining if futures[f] < idx)
+
+            if first_invalid is not None and len(remaining) == 0:
+                break
+
+        return first_invalid
+    finally:
+        for future in futures:
+            future.cancel()
+
+
+def _find_first_invalid(validation_func, chunk, offset):
+    """
+    Executed by the `par_on_all_` workers: returns the index of the first invalid element in chunk (starting at
+    offset), or None. Failures are not returned since they may not be picklable: they are recreated by the caller.
+    """
+    for i, x_elt in enumerate(chunk):
+        # noinspection PyBroadException
+        try:
+            res = validation_func(x_elt)
+        except ExecutorError:
+            raise
+        except Exception:
+            return offset + i
+
+        # if not result_is_success(res): <= DO NOT REMOVE THIS COMMENT
+        if (res is not None) and (res is not True) and (res is not NP_TRUE):
+            return offset + i
+    return None
+
+
+def _shared_find_first_invalid(validation_func, chunk, offset):
+    """ `_find_first_invalid`, flagging the worker thread of the shared executor while it runs """
+    _shared_worker_state.active = True
+    try:
+        return _find_first_invalid(validation_func, chunk, offset)
+    finally:
+        _shared_worker_state.active = False
+
+
+def stream_all_(*validation_func):
+    """
+    Generates a function wrapping an iterable into a pass-through iterator, that validates each element lazily against
+    the validation_functions provided, as the consumer pulls it. As opposed to `on_all_`, the iterable is therefore
+    never consumed nor stored by the validation itself: this is suited to generators and unbounded streams. For
+    convenience, a list of validation_functions can be provided and will be replaced with an 'and_'.
+
+    The first invalid element raises an `InvalidItemInSequence` failure with an additional `item_index` attribute.
+
+    Note that the created function is not a validation function: its result should be consumed instead of `x`. Using
+    it as a validation function (in `validate`, `Validator`, `and_`, a decorator...) raises a `TypeError`.
+
+    >>> import sys, pytest
+    >>> if sys.version_info < (3, 0):
+    ...     pytest.skip('doctest skipped in python 2 because exception namespace is different but details matter')
+
+    >>> from valid8.validation_lib import gt
+    >>> positive = stream_all_(gt(0))
+    >>> rows = positive(iter([1, 2, -1]))
+    >>> next(rows), next(rows)
+    (1, 2)
+    >>> next(rows)
+    Traceback (most recent call last):
+    ...
+    valid8.validation_lib.collections.InvalidItemInSequence: Provided stream contains an invalid value at index 2.
+        Function [greater_than_0] raised TooSmall: x >= 0 does not hold for x=-1. Wrong value: -1.
+
+    :param validation_func: the base validation function or list of base validation functions to use. A callable, a
+        tuple(callable, help_msg_str), a tuple(callable, failure_type), a tuple(callable, help_msg, failure_type)
+        or a list of several such elements. Tuples indicate an implicit `failure_raiser`.
+        [mini_lambda](https://smarie.github.io/python-mini-lambda/) expressions can be used instead of callables,
+        they will be transformed to functions automatically.
+    :return: a function taking an iterable and returning an iterator over the same elements.
+    """
+    # create the validation functions
+    validation_function_func = and_(*validation_func)
+
+    def stream_all_val(x):
+        return StreamValidator(x, validation_function_func)
+
+    stream_all_val.__name__ = 'stream_<%s>_on_all_elts' % get_callable_name(validation_function_func)
+    stream_all_val.__not_a_validation_callable__ = "it wraps an iterable into a validating iterator, that should be " \
+                                                   "consumed instead of the iterable. Use on_all_ to validate all " \
+                                                   "elements of a value at once."
+    return stream_all_val
+
+
+class StreamValidator(object):
+    """
+    The pass-through iterator created by `stream_all_`: it yields the elements of the wrapped iterable, after
+    validating each of them.
+    """
+    __slots__ = ('iterator', 'validation_func', 'item_index')
+
+    def __init__(self, iterable, validation_func):
+        self.iterator = iter(iterable)
+        self.validation_func = validation_func
+        self.item_index = 0
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        x_elt = next(self.iterator)
+        idx = self.item_index
+        self.item_index = idx + 1
+        try:
+            res = self.validation_func(x_elt)
+        except ExecutorError:
+            raise
+        except Exception as e:
+            raise InvalidItemInSequence(wrong_value=x_elt, validation_func=self.validation_func,
+                                        validation_outcome=e, item_index=idx, help_msg=_STREAM_HELP_MSG)
+
+        # if not result_is_success(res): <= DO NOT REMOVE THIS COMMENT
+        if (res is not None) and (res is not True) and (res is not NP_TRUE):
+            raise InvalidItemInSequence(wrong_value=x_elt, validation_func=self.validation_func,
+                                        validation_outcome=res, item_index=idx, help_msg=_STREAM_HELP_MSG)
+        return x_elt
+
+    # python 2
+    next = __next__
+
+
+_STREAM_HELP_MSG = 'Provided stream contains an invalid value at index {item_index}.'
 
 
 # TODO rename one_for_each
@@ -337,7 +786,11 @@ def on_each_(*validation_functions_collection):
     """
     # create a tuple of validation functions.
     validation_function_funcs = tuple(and_(validation_func) for validation_func in validation_functions_collection)
+    return _on_each_(validation_function_funcs)
+
 
+def _on_each_(validation_function_funcs  # type: Tuple[ValidationCallable, ...]
+              ):
     # generate a validation function based on the tuple of validation_functions lists
     def on_each_val(x  # type: Tuple
                     ):
@@ -351,6 +804,8 @@ def on_each_(*validation_functions_collection):
                 idx += 1
                 try:
                     res = validation_function_func(elt)
+                except ExecutorError:
+                    raise
                 except Exception as e:
                     raise InvalidItemInSequence(wrong_value=elt,
                                                 validation_func=validation_function_func,
@@ -365,4 +820,7 @@ def on_each_(*validation_functions_collection):
             return True
 
     on_each_val.__name__ = 'map_<(%s)>_on_elts' % ', '.join([get_callable_name(f) for f in validation_function_funcs])
-    return on_each_val
+    return DefinedCallable(on_each_val, 'on_each', validation_function_funcs)
+
+
+register_definition_factory('on_each', _on_each_)
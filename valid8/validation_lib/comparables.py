@@ -4,7 +4,7 @@ try:  # python 3.5+
 except ImportError:
     pass
 
-from valid8.base import ValidationFailure
+from valid8.base import ValidationFailure, DefinedCallable, register_definition_factory
 
 
 class NotEqual(ValidationFailure, ValueError):
@@ -53,7 +53,10 @@ def gt(min_value,    # type: Any
                 raise TooSmall(wrong_value=x, min_value=min_value, strict=False)
 
     gt_.__name__ = '%sgreater_than_%s' % ('strictly_' if strict else '', min_value)
-    return gt_
+    return DefinedCallable(gt_, 'gt', min_value, strict)
+
+
+register_definition_factory('gt', gt)
 
 
 def gts(min_value_strict  # type: Any
@@ -100,7 +103,10 @@ def lt(max_value,    # type: Any
                 raise TooBig(wrong_value=x, max_value=max_value, strict=False)
 
     lt_.__name__ = '%slesser_than_%s' % ('strictly_' if strict else '', max_value)
-    return lt_
+    return DefinedCallable(lt_, 'lt', max_value, strict)
+
+
+register_definition_factory('lt', lt)
 
 
 def lts(max_value_strict  # type: Any
@@ -166,4 +172,7 @@ def between(min_val,          # type: Any
                                  max_value=max_val, right_strict=False)
 
     between_.__name__ = 'between_%s_and_%s' % (min_val, max_val)
-    return between_
+    return DefinedCallable(between_, 'between', min_val, max_val, open_left, open_right)
+
+
+register_definition_factory('between', between)
@@ -4,7 +4,7 @@ try:  # python 3.5+
 except ImportError:
     pass
 
-from valid8.base import ValidationFailure
+from valid8.base import ValidationFailure, set_definition, DefinedCallable, register_definition_factory
 
 
 class IsNotEven(ValidationFailure, ValueError):
@@ -21,6 +21,9 @@ def is_even(x  # type: Integral
         raise IsNotEven(wrong_value=x)
 
 
+set_definition(is_even, 'is_even')
+
+
 class IsNotOdd(ValidationFailure, ValueError):
     """ Custom ValidationFailure raised by is_odd """
     help_msg = 'Value should be odd'
@@ -35,6 +38,9 @@ def is_odd(x  # type: Integral
         raise IsNotOdd(wrong_value=x)
 
 
+set_definition(is_odd, 'is_odd')
+
+
 class IsNotMultipleOf(ValidationFailure, ValueError):
     """ Custom ValidationFailure raised by is_multiple_of """
     help_msg = 'Value should be a multiple of {ref}'
@@ -49,4 +55,7 @@ def is_multiple_of(ref):
             raise IsNotMultipleOf(wrong_value=x, ref=ref)
 
     is_multiple_of_ref.__name__ = 'is_multiple_of_%s' % ref
-    return is_multiple_of_ref
+    return DefinedCallable(is_multiple_of_ref, 'is_multiple_of', ref)
+
+
+register_definition_factory('is_multiple_of', is_multiple_of)
@@ -1,4 +1,4 @@
-from valid8.base import ValidationFailure
+from valid8.base import ValidationFailure, DefinedCallable, register_definition_factory
 
 
 class HasWrongType(ValidationFailure, TypeError):
@@ -77,11 +77,14 @@ def instance_of(*args):
                                        help_msg='Value should be an instance of any of {ref_type}')
 
         instance_of_ref.__name__ = 'instance_of_%s' % ref_type
-        return instance_of_ref
+        return DefinedCallable(instance_of_ref, 'instance_of', ref_type)
     else:
         raise TypeError('instance_of expected 2 (normal) or 1 (function generator) arguments, got ' + str(len(args)))
 
 
+register_definition_factory('instance_of', instance_of)
+
+
 class IsWrongType(ValidationFailure, TypeError):
     """ Custom ValidationFailure raised by subclass_of """
     help_msg = 'Value should be a type that is a subclass of {ref_type}'
@@ -154,6 +157,9 @@ def subclass_of(*args):
                                       help_msg='Value should be a subclass of any of {ref_type}')
 
         subclass_of_ref.__name__ = 'subclass_of_%s' % ref_type
-        return subclass_of_ref
+        return DefinedCallable(subclass_of_ref, 'subclass_of', ref_type)
     else:
         raise TypeError('subclass_of expected 2 (normal) or 1 (function generator) arguments, got ' + str(len(args)))
+
+
+register_definition_factory('subclass_of', subclass_of)